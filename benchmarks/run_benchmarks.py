@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+FastAPI Generator 性能基准测试
+
+测量项目创建和各生成器的耗时，路由聚合文件和__init__.py更新随资源数量增长的开销，
+以及生成的列表接口在不同响应方式下的吞吐量，结果保存为JSON，便于在不同版本之间对比。
+
+用法:
+    python benchmarks/run_benchmarks.py                        # 运行全部基准测试
+    python benchmarks/run_benchmarks.py --sizes 1,100 --quick  # 快速运行
+    python benchmarks/run_benchmarks.py --compare old.json new.json
+"""
+import argparse
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# 添加项目源码目录到Python路径
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root / "src"))
+
+from fastapi_generator import __version__
+from fastapi_generator.core.project_creator import AVAILABLE_TEMPLATES, create_project
+from fastapi_generator.generators.api_generator import _update_api_router, generate_api
+from fastapi_generator.generators.migration_generator import generate_migration
+from fastapi_generator.generators.model_generator import _update_init_file, generate_model
+from fastapi_generator.generators.service_generator import generate_service
+from fastapi_generator.utils.path_utils import get_templates_dir
+
+DEFAULT_SIZES = [1, 100, 1000]
+DEFAULT_LIST_ROWS = 500
+DEFAULT_LIST_REQUESTS = 200
+DEFAULT_RESULTS_DIR = Path(__file__).parent / "results"
+
+# 需要逐个资源调用的生成器
+RESOURCE_GENERATORS = {
+    "generate_model": generate_model,
+    "generate_service": generate_service,
+    "generate_api": generate_api,
+}
+
+# 列表接口吞吐量测试的场景 -> (项目创建参数, API生成参数)
+LIST_ENDPOINT_VARIANTS = {
+    "pydantic": ({}, {}),
+    "orjson": ({"json_response": "orjson"}, {}),
+    "cache": ({}, {"cache": True}),
+    "etag_hash": ({}, {"etag": "hash"}),
+}
+
+# 列表接口测试使用的模型字段
+LIST_ENDPOINT_FIELDS = ["customer_id:int:index", "status:enum(pending,paid,shipped)", "total:float", "note:text:optional"]
+
+# 在生成的项目中运行的测试脚本：写入数据后直接调用ASGI应用，输出每次请求的耗时
+# 每个场景使用独立的进程，避免不同项目的 main 和 app 模块冲突
+LIST_ENDPOINT_SCRIPT = """
+import asyncio, json, sys, time, warnings
+warnings.simplefilter("ignore")
+import main
+from app.db.session import SessionLocal, init_db
+from app.models.order import Order
+
+rows, requests = int(sys.argv[1]), int(sys.argv[2])
+init_db()
+with SessionLocal() as session:
+    session.add_all([Order(customer_id=i, status="paid", total=i * 1.5, note="note " * 8) for i in range(rows)])
+    session.commit()
+
+async def call():
+    scope = {"type": "http", "method": "GET", "path": "/api/v1/orders/", "raw_path": b"/api/v1/orders/",
+             "query_string": f"limit={min(rows, 1000)}".encode(), "headers": [], "http_version": "1.1",
+             "scheme": "http", "server": ("bench", 80), "client": ("bench", 1), "root_path": ""}
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message):
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"status {message['status']}")
+    await main.app(scope, receive, send)
+
+async def run():
+    await call()
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+print(json.dumps(asyncio.run(run())))
+"""
+
+
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    """计算耗时统计（秒）"""
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.mean(samples),
+        "max": max(samples),
+        "runs": len(samples),
+    }
+
+
+def _time_call(func: Callable[[], Any]) -> float:
+    """测量单次调用耗时"""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _make_project_skeleton(root: Path) -> Path:
+    """创建生成器使用的最小项目结构"""
+    project_dir = root / "bench_project"
+    (project_dir / "app" / "api" / "api_v1" / "endpoints").mkdir(parents=True)
+    with open(project_dir / "app" / "api" / "api_v1" / "api.py", "w", encoding="utf-8") as f:
+        f.write("from fastapi import APIRouter\n\napi_router = APIRouter()\n")
+    return project_dir
+
+
+def bench_create_project(repeat: int) -> Dict[str, Any]:
+    """测量每个模板的项目创建耗时"""
+    results = {}
+    for template in AVAILABLE_TEMPLATES:
+        if not (get_templates_dir() / "project" / template).exists():
+            continue
+        samples = []
+        for i in range(repeat):
+            with tempfile.TemporaryDirectory() as temp_dir:
+                samples.append(_time_call(
+                    lambda: create_project(f"bench_{i}", output_dir=Path(temp_dir), template=template)
+                ))
+        results[template] = _summarize(samples)
+    return results
+
+
+def bench_generate_migration(repeat: int) -> Dict[str, Any]:
+    """测量迁移配置生成耗时"""
+    samples = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_dir = _make_project_skeleton(Path(temp_dir))
+            samples.append(_time_call(lambda: generate_migration(project_dir)))
+    return _summarize(samples)
+
+
+def bench_generate_resources(sizes: List[int]) -> Dict[str, Any]:
+    """测量向同一项目连续生成N个资源的耗时"""
+    results: Dict[str, Any] = {}
+    for name, generator in RESOURCE_GENERATORS.items():
+        results[name] = {}
+        for size in sizes:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                project_dir = _make_project_skeleton(Path(temp_dir))
+                samples = [
+                    _time_call(lambda: generator(f"resource{i}", output_dir=project_dir))
+                    for i in range(size)
+                ]
+            results[name][str(size)] = {
+                "total": sum(samples),
+                "per_resource": _summarize(samples),
+                # 最后一个资源的耗时反映项目规模增长后的单次开销
+                "last": samples[-1],
+            }
+    return results
+
+
+def bench_aggregate_growth(sizes: List[int]) -> Dict[str, Any]:
+    """测量路由聚合文件和__init__.py更新随已有资源数量增长的开销"""
+    results: Dict[str, Any] = {"_update_api_router": {}, "_update_init_file": {}}
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_dir = _make_project_skeleton(Path(temp_dir))
+            api_dir = project_dir / "app" / "api" / "api_v1"
+            models_dir = project_dir / "app" / "models"
+            models_dir.mkdir(parents=True)
+
+            router_samples = []
+            init_samples = []
+            for i in range(size):
+                router_samples.append(_time_call(
+                    lambda: _update_api_router(f"resource{i}", f"resource{i}s", api_dir)
+                ))
+                init_samples.append(_time_call(
+                    lambda: _update_init_file(models_dir, f"resource{i}", f"Resource{i}")
+                ))
+
+        for key, samples in (("_update_api_router", router_samples), ("_update_init_file", init_samples)):
+            results[key][str(size)] = {
+                "total": sum(samples),
+                "per_update": _summarize(samples),
+                "last": samples[-1],
+            }
+    return results
+
+
+def bench_list_endpoint(rows: int, requests: int) -> Dict[str, Any]:
+    """测量生成的列表接口在不同响应方式下返回rows条数据的吞吐量"""
+    results = {}
+    for variant, (project_options, api_options) in LIST_ENDPOINT_VARIANTS.items():
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_dir = create_project("bench_list", output_dir=Path(temp_dir), **project_options)
+            generate_model("order", output_dir=project_dir, fields=LIST_ENDPOINT_FIELDS)
+            generate_api("order", output_dir=project_dir, **api_options)
+            output = subprocess.run(
+                [sys.executable, "-c", LIST_ENDPOINT_SCRIPT, str(rows), str(requests)],
+                cwd=project_dir, capture_output=True, text=True, check=True
+            ).stdout
+        samples = json.loads(output.strip().splitlines()[-1])
+        results[variant] = {
+            "per_request": _summarize(samples),
+            "requests_per_second": len(samples) / sum(samples),
+        }
+    return results
+
+
+def run_benchmarks(sizes: List[int], repeat: int, list_rows: int = DEFAULT_LIST_ROWS,
+                   list_requests: int = DEFAULT_LIST_REQUESTS) -> Dict[str, Any]:
+    """运行全部基准测试"""
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "sizes": sizes,
+        "repeat": repeat,
+        "list_rows": list_rows,
+        "results": {
+            "create_project": bench_create_project(repeat),
+            "generate_migration": bench_generate_migration(repeat),
+            "generate_resources": bench_generate_resources(sizes),
+            "aggregate_growth": bench_aggregate_growth(sizes),
+            "list_endpoint": bench_list_endpoint(list_rows, list_requests),
+        },
+    }
+
+
+def _flatten(data: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """将嵌套结果展开为 路径 -> 耗时，便于对比"""
+    flat = {}
+    for key, value in data.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path))
+        elif isinstance(value, float):
+            flat[path] = value
+    return flat
+
+
+def compare_results(old_path: Path, new_path: Path) -> None:
+    """打印两份基准测试结果的对比"""
+    with open(old_path, "r", encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, "r", encoding="utf-8") as f:
+        new = json.load(f)
+
+    old_flat = _flatten(old["results"])
+    new_flat = _flatten(new["results"])
+    print(f"{'指标':<70} {old['version']:>12} {new['version']:>12} {'比例':>8}")
+    for key in sorted(set(old_flat) & set(new_flat)):
+        # 只对比中位数和总耗时，避免输出过长
+        if not key.endswith((".median", ".total")):
+            continue
+        ratio = new_flat[key] / old_flat[key] if old_flat[key] else float("inf")
+        print(f"{key:<70} {old_flat[key]:>12.6f} {new_flat[key]:>12.6f} {ratio:>7.2f}x")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="FastAPI Generator 性能基准测试")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="生成的资源数量，逗号分隔（默认: 1,100,1000）")
+    parser.add_argument("--repeat", type=int, default=5, help="项目创建等固定场景的重复次数")
+    parser.add_argument("--quick", action="store_true", help="快速模式，重复次数为1，列表接口只请求20次")
+    parser.add_argument("--list-rows", type=int, default=DEFAULT_LIST_ROWS,
+                        help="列表接口测试每次返回的数据条数（默认: 500）")
+    parser.add_argument("--list-requests", type=int, default=DEFAULT_LIST_REQUESTS,
+                        help="列表接口测试每个场景的请求次数（默认: 200）")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="结果JSON文件路径（默认: benchmarks/results/<版本号>.json）")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("OLD", "NEW"),
+                        help="对比两份结果JSON文件")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_results(*args.compare)
+        return
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    repeat = 1 if args.quick else args.repeat
+    list_requests = 20 if args.quick else args.list_requests
+    data = run_benchmarks(sizes, repeat, args.list_rows, list_requests)
+
+    output = args.output or DEFAULT_RESULTS_DIR / f"{__version__}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+    print(json.dumps(data["results"], indent=2, ensure_ascii=False))
+    print(f"结果已保存: {output}")
+
+
+if __name__ == "__main__":
+    main()
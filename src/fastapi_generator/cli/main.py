@@ -1,28 +1,36 @@
 """
 FastAPI Generator 命令行工具
+
+为了缩短启动时间，生成器、模板引擎和rich等较重的模块只在对应命令执行时才导入
 """
 import os
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional
 
 import typer
-from rich.console import Console
 
 from fastapi_generator import __version__
-from fastapi_generator.core.project_creator import create_project as create_project_func
-from fastapi_generator.generators.api_generator import generate_api as generate_api_func
-from fastapi_generator.generators.model_generator import generate_model as generate_model_func
-from fastapi_generator.generators.service_generator import generate_service as generate_service_func
-from fastapi_generator.generators.migration_generator import generate_migration as generate_migration_func
+
+if TYPE_CHECKING:
+    from rich.console import Console
+    from fastapi_generator.core.manifest import GenerationManifest
 
 app = typer.Typer(help="FastAPI Generator - 快速生成FastAPI项目和组件")
-console = Console()
+_console: Optional["Console"] = None
+
+def get_console() -> "Console":
+    """获取rich控制台，首次使用时才导入rich"""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
 
 def version_callback(value: bool):
     """版本回调函数"""
     if value:
-        console.print(f"FastAPI Generator 版本: {__version__}")
+        typer.echo(f"FastAPI Generator 版本: {__version__}")
         raise typer.Exit()
 
 @app.callback()
@@ -36,9 +44,21 @@ def main_callback(
 def create_project(
     project_name: str,
     output: Optional[Path] = typer.Option(None, "--output", "-o", help="输出目录，默认为当前目录"),
-    template: str = typer.Option("standard", "--template", "-t", help="项目模板: basic, standard, enterprise")
+    template: str = typer.Option("standard", "--template", "-t", help="项目模板: basic, standard, enterprise"),
+    jobs: int = typer.Option(1, "--jobs", "-j", help="并行渲染和写入文件的线程数，默认为1（串行）"),
+    cache_stats: bool = typer.Option(False, "--cache-stats", help="显示模板编译缓存的命中统计"),
+    async_mode: bool = typer.Option(False, "--async", help="生成异步数据库访问代码（AsyncEngine + aiosqlite/asyncpg）"),
+    json_response: str = typer.Option(
+        "pydantic", "--json-response",
+        help="默认的JSON响应方式: pydantic（默认，FastAPI 0.130+ 由Pydantic直接序列化为bytes）或 orjson（ORJSONResponse，适用于旧版本FastAPI）"
+    )
 ):
     """创建一个新的FastAPI项目"""
+    from fastapi_generator.core.project_creator import create_project as create_project_func
+    from fastapi_generator.core.template_engine import get_cache_stats
+    
+    console = get_console()
+    
     # 显示创建信息
     console.print(f"创建项目: {project_name}")
     console.print(f"模板: {template}")
@@ -51,53 +71,208 @@ def create_project(
         project_path = create_project_func(
             project_name=project_name,
             output_dir=output_dir,
-            template=template
+            template=template,
+            jobs=jobs,
+            async_mode=async_mode,
+            json_response=json_response
         )
         console.print(f"[bold green]项目创建成功![/bold green] 路径: \n{project_path}")
+        if cache_stats:
+            stats = get_cache_stats()
+            console.print(
+                f"模板缓存: 命中 {stats['hits']}, 未命中 {stats['misses']} "
+                f"(字节码缓存命中 {stats['bytecode_hits']}, 未命中 {stats['bytecode_misses']})"
+            )
     except Exception as e:
         console.print(f"[bold red]错误: {str(e)}[/bold red]")
         raise typer.Exit(code=1)
 
 @app.command("generate")
 def generate_component(
-    component_type: str = typer.Argument(..., help="组件类型: api, model, service, migration"),
-    name: str = typer.Argument(..., help="组件名称"),
-    output: Optional[Path] = typer.Option(None, "--output", "-o", help="输出目录，默认为当前目录")
+    component_type: str = typer.Argument(..., help="组件类型: api, model, service, migration, batch"),
+    name: str = typer.Argument(..., help="组件名称（batch类型为规格文件路径）"),
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="输出目录，默认为当前目录"),
+    async_mode: Optional[bool] = typer.Option(
+        None, "--async/--sync", help="生成异步或同步代码，默认根据项目的数据库会话模块判断"
+    ),
+    pagination: Optional[str] = typer.Option(
+        None, "--pagination", help="列表接口的分页方式: offset（默认）或 keyset（游标分页）"
+    ),
+    cursor_field: Optional[str] = typer.Option(
+        None, "--cursor-field", help="游标分页（--pagination keyset）的排序键，应当是有索引的字段，默认为id"
+    ),
+    bulk: Optional[bool] = typer.Option(
+        None, "--bulk/--no-bulk", help="生成批量创建、更新和删除接口"
+    ),
+    bulk_max_size: Optional[int] = typer.Option(
+        None, "--bulk-max-size", min=1, help="批量接口单次请求的最大数据条数，默认为1000"
+    ),
+    returning: Optional[bool] = typer.Option(
+        None, "--returning/--no-returning",
+        help="创建、更新和删除使用单条 INSERT/UPDATE ... RETURNING 和 DELETE 语句（默认），数据库不支持RETURNING时使用--no-returning"
+    ),
+    cache: Optional[bool] = typer.Option(
+        None, "--cache/--no-cache", help="缓存GET接口的响应（TTL+LRU），创建、更新和删除后自动失效"
+    ),
+    cache_ttl: Optional[int] = typer.Option(
+        None, "--cache-ttl", min=1, help="响应缓存时间（秒），默认为60"
+    ),
+    etag: Optional[str] = typer.Option(
+        None, "--etag", help="GET接口的ETag: none（默认）、updated_at（先只查询更新时间）或 hash（根据响应内容）"
+    ),
+    export: Optional[bool] = typer.Option(
+        None, "--export/--no-export", help="生成 /export 接口，以NDJSON或CSV流式导出整张表"
+    ),
+    sparse_fields: Optional[bool] = typer.Option(
+        None, "--sparse-fields/--no-sparse-fields", help="GET接口支持 ?fields=id,name 参数，只查询并返回指定的字段"
+    ),
+    filters: Optional[bool] = typer.Option(
+        None, "--filters/--no-filters",
+        help="列表接口生成筛选（=、_in、_min、_max）和 sort 排序参数，只能使用模型中有索引的字段"
+    ),
+    unindexed_filters: Optional[bool] = typer.Option(
+        None, "--unindexed-filters/--no-unindexed-filters", help="允许按没有索引的字段筛选和排序，数据量大时可能全表扫描"
+    ),
+    field: Optional[List[str]] = typer.Option(
+        None, "--field", help="模型字段，格式为 名称:类型[:optional|index|unique]，例如 customer_id:int:index，可重复使用"
+    ),
+    index: Optional[List[str]] = typer.Option(
+        None, "--index", help="模型索引，逗号分隔的字段名，多个字段时生成复合索引，例如 customer_id,created_at，可重复使用"
+    ),
+    unique: Optional[List[str]] = typer.Option(
+        None, "--unique", help="模型唯一约束，格式同--index，可重复使用"
+    ),
+    belongs_to: Optional[List[str]] = typer.Option(
+        None, "--belongs-to", help="模型的多对一关联，格式为 名称[:模型]，同时生成外键字段 <名称>_id，例如 customer，可重复使用"
+    ),
+    has_many: Optional[List[str]] = typer.Option(
+        None, "--has-many", help="模型的一对多关联，格式为 名称[:模型]，目标模型需要定义指向当前模型的--belongs-to，例如 items，可重复使用"
+    )
 ):
     """生成FastAPI项目组件"""
+    from fastapi_generator.core.manifest import GenerationManifest
+    from fastapi_generator.utils.path_utils import resolve_app_dir
+    
+    console = get_console()
+    
     # 设置默认输出目录为当前目录
     output_dir = output or Path.cwd()
     
+    # API和服务生成器的生成选项，未指定的选项使用默认值
+    options = dict(
+        async_mode=async_mode,
+        pagination=pagination,
+        cursor_field=cursor_field,
+        bulk=bulk,
+        bulk_max_size=bulk_max_size,
+        returning=returning,
+        cache=cache,
+        cache_ttl=cache_ttl,
+        etag=etag,
+        export=export,
+        sparse_fields=sparse_fields,
+        filters=filters,
+        unindexed_filters=unindexed_filters
+    )
+    
     try:
+        # 加载生成文件清单，内容未变化的文件不会被重写
+        manifest_root = output_dir if component_type == "migration" else resolve_app_dir(output_dir).parent
+        manifest = GenerationManifest.load(manifest_root)
+        
         if component_type == "api":
+            from fastapi_generator.generators.api_generator import generate_api as generate_api_func
             console.print(f"生成API: {name}")
-            api_file = generate_api_func(name, output_dir)
+            api_file = generate_api_func(name, output_dir, manifest=manifest, **options)
             console.print(f"[bold green]API生成成功![/bold green] 文件: \n{api_file}")
             
         elif component_type == "model":
+            from fastapi_generator.generators.model_generator import generate_model as generate_model_func
             console.print(f"生成模型: {name}")
-            model_file = generate_model_func(name, output_dir)
+            model_file = generate_model_func(
+                name, output_dir, fields=field, manifest=manifest, indexes=index, unique=unique,
+                belongs_to=belongs_to, has_many=has_many
+            )
             console.print(f"[bold green]模型生成成功![/bold green] 文件: \n{model_file}")
             
         elif component_type == "service":
+            from fastapi_generator.generators.service_generator import generate_service as generate_service_func
             console.print(f"生成服务: {name}")
-            service_file = generate_service_func(name, output_dir)
+            service_file = generate_service_func(name, output_dir, manifest=manifest, **options)
             console.print(f"[bold green]服务生成成功![/bold green] 文件: \n{service_file}")
             
         elif component_type == "migration":
+            from fastapi_generator.generators.migration_generator import generate_migration as generate_migration_func
             console.print(f"生成数据库迁移")
-            migrations_dir = generate_migration_func(output_dir)
+            migrations_dir = generate_migration_func(output_dir, manifest=manifest, async_mode=async_mode)
             console.print(f"[bold green]数据库迁移生成成功![/bold green] 目录: \n{migrations_dir}")
             
+        elif component_type == "batch":
+            from fastapi_generator.generators.batch_generator import generate_batch as generate_batch_func
+            console.print(f"批量生成: {name}")
+            generate_batch_func(Path(name), output_dir, manifest=manifest)
+            console.print(f"[bold green]批量生成成功![/bold green] 共写入 {len(manifest.written)} 个文件")
+            
         else:
             console.print(f"[bold red]错误: 不支持的组件类型 '{component_type}'[/bold red]")
-            console.print("支持的组件类型: api, model, service, migration")
+            console.print("支持的组件类型: api, model, service, migration, batch")
             raise typer.Exit(code=1)
+        
+        manifest.save()
+        _print_skipped_files(manifest)
             
     except Exception as e:
         console.print(f"[bold red]错误: {str(e)}[/bold red]")
         raise typer.Exit(code=1)
 
+@app.command("watch")
+def watch_spec(
+    spec: Path = typer.Argument(..., help="规格文件路径（YAML或JSON）"),
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="输出目录，默认为当前目录"),
+    interval: float = typer.Option(0.5, "--interval", "-i", help="检查规格文件的间隔（秒）")
+):
+    """监视规格文件，变化时只为定义发生变化的资源重新生成代码"""
+    from fastapi_generator.core.watcher import SpecWatcher, WatchResult
+    
+    console = get_console()
+    
+    # 设置默认输出目录为当前目录
+    output_dir = output or Path.cwd()
+    
+    def on_result(result: WatchResult) -> None:
+        if result.changed:
+            console.print(f"重新生成: {', '.join(result.changed)}")
+        if result.removed:
+            console.print(f"[yellow]已从规格文件中移除（保留已生成的文件）: {', '.join(result.removed)}[/yellow]")
+        console.print(
+            f"[bold green]完成[/bold green] 写入 {len(result.written)} 个文件，"
+            f"跳过 {len(result.skipped)} 个未变化的文件"
+        )
+    
+    def on_error(error: Exception) -> None:
+        console.print(f"[bold red]错误: {str(error)}[/bold red]")
+    
+    try:
+        watcher = SpecWatcher(spec, output_dir)
+    except Exception as e:
+        console.print(f"[bold red]错误: {str(e)}[/bold red]")
+        raise typer.Exit(code=1)
+    
+    console.print(f"监视规格文件: {spec}（按 Ctrl+C 退出）")
+    try:
+        watcher.run(interval, on_result=on_result, on_error=on_error)
+    except KeyboardInterrupt:
+        console.print("已停止监视")
+
+def _print_skipped_files(manifest: "GenerationManifest") -> None:
+    """显示因内容未变化而跳过的文件"""
+    if not manifest.skipped:
+        return
+    console = get_console()
+    console.print(f"[yellow]内容未变化，跳过 {len(manifest.skipped)} 个文件:[/yellow]")
+    for path in manifest.skipped:
+        console.print(f"  {path}")
+
 def main():
     """主函数入口"""
     app()
@@ -0,0 +1,147 @@
+"""
+生成文件清单
+
+记录每个生成文件的内容哈希，重复生成时只写入内容真正发生变化的文件，
+未变化的文件保持原有的修改时间，避免触发 uvicorn --reload 或容器层缓存失效。
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# 清单文件名，保存在项目根目录
+MANIFEST_FILENAME = ".fastapi_generator_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def content_hash(content: str) -> str:
+    """
+    计算文件内容的哈希值
+
+    Args:
+        content: 文件内容
+
+    Returns:
+        sha256十六进制摘要
+    """
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class GenerationManifest:
+    """
+    生成文件清单
+
+    Attributes:
+        root: 项目根目录，清单中的路径相对于该目录保存
+        written: 本次实际写入的文件
+        skipped: 本次因内容未变化而跳过的文件
+    """
+
+    def __init__(self, root: Path, entries: Optional[Dict[str, Dict]] = None):
+        self.root = Path(root)
+        self.path = self.root / MANIFEST_FILENAME
+        self.entries: Dict[str, Dict] = entries or {}
+        self.written: List[Path] = []
+        self.skipped: List[Path] = []
+        self._dirty = False
+
+    @classmethod
+    def load(cls, root: Path) -> "GenerationManifest":
+        """
+        从项目根目录加载清单，清单不存在或损坏时返回空清单
+
+        Args:
+            root: 项目根目录
+
+        Returns:
+            清单对象
+        """
+        manifest_path = Path(root) / MANIFEST_FILENAME
+        entries = {}
+        if manifest_path.exists():
+            try:
+                with open(manifest_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == MANIFEST_VERSION:
+                    entries = data.get("files", {})
+            except (OSError, ValueError, AttributeError):
+                # 损坏的清单视为空清单，下次保存时重建
+                entries = {}
+        return cls(root, entries)
+
+    def _key(self, path: Path) -> str:
+        """计算文件在清单中的键"""
+        path = Path(path).absolute()
+        try:
+            return path.relative_to(self.root.absolute()).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def _is_unchanged(self, path: Path, key: str, new_hash: str) -> bool:
+        """判断磁盘上的文件内容是否已与新内容一致"""
+        if not path.exists():
+            return False
+
+        stat = path.stat()
+        entry = self.entries.get(key)
+        if (
+            entry
+            and entry.get("hash") == new_hash
+            and entry.get("size") == stat.st_size
+            and entry.get("mtime_ns") == stat.st_mtime_ns
+        ):
+            # 文件自上次生成后未被修改，无需读取内容
+            return True
+
+        # 清单缺失或文件被外部修改过，比较实际内容
+        with open(path, "r", encoding="utf-8") as f:
+            return content_hash(f.read()) == new_hash
+
+    def write_file(self, path: Path, content: str) -> bool:
+        """
+        写入生成文件，内容未变化时跳过
+
+        Args:
+            path: 文件路径
+            content: 文件内容
+
+        Returns:
+            是否实际写入了文件
+        """
+        path = Path(path)
+        key = self._key(path)
+        new_hash = content_hash(content)
+
+        if self._is_unchanged(path, key, new_hash):
+            self.skipped.append(path)
+            written = False
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+            self.written.append(path)
+            written = True
+
+        stat = path.stat()
+        entry = {"hash": new_hash, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if self.entries.get(key) != entry:
+            self.entries[key] = entry
+            self._dirty = True
+        return written
+
+    def save(self) -> None:
+        """保存清单，清单内容未变化时不写文件"""
+        if not self._dirty:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": MANIFEST_VERSION, "files": self.entries},
+                f,
+                indent=2,
+                sort_keys=True,
+                ensure_ascii=False,
+            )
+            f.write("\n")
+        self._dirty = False
+
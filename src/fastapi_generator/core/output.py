@@ -0,0 +1,226 @@
+"""
+输出后端
+
+项目创建器和各生成器都通过输出后端读写生成的文件：
+- DiskBackend：写入磁盘，可配合生成文件清单跳过内容未变化的文件
+- MemoryBackend：只在内存中保存生成结果，返回 {路径: 内容} 映射，不写磁盘，适合预览
+"""
+import ctypes
+import errno
+import os
+import shutil
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from fastapi_generator.core.manifest import GenerationManifest
+
+FileContent = Union[str, bytes]
+
+# renameat2 的参数：相对于当前目录解析路径，目标已存在时失败
+_AT_FDCWD = -100
+_RENAME_NOREPLACE = 1
+
+
+class OutputBackend:
+    """
+    输出后端基类
+
+    目录树（新建项目）的写入分为三个阶段：
+    begin_tree 返回实际写入的工作目录，commit_tree 发布，abort_tree 放弃
+    """
+
+    #: 是否写入真实文件系统
+    writes_to_disk = False
+
+    def exists(self, path: Path) -> bool:
+        """判断文件或目录是否存在"""
+        raise NotImplementedError
+
+    def read_text(self, path: Path) -> Optional[str]:
+        """读取文本文件，文件不存在时返回None"""
+        raise NotImplementedError
+
+    def write_text(self, path: Path, content: str) -> bool:
+        """
+        写入文本文件
+
+        Returns:
+            是否实际写入了文件（内容未变化时可能跳过）
+        """
+        raise NotImplementedError
+
+    def copy_file(self, source: Path, target: Path) -> None:
+        """复制非模板文件"""
+        raise NotImplementedError
+
+    def ensure_dir(self, path: Path) -> Path:
+        """确保目录存在"""
+        raise NotImplementedError
+
+    def begin_tree(self, final_dir: Path) -> Path:
+        """开始写入目录树，返回实际写入的工作目录"""
+        return final_dir
+
+    def commit_tree(self, work_dir: Path, final_dir: Path) -> None:
+        """发布写入完成的目录树"""
+
+    def abort_tree(self, work_dir: Path) -> None:
+        """放弃写入失败的目录树"""
+
+
+class DiskBackend(OutputBackend):
+    """
+    磁盘输出后端
+
+    Args:
+        manifest: 生成文件清单，提供时内容未变化的文件不会被重写
+    """
+
+    writes_to_disk = True
+
+    def __init__(self, manifest: Optional[GenerationManifest] = None):
+        self.manifest = manifest
+
+    def exists(self, path: Path) -> bool:
+        return Path(path).exists()
+
+    def read_text(self, path: Path) -> Optional[str]:
+        path = Path(path)
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def write_text(self, path: Path, content: str) -> bool:
+        if self.manifest is not None:
+            return self.manifest.write_file(path, content)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return True
+
+    def copy_file(self, source: Path, target: Path) -> None:
+        shutil.copy2(source, target)
+
+    def ensure_dir(self, path: Path) -> Path:
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def begin_tree(self, final_dir: Path) -> Path:
+        # 暂存目录与最终目录位于同一父目录下，保证发布时的重命名是原子操作
+        return final_dir.with_name(f".{final_dir.name}.{os.urandom(6).hex()}.staging")
+
+    def commit_tree(self, work_dir: Path, final_dir: Path) -> None:
+        # 写入期间可能有其他进程创建了同名目录，检查和重命名必须是同一个原子操作
+        try:
+            _rename_noreplace(work_dir, final_dir)
+        except FileExistsError:
+            raise FileExistsError(f"目录已存在: {final_dir}") from None
+
+    def abort_tree(self, work_dir: Path) -> None:
+        # 暂存目录对外不可见，直接删除即可
+        if work_dir.exists():
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _rename_noreplace(source: Path, target: Path) -> None:
+    """
+    将目录重命名为目标路径，目标已存在（包括空目录）时抛出FileExistsError
+
+    Linux上使用 renameat2(RENAME_NOREPLACE) 一次完成；内核或文件系统不支持时，
+    先用 mkdir 原子地占用目标名称，再重命名覆盖自己创建的空目录（POSIX允许覆盖空目录）。
+    Windows上目标已存在时重命名本身就会失败。
+    """
+    if os.name == "nt":
+        os.rename(source, target)
+        return
+    if sys.platform.startswith("linux") and _renameat2(source, target):
+        return
+    os.mkdir(target)
+    try:
+        os.rename(source, target)
+    except BaseException:
+        os.rmdir(target)
+        raise
+
+
+def _renameat2(source: Path, target: Path) -> bool:
+    """调用 renameat2(RENAME_NOREPLACE)，系统不支持时返回False"""
+    renameat2 = getattr(ctypes.CDLL(None, use_errno=True), "renameat2", None)
+    if renameat2 is None:
+        return False
+    if renameat2(_AT_FDCWD, os.fsencode(source), _AT_FDCWD, os.fsencode(target), _RENAME_NOREPLACE) == 0:
+        return True
+    code = ctypes.get_errno()
+    if code in (errno.ENOSYS, errno.EINVAL):
+        return False
+    raise OSError(code, os.strerror(code), str(target))
+
+
+class MemoryBackend(OutputBackend):
+    """
+    内存输出后端，不进行任何磁盘写入
+
+    Attributes:
+        files: 生成的文件，路径 -> 内容（模板渲染结果为str，复制的文件为bytes）
+        directories: 创建的目录
+    """
+
+    def __init__(self):
+        self.files: Dict[Path, FileContent] = {}
+        self.directories = set()
+        self._lock = threading.Lock()
+
+    def exists(self, path: Path) -> bool:
+        path = Path(path)
+        return path in self.files or path in self.directories
+
+    def read_text(self, path: Path) -> Optional[str]:
+        content = self.files.get(Path(path))
+        if isinstance(content, bytes):
+            return content.decode("utf-8")
+        return content
+
+    def write_text(self, path: Path, content: str) -> bool:
+        path = Path(path)
+        with self._lock:
+            if self.files.get(path) == content:
+                return False
+            self.files[path] = content
+        return True
+
+    def copy_file(self, source: Path, target: Path) -> None:
+        # 只读取模板包中的源文件
+        with open(source, "rb") as f:
+            content = f.read()
+        with self._lock:
+            self.files[Path(target)] = content
+
+    def ensure_dir(self, path: Path) -> Path:
+        path = Path(path)
+        with self._lock:
+            self.directories.add(path)
+        return path
+
+    def abort_tree(self, work_dir: Path) -> None:
+        with self._lock:
+            for path in [p for p in self.files if p == work_dir or work_dir in p.parents]:
+                del self.files[path]
+            self.directories = {d for d in self.directories if d != work_dir and work_dir not in d.parents}
+
+    def to_dict(self, root: Optional[Path] = None) -> Dict[str, FileContent]:
+        """
+        返回 {路径: 内容} 映射
+
+        Args:
+            root: 提供时路径相对于该目录，并使用"/"分隔
+
+        Returns:
+            按路径排序的生成文件映射
+        """
+        result = {}
+        for path in sorted(self.files):
+            key = path.relative_to(root).as_posix() if root is not None else str(path)
+            result[key] = self.files[path]
+        return result
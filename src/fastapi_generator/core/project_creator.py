@@ -3,17 +3,35 @@
 """
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, List, NamedTuple
 import re
 import sys
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from fastapi_generator.core.output import DiskBackend, OutputBackend
+from fastapi_generator.core.template_engine import render_template, template_name_for
 from fastapi_generator.utils.path_utils import ensure_dir_exists, get_templates_dir
 from fastapi_generator.utils.string_utils import to_snake_case, to_pascal_case, to_kebab_case
 
 # 定义可用的项目模板
 AVAILABLE_TEMPLATES = ["basic", "standard", "enterprise"]
 
+# 应用默认的JSON响应方式
+# pydantic: 依赖FastAPI 0.130+，按response_model校验后由Pydantic直接序列化为bytes
+# orjson: 使用ORJSONResponse作为默认响应类，适用于无法升级到FastAPI 0.130的项目（新版本中已弃用）
+JSON_RESPONSE_CHOICES = ["pydantic", "orjson"]
+
+class RenderTask(NamedTuple):
+    """渲染计划中的单个文件任务"""
+    source: Path
+    target: Path
+    is_template: bool
+
+class RenderPlan(NamedTuple):
+    """渲染计划：需要创建的目录和需要处理的文件"""
+    directories: List[Path]
+    files: List[RenderTask]
+
 def validate_project_name(project_name: str) -> str:
     """
     验证并转换项目名称为有效的Python包名
@@ -33,7 +51,11 @@ def validate_project_name(project_name: str) -> str:
 def create_project(
     project_name: str, 
     output_dir: Optional[Path] = None, 
-    template: str = "standard"
+    template: str = "standard",
+    jobs: int = 1,
+    backend: Optional[OutputBackend] = None,
+    async_mode: bool = False,
+    json_response: str = "pydantic"
 ) -> Path:
     """
     创建一个新的FastAPI项目
@@ -42,6 +64,10 @@ def create_project(
         project_name: 项目名称
         output_dir: 输出目录，默认为当前目录
         template: 项目模板类型
+        jobs: 并行渲染和写入文件的线程数，默认为1（串行）
+        backend: 输出后端，默认写入磁盘；使用MemoryBackend时只在内存中生成
+        async_mode: 是否生成异步数据库访问代码（AsyncEngine、async_sessionmaker）
+        json_response: 应用默认的JSON响应方式: pydantic（默认）或 orjson
         
     Returns:
         项目路径
@@ -50,6 +76,14 @@ def create_project(
     if template not in AVAILABLE_TEMPLATES:
         raise ValueError(f"无效的模板类型: {template}。可用的模板: {', '.join(AVAILABLE_TEMPLATES)}")
     
+    # 验证JSON响应方式
+    if json_response not in JSON_RESPONSE_CHOICES:
+        raise ValueError(f"无效的JSON响应方式: {json_response}。可用的方式: {', '.join(JSON_RESPONSE_CHOICES)}")
+    
+    # 验证线程数
+    if jobs < 1:
+        raise ValueError(f"无效的线程数: {jobs}，必须大于等于1")
+    
     # 验证并转换项目名称
     valid_project_name = validate_project_name(project_name)
     display_name = project_name  # 用于显示的原始名称
@@ -60,9 +94,13 @@ def create_project(
     else:
         output_dir = Path(output_dir)
     
+    # 输出后端
+    if backend is None:
+        backend = DiskBackend()
+    
     # 创建项目目录
     project_dir = output_dir / valid_project_name
-    if project_dir.exists():
+    if backend.exists(project_dir):
         raise FileExistsError(f"目录已存在: {project_dir}")
     
     # 获取模板目录
@@ -76,21 +114,28 @@ def create_project(
         "display_name": display_name,
         "pascal_case_name": to_pascal_case(valid_project_name),
         "kebab_case_name": to_kebab_case(valid_project_name),
+        "async_mode": async_mode,
+        "json_response": json_response,
     }
     
+    # 工作目录：磁盘后端为同级的隐藏暂存目录，保证最终发布是一次原子重命名
+    work_dir = backend.begin_tree(project_dir)
+    
     try:
-        # 创建项目结构
-        _create_project_structure(templates_dir, project_dir, context)
+        # 在工作目录中创建项目结构（全部文件渲染成功后才会创建目录）
+        _create_project_structure(templates_dir, work_dir, context, jobs, backend)
         
         # 创建迁移配置（仅对standard和enterprise模板）
         if template in ["standard", "enterprise"]:
-            _setup_migration(project_dir, context)
+            _setup_migration(work_dir, context)
+        
+        # 发布完整的项目目录
+        backend.commit_tree(work_dir, project_dir)
         
         return project_dir
     except Exception as e:
-        # 如果出现错误，清理创建的目录
-        if project_dir.exists():
-            shutil.rmtree(project_dir, ignore_errors=True)
+        # 项目目录从未出现，只需清理对外不可见的工作目录
+        backend.abort_tree(work_dir)
         print(f"创建项目失败: {str(e)}")
         raise
 
@@ -108,49 +153,61 @@ def _setup_migration(project_dir: Path, context: Dict[str, Any]) -> None:
 def _create_project_structure(
     template_dir: Path, 
     project_dir: Path, 
-    context: Dict[str, Any]
+    context: Dict[str, Any],
+    jobs: int = 1,
+    backend: Optional[OutputBackend] = None
 ) -> None:
     """
     从模板创建项目结构
     
+    先在内存中渲染全部模板，渲染成功后才创建目录并写入文件，
+    因此渲染失败时磁盘上不会留下任何内容
+    
     Args:
         template_dir: 模板目录
         project_dir: 项目目录
         context: 模板渲染上下文
+        jobs: 并行渲染和写入文件的线程数，1表示串行
+        backend: 输出后端，默认写入磁盘
     """
-    # 确保项目目录存在
-    ensure_dir_exists(project_dir)
+    if backend is None:
+        backend = DiskBackend()
     
     # 检查模板目录中是否有{{project_name}}目录
     project_name_dir = template_dir / "{{project_name}}"
     if project_name_dir.exists() and project_name_dir.is_dir():
         # 如果存在，直接从{{project_name}}目录复制内容到项目目录
-        _copy_and_render_directory(project_name_dir, project_dir, context)
+        source_dir = project_name_dir
     else:
         # 否则，从模板根目录复制内容
-        _copy_and_render_directory(template_dir, project_dir, context)
+        source_dir = template_dir
+    
+    plan = _collect_render_plan(source_dir, project_dir, context)
+    contents = _run_tasks(lambda task: _render_task(task, context), plan.files, jobs)
+    
+    # 确保项目目录及所有子目录存在
+    for directory in [project_dir] + plan.directories:
+        backend.ensure_dir(directory)
+    
+    _run_tasks(lambda item: _write_task(*item, backend), list(zip(plan.files, contents)), jobs)
 
-def _copy_and_render_directory(
+def _collect_render_plan(
     source_dir: Path,
     target_dir: Path,
     context: Dict[str, Any]
-) -> None:
+) -> RenderPlan:
     """
-    复制并渲染目录中的所有文件
+    遍历模板目录，收集需要创建的目录和需要处理的文件
     
     Args:
         source_dir: 源目录
         target_dir: 目标目录
         context: 模板渲染上下文
+        
+    Returns:
+        渲染计划（目录和文件均按遍历顺序排列）
     """
-    # 确保目标目录存在
-    ensure_dir_exists(target_dir)
-    
-    # 设置Jinja2环境
-    env = Environment(
-        autoescape=select_autoescape(['html', 'xml']),
-        keep_trailing_newline=True,
-    )
+    plan = RenderPlan([], [])
     
     # 遍历源目录中的所有文件和子目录
     for item in source_dir.iterdir():
@@ -167,36 +224,92 @@ def _copy_and_render_directory(
         
         # 处理目录
         if item.is_dir():
-            _copy_and_render_directory(item, target_path, context)
+            plan.directories.append(target_path)
+            sub_plan = _collect_render_plan(item, target_path, context)
+            plan.directories.extend(sub_plan.directories)
+            plan.files.extend(sub_plan.files)
             continue
         
         # 处理文件
         if item.is_file():
-            # 如果是模板文件（.j2扩展名），渲染它
-            if item.name.endswith(".j2"):
-                try:
-                    # 读取模板内容
-                    with open(item, "r", encoding="utf-8") as f:
-                        template_content = f.read()
-                    
-                    # 渲染模板
-                    template = env.from_string(template_content)
-                    content = template.render(**context)
-                    
-                    # 移除.j2扩展名
-                    if target_path.name.endswith(".j2"):
-                        target_path = target_path.with_name(target_path.name[:-3])
-                    
-                    # 写入渲染后的内容
-                    with open(target_path, "w", encoding="utf-8") as f:
-                        f.write(content)
-                except Exception as e:
-                    print(f"错误: 渲染模板 {item} 失败: {str(e)}")
-                    raise
-            else:
-                # 直接复制非模板文件
-                try:
-                    shutil.copy2(item, target_path)
-                except Exception as e:
-                    print(f"错误: 复制文件 {item} 到 {target_path} 失败: {str(e)}")
-                    raise 
\ No newline at end of file
+            is_template = item.name.endswith(".j2")
+            # 移除.j2扩展名
+            if is_template and target_path.name.endswith(".j2"):
+                target_path = target_path.with_name(target_path.name[:-3])
+            plan.files.append(RenderTask(item, target_path, is_template))
+    
+    return plan
+
+def _run_tasks(func: Callable[[Any], Any], items: List[Any], jobs: int = 1) -> List[Any]:
+    """
+    串行或通过线程池执行任务，按输入顺序返回结果
+    
+    Args:
+        func: 任务函数
+        items: 任务参数列表
+        jobs: 线程数，1表示串行
+        
+    Returns:
+        任务结果列表
+    """
+    if jobs <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    
+    executor = ThreadPoolExecutor(max_workers=min(jobs, len(items)))
+    futures = [executor.submit(func, item) for item in items]
+    try:
+        for future in as_completed(futures):
+            future.result()
+    except Exception:
+        # 取消尚未开始的任务
+        for future in futures:
+            future.cancel()
+        raise
+    finally:
+        # 等待正在执行的任务结束，避免清理目录后仍有文件写入
+        executor.shutdown(wait=True)
+    return [future.result() for future in futures]
+
+def _render_task(task: RenderTask, context: Dict[str, Any]) -> Optional[str]:
+    """
+    在内存中渲染单个模板文件
+    
+    Args:
+        task: 文件任务
+        context: 模板渲染上下文
+        
+    Returns:
+        渲染后的内容，非模板文件返回None
+    """
+    if not task.is_template:
+        return None
+    try:
+        # 通过共享环境渲染模板（复用已编译的模板和字节码缓存）
+        return render_template(template_name_for(task.source), context)
+    except Exception as e:
+        print(f"错误: 渲染模板 {task.source} 失败: {str(e)}")
+        raise
+
+def _write_task(task: RenderTask, content: Optional[str], backend: OutputBackend) -> None:
+    """
+    写入渲染后的文件或复制非模板文件
+    
+    Args:
+        task: 文件任务
+        content: 渲染后的内容，非模板文件为None
+        backend: 输出后端
+    """
+    # 如果是模板文件（.j2扩展名），写入渲染后的内容
+    if task.is_template:
+        try:
+            backend.write_text(task.target, content)
+        except Exception as e:
+            print(f"错误: 写入文件 {task.target} 失败: {str(e)}")
+            raise
+    else:
+        # 直接复制非模板文件
+        try:
+            backend.copy_file(task.source, task.target)
+        except Exception as e:
+            print(f"错误: 复制文件 {task.source} 到 {task.target} 失败: {str(e)}")
+            raise
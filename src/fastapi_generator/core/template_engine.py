@@ -0,0 +1,197 @@
+"""
+模板引擎与编译缓存
+
+所有项目模板共用一个基于 FileSystemLoader 的 Jinja2 环境，
+生成器的代码模板（templates/generators）使用另一个不转义、去除块标签空白的环境，
+两者共用同一个字节码缓存：
+- 进程内：Environment 自带的 LRU 缓存保存已编译的模板，并按文件 mtime 自动失效
+- 跨进程：字节码缓存保存在磁盘上，以模板路径和源码哈希为键，
+  同一模板再次使用时跳过解析与编译
+"""
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+from fastapi_generator.utils.path_utils import get_templates_dir
+
+# 缓存目录环境变量，设置为空字符串时禁用磁盘字节码缓存
+CACHE_DIR_ENV = "FASTAPI_GENERATOR_CACHE_DIR"
+
+_lock = threading.Lock()
+_local = threading.local()
+_environment: Optional[Environment] = None
+_code_environment: Optional[Environment] = None
+_stats = {"hits": 0, "misses": 0, "bytecode_hits": 0, "bytecode_misses": 0}
+
+
+def _record(key: str) -> None:
+    """线程安全地累加缓存计数"""
+    with _lock:
+        _stats[key] += 1
+
+
+class _CountingBytecodeCache(FileSystemBytecodeCache):
+    """记录磁盘字节码命中/未命中次数的字节码缓存"""
+
+    def load_bytecode(self, bucket) -> None:
+        super().load_bytecode(bucket)
+        _record("bytecode_hits" if bucket.code is not None else "bytecode_misses")
+
+
+class _CachingEnvironment(Environment):
+    """记录模板编译次数的Jinja2环境"""
+
+    def compile(self, source, name=None, filename=None, raw=False, defer_init=False):
+        if not raw:
+            _local.compiled = True
+            _record("misses")
+        return super().compile(source, name, filename, raw, defer_init)
+
+
+def get_cache_dir() -> Optional[Path]:
+    """
+    获取磁盘字节码缓存目录
+
+    Returns:
+        缓存目录路径，如果禁用了磁盘缓存则返回None
+    """
+    configured = os.environ.get(CACHE_DIR_ENV)
+    if configured is not None:
+        return Path(configured) if configured else None
+
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "fastapi_generator" / "templates"
+
+
+def _create_bytecode_cache() -> Optional[_CountingBytecodeCache]:
+    """创建磁盘字节码缓存，目录不可用时返回None"""
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError:
+        # 只读文件系统等情况下退化为仅进程内缓存
+        return None
+    return _CountingBytecodeCache(str(cache_dir))
+
+
+def get_environment() -> Environment:
+    """
+    获取共享的模板环境，首次调用时创建
+    """
+    global _environment
+    if _environment is None:
+        with _lock:
+            if _environment is None:
+                _environment = _CachingEnvironment(
+                    loader=FileSystemLoader(str(get_templates_dir())),
+                    bytecode_cache=_create_bytecode_cache(),
+                    # 与原先 from_string 的行为保持一致（未知扩展名也转义）
+                    autoescape=select_autoescape(["html", "xml"], default=True),
+                    keep_trailing_newline=True,
+                    auto_reload=True,
+                )
+    return _environment
+
+
+def get_code_environment() -> Environment:
+    """
+    获取生成器代码模板使用的共享环境，首次调用时创建
+
+    生成的是Python代码，因此不做HTML转义，并去除块标签所在行的空白
+    """
+    global _code_environment
+    if _code_environment is None:
+        with _lock:
+            if _code_environment is None:
+                _code_environment = _CachingEnvironment(
+                    loader=FileSystemLoader(str(get_templates_dir())),
+                    bytecode_cache=_create_bytecode_cache(),
+                    autoescape=False,
+                    trim_blocks=True,
+                    lstrip_blocks=True,
+                    keep_trailing_newline=True,
+                    auto_reload=True,
+                )
+    return _code_environment
+
+
+def template_name_for(path: Path) -> str:
+    """
+    将模板文件路径转换为相对于模板根目录的模板名
+
+    Args:
+        path: 模板文件的绝对路径
+
+    Returns:
+        以"/"分隔的模板名
+    """
+    return Path(path).relative_to(get_templates_dir()).as_posix()
+
+
+def render_template(name: str, context: Dict[str, Any]) -> str:
+    """
+    使用共享环境渲染模板
+
+    Args:
+        name: 相对于模板根目录的模板名
+        context: 模板渲染上下文
+
+    Returns:
+        渲染后的内容
+    """
+    return _render(get_environment(), name, context)
+
+
+def render_code_template(name: str, context: Dict[str, Any]) -> str:
+    """
+    使用代码模板环境渲染生成器模板
+
+    Args:
+        name: 相对于模板根目录的模板名，例如 generators/api_endpoint.py.j2
+        context: 模板渲染上下文
+
+    Returns:
+        渲染后的代码
+    """
+    return _render(get_code_environment(), name, context)
+
+
+def _render(env: Environment, name: str, context: Dict[str, Any]) -> str:
+    """加载（必要时编译）并渲染模板，同时记录缓存命中情况"""
+    _local.compiled = False
+    template = env.get_template(name)
+    if not _local.compiled:
+        _record("hits")
+    return template.render(**context)
+
+
+def get_cache_stats() -> Dict[str, int]:
+    """
+    获取模板缓存统计
+
+    Returns:
+        hits/misses 为模板是否需要重新编译的次数，
+        bytecode_hits/bytecode_misses 为磁盘字节码缓存的命中情况
+    """
+    with _lock:
+        return dict(_stats)
+
+
+def reset_cache_stats() -> None:
+    """重置模板缓存统计"""
+    with _lock:
+        for key in _stats:
+            _stats[key] = 0
+
+
+def reset_environment() -> None:
+    """丢弃共享环境（包括进程内缓存），下次使用时重新创建"""
+    global _environment, _code_environment
+    with _lock:
+        _environment = None
+        _code_environment = None
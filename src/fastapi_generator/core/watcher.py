@@ -0,0 +1,125 @@
+"""
+规格文件监视器
+
+作为常驻进程运行：生成器模板、项目结构和生成文件清单在进程内只加载一次，
+规格文件变化时只为定义发生变化的资源重新生成代码。
+生成文件清单会跳过内容未变化的文件，不会触发 uvicorn --reload 重启。
+"""
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from fastapi_generator.core.manifest import GenerationManifest
+from fastapi_generator.generators.batch_generator import generate_resources, load_spec, normalize_spec
+from fastapi_generator.utils.path_utils import resolve_app_dir
+from fastapi_generator.utils.string_utils import to_snake_case
+
+# 默认轮询间隔（秒）
+DEFAULT_INTERVAL = 0.5
+
+
+class WatchResult(NamedTuple):
+    """一次重新生成的结果"""
+    changed: List[str]
+    removed: List[str]
+    written: List[Path]
+    skipped: List[Path]
+
+
+class SpecWatcher:
+    """
+    监视规格文件并增量重新生成资源
+
+    通过轮询规格文件的修改时间和大小检测变化，不依赖inotify等平台相关的接口。
+
+    Args:
+        spec_path: 规格文件路径
+        output_dir: 输出目录，默认为当前项目根目录
+        manifest: 生成文件清单，默认加载项目根目录下的清单
+
+    Attributes:
+        resources: 上一次生成时的资源定义，资源名称（蛇形命名法）-> 定义
+    """
+
+    def __init__(
+        self,
+        spec_path: Path,
+        output_dir: Optional[Path] = None,
+        manifest: Optional[GenerationManifest] = None
+    ):
+        self.spec_path = Path(spec_path)
+        # 项目结构只解析一次
+        self.app_dir = resolve_app_dir(output_dir)
+        self.manifest = manifest or GenerationManifest.load(self.app_dir.parent)
+        self.resources: Dict[str, Dict[str, Any]] = {}
+        self._stat: Optional[Tuple[int, int]] = None
+
+    def _spec_stat(self) -> Optional[Tuple[int, int]]:
+        """规格文件的 (修改时间, 大小)，文件不存在时返回None（编辑器保存时可能短暂删除文件）"""
+        try:
+            stat = os.stat(self.spec_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def check(self) -> Optional[WatchResult]:
+        """
+        检查规格文件，有变化时为定义发生变化的资源重新生成代码
+
+        Returns:
+            规格文件未变化时返回None，否则返回本次生成的结果
+        """
+        stat = self._spec_stat()
+        if stat is None or stat == self._stat:
+            return None
+        # 先记录状态，规格文件有错误时等待下一次修改再重试
+        self._stat = stat
+
+        resources = {
+            to_snake_case(resource["name"]): resource
+            for resource in normalize_spec(load_spec(self.spec_path))
+        }
+        changed = [key for key, resource in resources.items() if self.resources.get(key) != resource]
+        removed = [key for key in self.resources if key not in resources]
+
+        self.manifest.written = []
+        self.manifest.skipped = []
+        if changed:
+            # app目录已解析，直接作为输出目录传入
+            generate_resources([resources[key] for key in changed], self.app_dir, manifest=self.manifest)
+            self.manifest.save()
+        self.resources = resources
+
+        return WatchResult(changed, removed, list(self.manifest.written), list(self.manifest.skipped))
+
+    def run(
+        self,
+        interval: float = DEFAULT_INTERVAL,
+        on_result: Optional[Callable[[WatchResult], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        max_checks: Optional[int] = None
+    ) -> None:
+        """
+        持续监视规格文件，直到被中断
+
+        Args:
+            interval: 轮询间隔（秒）
+            on_result: 每次重新生成后的回调
+            on_error: 规格文件无效或生成失败时的回调，未提供时抛出异常
+            max_checks: 最多检查的次数，默认不限制
+        """
+        checks = 0
+        while max_checks is None or checks < max_checks:
+            if checks:
+                time.sleep(interval)
+            checks += 1
+            try:
+                result = self.check()
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(e)
+                continue
+            if result is not None and on_result is not None:
+                on_result(result)
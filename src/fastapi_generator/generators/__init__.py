@@ -1,7 +1,24 @@
 """
 代码生成器模块
+
+各生成器在首次访问时才导入，避免导入本包时加载全部生成器
 """
-from fastapi_generator.generators.api_generator import generate_api
-from fastapi_generator.generators.model_generator import generate_model
-from fastapi_generator.generators.service_generator import generate_service
-from fastapi_generator.generators.migration_generator import generate_migration 
\ No newline at end of file
+import importlib
+
+_GENERATORS = {
+    "generate_api": "fastapi_generator.generators.api_generator",
+    "generate_model": "fastapi_generator.generators.model_generator",
+    "generate_service": "fastapi_generator.generators.service_generator",
+    "generate_migration": "fastapi_generator.generators.migration_generator",
+    "generate_batch": "fastapi_generator.generators.batch_generator",
+}
+
+__all__ = list(_GENERATORS)
+
+
+def __getattr__(name):
+    if name in _GENERATORS:
+        value = getattr(importlib.import_module(_GENERATORS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,182 +2,253 @@
 API生成器模块
 """
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 import os
 from jinja2 import Environment, FileSystemLoader
 import re
 
-from fastapi_generator.utils.path_utils import ensure_dir_exists, find_project_root
+from fastapi_generator.core.manifest import GenerationManifest
+from fastapi_generator.core.output import DiskBackend, OutputBackend
+from fastapi_generator.core.template_engine import render_code_template
+from fastapi_generator.generators.fields import BUILTIN_MODEL_COLUMNS, ModelColumn, ModelRelationship
+from fastapi_generator.generators.options import (
+    detect_async_project, detect_model_columns, detect_model_relationships, resolve_options
+)
+from fastapi_generator.generators.support import SUPPORT_ROUTERS, required_support_modules, write_support_modules
+from fastapi_generator.utils.code_utils import update_router_module
+from fastapi_generator.utils.path_utils import ensure_dir_exists, find_project_root, resolve_app_dir
 from fastapi_generator.utils.string_utils import to_snake_case, to_pascal_case, pluralize
 
-# API端点模板
-API_ENDPOINT_TEMPLATE = """from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
-from typing import List, Optional
+# API端点模板（相对于模板根目录）
+API_ENDPOINT_TEMPLATE_NAME = "generators/api_endpoint.py.j2"
 
-from app.db.session import get_session
-from app.models.{model_name} import {model_class}
-from app.schemas.{model_name} import {model_class}Create, {model_class}Read, {model_class}Update
+# 支持的生成选项及默认值
+API_OPTIONS = {
+    # 生成异步代码（AsyncSession），None表示根据项目的数据库会话模块自动判断
+    "async_mode": None,
+    # 列表接口的分页方式：offset（skip/limit，保持与已有客户端兼容）或 keyset（游标分页，查询代价与翻页深度无关）
+    "pagination": "offset",
+    # 键集分页的排序键，应当是有索引的字段，只在 keyset 分页时使用
+    "cursor_field": "id",
+    # 生成批量创建、更新和删除接口
+    "bulk": False,
+    # 批量接口单次请求的最大数据条数
+    "bulk_max_size": 1000,
+    # 创建、更新和删除使用单条 INSERT/UPDATE ... RETURNING 和 DELETE 语句，需要数据库支持RETURNING（SQLite 3.35+、PostgreSQL）
+    "returning": True,
+    # 缓存GET接口的响应，写入后自动使相关缓存失效
+    "cache": False,
+    # 响应缓存时间（秒）
+    "cache_ttl": 60,
+    # GET接口的ETag：none（不生成）、updated_at（根据更新时间，先查询元数据再加载完整数据）或 hash（根据响应内容）
+    "etag": "none",
+    # 生成 /export 接口，以NDJSON或CSV流式导出整张表
+    "export": False,
+    # GET接口支持 ?fields= 参数，只查询并返回指定的字段
+    "sparse_fields": False,
+    # 列表接口生成筛选（等于、属于、范围）和排序参数，只能使用有索引的字段
+    "filters": False,
+    # 允许按没有索引的字段筛选和排序，数据量大时可能全表扫描
+    "unindexed_filters": False,
+}
 
-router = APIRouter()
+# 支持范围筛选（_min/_max）的字段类型
+RANGE_FILTER_TYPES = ("int", "float", "Decimal", "date", "datetime")
 
+# 不需要导入的字段类型，其他类型（枚举类）从模型模块导入
+BUILTIN_FILTER_TYPES = ("str", "int", "float", "bool", "Decimal", "date", "datetime")
 
-@router.get("/", response_model=List[{model_class}Read])
-def get_all_{model_name_plural}(
-    skip: int = 0, 
-    limit: int = 100,
-    session: Session = Depends(get_session)
-):
-    \"""
-    获取所有{model_display_name}列表
-    \"""
-    {model_name_plural} = session.exec(select({model_class}).offset(skip).limit(limit)).all()
-    return {model_name_plural}
+# 列表接口已有的查询参数，筛选参数不能与之重名
+RESERVED_FILTER_PARAMS = ("request", "skip", "limit", "cursor", "fields", "sort")
 
+def render_api(
+    name: str,
+    relationships: Sequence[ModelRelationship] = (),
+    columns: Optional[Sequence[ModelColumn]] = None,
+    **options: Any
+) -> str:
+    """
+    渲染API端点文件内容
+    
+    Args:
+        name: API资源名称
+        relationships: 模型的关联，列表和详情接口预加载并返回关联数据
+        columns: 模型的列，决定可以筛选和排序的字段，默认只有模型自动生成的列
+        options: 生成选项，见 API_OPTIONS
+        
+    Returns:
+        API端点文件内容
+    """
+    # 处理名称
+    model_name = to_snake_case(name)
+    model_class = to_pascal_case(name)
+    model_name_plural = pluralize(model_name)
+    model_display_name = name  # 原始名称作为显示名称
+    
+    options = resolve_options(API_OPTIONS, options, "API")
+    check_relationship_options(name, relationships, options)
+    filter_context = _filter_context(BUILTIN_MODEL_COLUMNS if columns is None else columns, options)
+    return render_code_template(API_ENDPOINT_TEMPLATE_NAME, dict(
+        model_name=model_name,
+        model_class=model_class,
+        model_name_plural=model_name_plural,
+        model_display_name=model_display_name,
+        relationships=[
+            # 多对一关联使用JOIN一起查询，一对多关联使用一次额外的 IN 查询
+            dict(name=relationship.name, loader="joinedload" if relationship.kind == "belongs_to" else "selectinload")
+            for relationship in relationships
+        ],
+        **filter_context,
+        **options
+    ))
 
-@router.get("/{{{model_name}_id}}", response_model={model_class}Read)
-def get_{model_name}(
-    {model_name}_id: int,
-    session: Session = Depends(get_session)
-):
-    \"""
-    根据ID获取{model_display_name}
-    \"""
-    {model_name} = session.get({model_class}, {model_name}_id)
-    if not {model_name}:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"{model_display_name} ID {{{model_name}_id}} 不存在"
+def check_relationship_options(name: str, relationships: Sequence[ModelRelationship], options: Dict[str, Any]) -> None:
+    """
+    检查关联能否与响应缓存和 updated_at ETag 一起使用
+    
+    响应中包含关联数据，但缓存只在本资源写入后失效，updated_at ETag 也只根据本资源的行计算，
+    关联数据变化后会继续返回过期的响应
+    
+    Args:
+        name: API资源名称
+        relationships: 模型的关联
+        options: 已补全默认值的生成选项
+    """
+    conflicts = []
+    if options["cache"]:
+        conflicts.append("--cache")
+    if options["etag"] == "updated_at":
+        conflicts.append("--etag updated_at")
+    if relationships and conflicts:
+        raise ValueError(
+            f"资源 {name} 的模型包含关联，不能使用 {'、'.join(conflicts)}：关联数据变化时响应缓存和ETag不会失效。"
+            f"可以改用 --etag hash"
         )
-    return {model_name}
-
-
-@router.post("/", response_model={model_class}Read, status_code=status.HTTP_201_CREATED)
-def create_{model_name}(
-    {model_name}_data: {model_class}Create,
-    session: Session = Depends(get_session)
-):
-    \"""
-    创建新的{model_display_name}
-    \"""
-    {model_name} = {model_class}(**{model_name}_data.dict())
-    session.add({model_name})
-    session.commit()
-    session.refresh({model_name})
-    return {model_name}
 
-
-@router.put("/{{{model_name}_id}}", response_model={model_class}Read)
-def update_{model_name}(
-    {model_name}_id: int,
-    {model_name}_data: {model_class}Update,
-    session: Session = Depends(get_session)
-):
-    \"""
-    更新{model_display_name}
-    \"""
-    {model_name} = session.get({model_class}, {model_name}_id)
-    if not {model_name}:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"{model_display_name} ID {{{model_name}_id}} 不存在"
-        )
+def _filter_context(columns: Sequence[ModelColumn], options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    列表接口筛选和排序参数的模板变量
     
-    # 更新模型字段
-    {model_name}_data_dict = {model_name}_data.dict(exclude_unset=True)
-    for key, value in {model_name}_data_dict.items():
-        setattr({model_name}, key, value)
+    Args:
+        columns: 模型的列
+        options: 已补全默认值的生成选项
+        
+    Returns:
+        filter_params（参数名, 类型注解, 默认值）、filter_fields、sort_fields、default_sort 和需要导入的类型
+    """
+    keyset = options["pagination"] == "keyset"
+    default_sort = options["cursor_field"] if keyset else "id"
+    names = {column.name for column in columns}
+    filterable = [column for column in columns if column.indexed or options["unindexed_filters"]]
     
-    session.add({model_name})
-    session.commit()
-    session.refresh({model_name})
-    return {model_name}
-
-
-@router.delete("/{{{model_name}_id}}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_{model_name}(
-    {model_name}_id: int,
-    session: Session = Depends(get_session)
-):
-    \"""
-    删除{model_display_name}
-    \"""
-    {model_name} = session.get({model_class}, {model_name}_id)
-    if not {model_name}:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"{model_display_name} ID {{{model_name}_id}} 不存在"
+    params = []
+    for column in filterable:
+        annotation = column.annotation
+        candidates = [(column.name, f"Optional[{annotation}]", "None")]
+        if annotation != "bool":
+            candidates.append((f"{column.name}_in", f"Optional[List[{annotation}]]", "Query(None)"))
+        if annotation in RANGE_FILTER_TYPES:
+            candidates.append((f"{column.name}_min", f"Optional[{annotation}]", "None"))
+            candidates.append((f"{column.name}_max", f"Optional[{annotation}]", "None"))
+        # 与其他列或已有查询参数重名的参数无法区分，不生成
+        params.extend(
+            candidate for candidate in candidates
+            if candidate[0] not in RESERVED_FILTER_PARAMS and (candidate[0] == column.name or candidate[0] not in names)
         )
     
-    session.delete({model_name})
-    session.commit()
-    return None
-"""
+    # 键集分页的排序键不能为空；默认排序键即使没有索引也可以使用
+    sort_fields = [column.name for column in filterable if not (keyset and column.nullable)]
+    if default_sort not in sort_fields:
+        sort_fields.append(default_sort)
+    types = {column.annotation for column in filterable}
+    return dict(
+        filter_params=params,
+        filter_fields=[column.name for column in filterable],
+        sort_fields=sort_fields,
+        default_sort=default_sort,
+        filter_enums=sorted(types - set(BUILTIN_FILTER_TYPES)),
+        filter_datetime_types=[name for name in ("date", "datetime") if name in types],
+        filter_decimal="Decimal" in types,
+    )
 
-def generate_api(name: str, output_dir: Optional[Path] = None) -> Path:
+def generate_api(
+    name: str,
+    output_dir: Optional[Path] = None,
+    manifest: Optional[GenerationManifest] = None,
+    backend: Optional[OutputBackend] = None,
+    relationships: Optional[Sequence[ModelRelationship]] = None,
+    **options: Any
+) -> Path:
     """
     生成API端点文件
     
     Args:
         name: API资源名称
         output_dir: 输出目录，默认为当前项目的api/endpoints目录
+        manifest: 生成文件清单，默认加载项目根目录下的清单；内容未变化的文件不会被重写
+        backend: 输出后端，默认写入磁盘；使用MemoryBackend时只在内存中生成
+        relationships: 模型的关联，默认读取已经生成的模型文件
+        options: 生成选项，见 API_OPTIONS
         
     Returns:
         生成的API文件路径
     """
     # 处理名称
     model_name = to_snake_case(name)
-    model_class = to_pascal_case(name)
     model_name_plural = pluralize(model_name)
-    model_display_name = name  # 原始名称作为显示名称
     
     # 确定输出目录
-    if output_dir is None:
-        # 尝试找到项目根目录
-        project_root = find_project_root()
-        if project_root:
-            # 假设标准项目结构
-            app_dir = project_root / "app"
-            output_dir = app_dir / "api" / "api_v1" / "endpoints"
-        else:
-            # 如果找不到项目根目录，使用当前目录下的app目录
-            app_dir = Path.cwd() / "app"
-            output_dir = app_dir / "api" / "api_v1" / "endpoints"
-    else:
-        # 如果提供了输出目录，检查是否有app目录
-        if (output_dir / "app").exists() and (output_dir / "app").is_dir():
-            # 如果存在app目录，使用app下的api目录
-            app_dir = output_dir / "app"
-            output_dir = app_dir / "api" / "api_v1" / "endpoints"
-        else:
-            # 否则，假设output_dir已经是app目录或直接在output_dir下创建api目录
-            app_dir = output_dir
-            output_dir = app_dir / "api" / "api_v1" / "endpoints"
+    app_dir = resolve_app_dir(output_dir, backend.exists if backend else None)
+    output_dir = app_dir / "api" / "api_v1" / "endpoints"
+    
+    # 确定输出后端（默认写入磁盘并加载生成文件清单）
+    own_manifest = backend is None and manifest is None
+    if backend is None:
+        if manifest is None:
+            manifest = GenerationManifest.load(app_dir.parent)
+        backend = DiskBackend(manifest)
     
     # 确保输出目录存在
-    ensure_dir_exists(output_dir)
+    backend.ensure_dir(output_dir)
     
     # 生成API端点文件
     endpoint_file = output_dir / f"{model_name}.py"
     
-    # 渲染模板
-    endpoint_content = API_ENDPOINT_TEMPLATE.format(
-        model_name=model_name,
-        model_class=model_class,
-        model_name_plural=model_name_plural,
-        model_display_name=model_display_name
-    )
+    # 未指定时根据项目的数据库会话模块判断是否生成异步代码
+    if options.get("async_mode") is None:
+        options["async_mode"] = detect_async_project(app_dir, backend)
+    
+    # 未指定时从模型文件中读取关联
+    if relationships is None:
+        relationships = detect_model_relationships(app_dir, model_name, backend)
+    
+    # 渲染模板，可以筛选和排序的字段由模型文件中的索引决定
+    options = resolve_options(API_OPTIONS, options, "API")
+    columns = detect_model_columns(app_dir, model_name, backend) if options["filters"] else None
+    endpoint_content = render_api(name, relationships, columns, **options)
     
-    # 写入文件
-    with open(endpoint_file, "w", encoding="utf-8") as f:
-        f.write(endpoint_content)
+    # 写入文件（内容未变化时跳过）
+    backend.write_text(endpoint_file, endpoint_content)
+    
+    # 写入生成代码依赖的公共模块
+    support_modules = required_support_modules(options)
+    write_support_modules(app_dir, support_modules, backend)
     
     # 更新API路由聚合文件
-    _update_api_router(model_name, model_name_plural, output_dir.parent)
+    _update_api_router(model_name, model_name_plural, output_dir.parent, backend, support_modules)
+    
+    if own_manifest:
+        manifest.save()
     
     return endpoint_file
 
-def _update_api_router(resource_name: str, resource_name_plural: str, api_dir: Path) -> None:
+def _update_api_router(
+    resource_name: str,
+    resource_name_plural: str,
+    api_dir: Path,
+    backend: Optional[OutputBackend] = None,
+    support_modules: Iterable[str] = ()
+) -> None:
     """
     更新API路由聚合文件
     
@@ -185,45 +256,61 @@ def _update_api_router(resource_name: str, resource_name_plural: str, api_dir: P
         resource_name: 资源名称（蛇形命名法）
         resource_name_plural: 资源名称复数形式（蛇形命名法）
         api_dir: API目录路径
+        backend: 输出后端，默认直接写入磁盘
+        support_modules: 生成代码依赖的公共模块，其中提供路由的模块会一并注册
+    """
+    update_api_router(api_dir, [(resource_name, resource_name_plural)], backend, support_modules)
+
+def update_api_router(
+    api_dir: Path,
+    resources: List[Tuple[str, str]],
+    backend: Optional[OutputBackend] = None,
+    support_modules: Iterable[str] = ()
+) -> Path:
     """
+    一次性将多个资源注册到API路由聚合文件，只读写一次文件
+    
+    Args:
+        api_dir: API目录路径
+        resources: (资源名称, 资源名称复数形式) 列表，均为蛇形命名法
+        backend: 输出后端，默认直接写入磁盘
+        support_modules: 生成代码依赖的公共模块，其中提供路由的模块（例如缓存统计）会一并注册
+        
+    Returns:
+        API路由聚合文件路径
+    """
+    if backend is None:
+        backend = DiskBackend()
+    
     # 确保api.py文件存在
     api_file = api_dir / "api.py"
     
-    if not api_file.exists():
-        # 如果api.py不存在，创建一个基础文件
-        with open(api_file, "w", encoding="utf-8") as f:
-            f.write("""from fastapi import APIRouter
+    # 读取现有内容
+    content = backend.read_text(api_file)
+    if content is None:
+        # 如果api.py不存在，使用基础内容
+        content = """from fastapi import APIRouter
 
 api_router = APIRouter()
-""")
+"""
     
-    # 读取现有内容
-    with open(api_file, "r", encoding="utf-8") as f:
-        content = f.read()
-    
-    # 检查是否已经导入了该路由
-    import_line = f"from .endpoints.{resource_name} import router as {resource_name}_router"
-    if import_line not in content:
-        # 找到导入部分的结束位置
-        import_end = content.rfind("import")
-        import_end = content.find("\n", import_end) if import_end != -1 else 0
-        
-        # 添加导入语句
-        new_content = content[:import_end + 1] + "\n" + import_line + content[import_end + 1:]
-        content = new_content
-    
-    # 检查是否已经包含了该路由
-    include_line = f"api_router.include_router({resource_name}_router, prefix=\"/{resource_name_plural}\", tags=[\"{resource_name_plural}\"])"
-    if include_line not in content:
-        # 找到路由器定义后的位置
-        router_def = content.find("api_router = APIRouter()")
-        if router_def != -1:
-            router_end = content.find("\n", router_def)
-            if router_end != -1:
-                # 添加包含语句
-                new_content = content[:router_end + 1] + "\n" + include_line + content[router_end + 1:]
-                content = new_content
-    
-    # 写回文件
-    with open(api_file, "w", encoding="utf-8") as f:
-        f.write(content) 
\ No newline at end of file
+    support_routers = [SUPPORT_ROUTERS[name] for name in sorted(support_modules) if name in SUPPORT_ROUTERS]
+    
+    # 解析一次文件，按排序位置插入全部导入和注册语句
+    new_content = update_router_module(
+        content,
+        [
+            f"from .endpoints.{resource_name} import router as {resource_name}_router"
+            for resource_name, _ in resources
+        ] + [import_line for import_line, _ in support_routers],
+        [
+            f"api_router.include_router({resource_name}_router, prefix=\"/{resource_name_plural}\", tags=[\"{resource_name_plural}\"])"
+            for resource_name, resource_name_plural in resources
+        ] + [include_line for _, include_line in support_routers],
+    )
+    
+    if new_content != content:
+        # 写回文件
+        backend.write_text(api_file, new_content)
+    
+    return api_file
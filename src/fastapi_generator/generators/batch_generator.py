@@ -0,0 +1,272 @@
+"""
+批量资源生成器模块
+
+根据规格文件（YAML或JSON）一次性为多个资源生成模型、模式、服务和API端点。
+项目结构只解析一次，路由聚合文件和各__init__.py文件的修改合并后每个文件只写一次。
+
+规格文件示例::
+
+    components: [model, service, api]   # 可选，默认生成全部组件
+    options: {async_mode: true}          # 可选，生成选项，资源中的同名选项优先
+    resources:
+      - name: order
+        has_many: ["items:order_item"]   # 可选，一对多关联，目标模型需要定义 belongs_to 当前模型
+      - name: product
+        components: [model, api]
+        fields: ["sku:str(64):unique", "price:decimal(10,2)", "status:enum(draft,active)"]
+        indexes: ["status,created_at"]   # 可选，复合索引；unique 定义复合唯一约束
+      - name: order_item
+        belongs_to: [order, product]     # 可选，多对一关联，生成外键 order_id、product_id
+      - customer                         # 简写形式
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fastapi_generator.core.manifest import GenerationManifest
+from fastapi_generator.core.output import DiskBackend, OutputBackend
+from fastapi_generator.generators.api_generator import (
+    API_OPTIONS, check_relationship_options, render_api, update_api_router
+)
+from fastapi_generator.generators.fields import resolve_model_fields, resolve_relationships
+from fastapi_generator.generators.model_generator import render_model, update_schema_init_file
+from fastapi_generator.generators.model_generator import update_init_file as update_model_init_file
+from fastapi_generator.generators.options import (
+    detect_async_project, detect_model_columns, detect_model_relationships, resolve_options
+)
+from fastapi_generator.generators.service_generator import SERVICE_OPTIONS, render_service
+from fastapi_generator.generators.service_generator import update_init_file as update_service_init_file
+from fastapi_generator.generators.support import MODEL_SUPPORT_MODULES, required_support_modules, write_support_modules
+from fastapi_generator.utils.path_utils import resolve_app_dir
+from fastapi_generator.utils.string_utils import to_snake_case, to_pascal_case, pluralize
+
+# 批量生成支持的组件类型
+BATCH_COMPONENTS = ["model", "service", "api"]
+
+# 规格文件中可以使用的生成选项
+BATCH_OPTIONS = {**SERVICE_OPTIONS, **API_OPTIONS}
+
+
+def load_spec(spec_path: Path) -> Dict[str, Any]:
+    """
+    读取规格文件
+
+    Args:
+        spec_path: 规格文件路径，.yaml/.yml 使用YAML解析，其余按JSON解析
+
+    Returns:
+        规格内容
+    """
+    spec_path = Path(spec_path)
+    if not spec_path.exists():
+        raise FileNotFoundError(f"规格文件不存在: {spec_path}")
+
+    with open(spec_path, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    if spec_path.suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("解析YAML规格文件需要安装PyYAML: pip install fastapi-generator[yaml]")
+        spec = yaml.safe_load(text)
+    else:
+        spec = json.loads(text)
+
+    if not isinstance(spec, dict):
+        raise ValueError(f"无效的规格文件: {spec_path}，顶层必须是映射")
+    return spec
+
+
+def normalize_spec(spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    校验规格内容并展开为资源定义列表
+
+    Args:
+        spec: 规格内容
+
+    Returns:
+        资源定义列表，每项包含 name、components 和 options，以及可选的 fields、indexes、unique、belongs_to 和 has_many
+    """
+    default_components = spec.get("components", BATCH_COMPONENTS)
+    default_options = spec.get("options") or {}
+    resources = spec.get("resources")
+    if not isinstance(resources, list) or not resources:
+        raise ValueError("规格文件必须包含非空的 resources 列表")
+
+    normalized = []
+    seen = set()
+    for entry in resources:
+        if isinstance(entry, str):
+            entry = {"name": entry}
+        if not isinstance(entry, dict) or not entry.get("name"):
+            raise ValueError(f"无效的资源定义: {entry!r}")
+
+        components = entry.get("components", default_components)
+        invalid = [c for c in components if c not in BATCH_COMPONENTS]
+        if invalid:
+            raise ValueError(
+                f"资源 {entry['name']} 包含不支持的组件类型: {', '.join(invalid)}。"
+                f"支持的组件类型: {', '.join(BATCH_COMPONENTS)}"
+            )
+
+        options = dict(default_options, **(entry.get("options") or {}))
+        invalid = sorted(set(options) - set(BATCH_OPTIONS))
+        if invalid:
+            raise ValueError(
+                f"资源 {entry['name']} 包含不支持的选项: {', '.join(invalid)}。"
+                f"支持的选项: {', '.join(BATCH_OPTIONS)}"
+            )
+        # 校验选项的取值
+        resolved = resolve_options(BATCH_OPTIONS, options, "批量")
+        # 校验字段、索引、唯一约束和关联定义
+        try:
+            fields, _, _ = resolve_model_fields(
+                entry.get("fields"), entry.get("indexes"), entry.get("unique"), belongs_to=entry.get("belongs_to")
+            )
+            relationships = resolve_relationships(entry.get("belongs_to"), entry.get("has_many"), fields)
+        except ValueError as e:
+            raise ValueError(f"资源 {entry['name']} 的字段定义无效: {e}")
+        # 同时生成模型和API时，在写入任何文件之前检查关联与缓存选项
+        if "model" in components and "api" in components:
+            check_relationship_options(entry["name"], relationships, resolved)
+
+        model_name = to_snake_case(entry["name"])
+        if model_name in seen:
+            raise ValueError(f"资源重复定义: {entry['name']}")
+        seen.add(model_name)
+
+        normalized.append(dict(entry, components=list(components), options=options))
+    return normalized
+
+
+def generate_batch(
+    spec_path: Path,
+    output_dir: Optional[Path] = None,
+    manifest: Optional[GenerationManifest] = None,
+    backend: Optional[OutputBackend] = None
+) -> List[Path]:
+    """
+    根据规格文件批量生成资源
+
+    Args:
+        spec_path: 规格文件路径
+        output_dir: 输出目录，默认为当前项目根目录
+        manifest: 生成文件清单，默认加载项目根目录下的清单
+        backend: 输出后端，默认写入磁盘
+
+    Returns:
+        生成的文件路径列表（包括内容未变化而跳过的文件）
+    """
+    resources = normalize_spec(load_spec(spec_path))
+    return generate_resources(resources, output_dir, manifest, backend)
+
+
+def generate_resources(
+    resources: List[Dict[str, Any]],
+    output_dir: Optional[Path] = None,
+    manifest: Optional[GenerationManifest] = None,
+    backend: Optional[OutputBackend] = None
+) -> List[Path]:
+    """
+    为一组已校验的资源定义生成代码
+
+    Args:
+        resources: normalize_spec 返回的资源定义列表
+        output_dir: 输出目录，默认为当前项目根目录
+        manifest: 生成文件清单，默认加载项目根目录下的清单
+        backend: 输出后端，默认写入磁盘
+
+    Returns:
+        生成的文件路径列表（包括内容未变化而跳过的文件）
+    """
+    # 只解析一次项目结构
+    app_dir = resolve_app_dir(output_dir, backend.exists if backend else None)
+    own_manifest = backend is None and manifest is None
+    if backend is None:
+        if manifest is None:
+            manifest = GenerationManifest.load(app_dir.parent)
+        backend = DiskBackend(manifest)
+    models_dir = app_dir / "models"
+    schemas_dir = app_dir / "schemas"
+    services_dir = app_dir / "services"
+    endpoints_dir = app_dir / "api" / "api_v1" / "endpoints"
+
+    # 未指定async_mode的资源统一按项目的数据库会话模块判断，只判断一次
+    async_mode = detect_async_project(app_dir, backend)
+
+    written: List[Path] = []
+    support_modules = set()
+    models = []
+    services = []
+    routers = []
+
+    for resource in resources:
+        name = resource["name"]
+        components = resource["components"]
+        model_name = to_snake_case(name)
+        model_class = to_pascal_case(name)
+        options = dict(resource.get("options") or {})
+        if options.get("async_mode") is None:
+            options["async_mode"] = async_mode
+
+        if "model" in components:
+            backend.ensure_dir(models_dir)
+            backend.ensure_dir(schemas_dir)
+            model_content, schema_content = render_model(
+                name, resource.get("fields"), resource.get("indexes"), resource.get("unique"),
+                resource.get("belongs_to"), resource.get("has_many")
+            )
+            written.append(_write_file(models_dir / f"{model_name}.py", model_content, backend))
+            written.append(_write_file(schemas_dir / f"{model_name}.py", schema_content, backend))
+            support_modules |= MODEL_SUPPORT_MODULES
+            models.append((model_name, model_class))
+
+        if "service" in components:
+            backend.ensure_dir(services_dir)
+            service_options = resolve_options(SERVICE_OPTIONS, _select_options(options, SERVICE_OPTIONS), "服务")
+            written.append(_write_file(services_dir / f"{model_name}_service.py", render_service(name, **service_options), backend))
+            support_modules |= required_support_modules(service_options)
+            services.append((model_name, model_class))
+
+        if "api" in components:
+            backend.ensure_dir(endpoints_dir)
+            api_options = resolve_options(API_OPTIONS, _select_options(options, API_OPTIONS), "API")
+            # 同时生成模型时使用规格中的关联，否则读取已有的模型文件
+            if "model" in components:
+                relationships = resolve_relationships(resource.get("belongs_to"), resource.get("has_many"))
+            else:
+                relationships = detect_model_relationships(app_dir, model_name, backend)
+            # 可以筛选和排序的字段由模型文件（同时生成时为刚写入的文件）中的索引决定
+            columns = detect_model_columns(app_dir, model_name, backend) if api_options["filters"] else None
+            written.append(_write_file(
+                endpoints_dir / f"{model_name}.py", render_api(name, relationships, columns, **api_options), backend
+            ))
+            support_modules |= required_support_modules(api_options)
+            routers.append((model_name, pluralize(model_name)))
+
+    # 公共模块和聚合文件的修改合并后每个文件只写一次
+    written.extend(write_support_modules(app_dir, support_modules, backend))
+    if models:
+        written.append(update_model_init_file(models_dir, models, backend))
+        written.append(update_schema_init_file(schemas_dir, models, backend))
+    if services:
+        written.append(update_service_init_file(services_dir, services, backend))
+    if routers:
+        written.append(update_api_router(endpoints_dir.parent, routers, backend, support_modules))
+
+    if own_manifest:
+        manifest.save()
+
+    return written
+
+
+def _select_options(options: Dict[str, Any], supported: Dict[str, Any]) -> Dict[str, Any]:
+    """选出组件生成器支持的选项"""
+    return {key: value for key, value in options.items() if key in supported}
+
+
+def _write_file(path: Path, content: str, backend: OutputBackend) -> Path:
+    """写入单个生成文件，内容未变化时跳过"""
+    backend.write_text(path, content)
+    return path
@@ -0,0 +1,380 @@
+"""
+模型字段定义
+
+字段使用 "名称:类型[:修饰符...]" 的简写形式，例如::
+
+    customer_id:int:index
+    status:enum(pending,paid,shipped)
+    title:str(200):unique
+    amount:decimal(10,2)
+    note:text:optional
+
+规格文件中也可以使用映射形式 {name: customer_id, type: int, index: true}。
+索引和唯一约束使用逗号分隔的字段名（或字段名列表），多个字段时生成复合索引或复合唯一约束。
+
+关联使用 "名称[:模型]" 的形式::
+
+    belongs_to: customer          # 生成外键 customer_id 和 customer 关联，目标模型为 Customer
+    belongs_to: author:user       # 生成外键 author_id 和 author 关联，目标模型为 User
+    has_many: items               # 生成 items 关联，目标模型为 Item（单数形式），Item 需要定义 belongs_to 当前模型
+"""
+import json
+import re
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from fastapi_generator.utils.string_utils import singularize, to_pascal_case, to_snake_case
+
+# 支持的字段类型 -> Python类型注解，enum的类型为生成的枚举类
+FIELD_TYPES = {
+    "str": "str",
+    "text": "str",
+    "int": "int",
+    "float": "float",
+    "bool": "bool",
+    "decimal": "Decimal",
+    "date": "date",
+    "datetime": "datetime",
+    "enum": None,
+}
+
+# 字段修饰符
+FIELD_MODIFIERS = ("optional", "index", "unique")
+
+# 关联类型
+RELATIONSHIP_KINDS = ("belongs_to", "has_many")
+
+# 模型自动生成的字段，可以在索引和唯一约束中引用，但不能重复定义
+BUILTIN_COLUMNS = ("id", "created_at", "updated_at")
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_TYPE = re.compile(r"^(\w+)(?:\((.*)\))?$")
+
+
+class ModelField(NamedTuple):
+    """模型字段"""
+    name: str
+    type: str
+    args: Tuple[str, ...] = ()  # 类型参数，例如 str(200) 为 ("200",)，enum为可选值
+    optional: bool = False
+    index: bool = False
+    unique: bool = False
+    description: Optional[str] = None
+    foreign_key: Optional[str] = None  # 外键引用的列，例如 customers.id
+
+
+class ModelRelationship(NamedTuple):
+    """模型关联"""
+    name: str
+    kind: str  # belongs_to 或 has_many
+    target: str  # 目标模型名称（snake_case）
+
+
+class ModelColumn(NamedTuple):
+    """已经生成的模型中的列，用于生成筛选和排序参数"""
+    name: str
+    annotation: str  # 不含 Optional 的类型注解，例如 int、Decimal、OrderStatus
+    indexed: bool = False  # 主键、有索引、有唯一约束或是复合索引的第一列
+    nullable: bool = False
+
+
+# 模型自动生成的列
+BUILTIN_MODEL_COLUMNS = [
+    ModelColumn("id", "int", indexed=True),
+    ModelColumn("created_at", "datetime"),
+    ModelColumn("updated_at", "datetime"),
+]
+
+
+def model_table_name(model_name: str) -> str:
+    """模型的数据表名，与模型模板中的 __tablename__ 一致"""
+    return model_name + "s"
+
+
+def default_fields(model_display_name: str) -> List[ModelField]:
+    """未定义字段时使用的基本字段"""
+    return [
+        ModelField("name", "str", index=True, description=f"{model_display_name}名称"),
+        ModelField("description", "str", optional=True, description="描述"),
+    ]
+
+
+def parse_field(spec: Any) -> ModelField:
+    """
+    解析字段定义
+
+    Args:
+        spec: 简写形式的字符串或映射形式的字段定义
+
+    Returns:
+        模型字段
+    """
+    if isinstance(spec, str):
+        name, _, rest = spec.strip().partition(":")
+        parts = _split_outside_parens(rest, ":") if rest else []
+        type_spec = parts[0] if parts else "str"
+        modifiers = parts[1:]
+        unknown = [m for m in modifiers if m not in FIELD_MODIFIERS]
+        if unknown:
+            raise ValueError(
+                f"字段 {name} 包含不支持的修饰符: {', '.join(unknown)}。"
+                f"支持的修饰符: {', '.join(FIELD_MODIFIERS)}"
+            )
+        options = {m: True for m in modifiers}
+        description = None
+    elif isinstance(spec, dict) and spec.get("name"):
+        name = spec["name"]
+        type_spec = str(spec.get("type", "str"))
+        options = {m: bool(spec.get(m)) for m in FIELD_MODIFIERS}
+        description = spec.get("description")
+    else:
+        raise ValueError(f"无效的字段定义: {spec!r}")
+
+    if not _IDENTIFIER.match(name):
+        raise ValueError(f"无效的字段名: {name!r}")
+    if name in BUILTIN_COLUMNS:
+        raise ValueError(f"字段 {name} 由模型自动生成，不能重复定义")
+
+    match = _TYPE.match(type_spec.strip())
+    if not match or match.group(1) not in FIELD_TYPES:
+        raise ValueError(f"字段 {name} 的类型无效: {type_spec}。支持的类型: {', '.join(FIELD_TYPES)}")
+    field_type = match.group(1)
+    args = tuple(arg.strip() for arg in match.group(2).split(",")) if match.group(2) else ()
+    _check_type_args(name, field_type, args)
+
+    return ModelField(
+        name=name,
+        type=field_type,
+        args=args,
+        optional=options.get("optional", False),
+        index=options.get("index", False),
+        unique=options.get("unique", False),
+        description=description,
+    )
+
+
+def parse_relationship(spec: Any, kind: str) -> ModelRelationship:
+    """
+    解析关联定义
+
+    Args:
+        spec: "名称[:模型]" 形式的字符串
+        kind: 关联类型，belongs_to 或 has_many
+
+    Returns:
+        模型关联；未指定模型时 belongs_to 的目标模型为关联名称，has_many 为关联名称的单数形式
+    """
+    if kind not in RELATIONSHIP_KINDS:
+        raise ValueError(f"无效的关联类型: {kind}。支持的关联类型: {', '.join(RELATIONSHIP_KINDS)}")
+    if not isinstance(spec, str):
+        raise ValueError(f"无效的关联定义: {spec!r}")
+    name, separator, target = spec.strip().partition(":")
+    if not _IDENTIFIER.match(name) or (separator and not _IDENTIFIER.match(target)):
+        raise ValueError(f"无效的关联定义: {spec!r}")
+    if not target:
+        target = name if kind == "belongs_to" else singularize(name)
+    return ModelRelationship(name=name, kind=kind, target=to_snake_case(target))
+
+
+def resolve_relationships(
+    belongs_to: Optional[Iterable[Any]] = None,
+    has_many: Optional[Iterable[Any]] = None,
+    fields: Iterable[ModelField] = ()
+) -> List[ModelRelationship]:
+    """
+    解析并校验模型的关联
+
+    Args:
+        belongs_to: 多对一关联定义列表
+        has_many: 一对多关联定义列表
+        fields: 模型字段，关联名称不能与字段重名
+
+    Returns:
+        模型关联列表
+    """
+    relationships = [parse_relationship(spec, "belongs_to") for spec in belongs_to or []]
+    relationships += [parse_relationship(spec, "has_many") for spec in has_many or []]
+    names = {field.name for field in fields} | set(BUILTIN_COLUMNS)
+    for relationship in relationships:
+        if relationship.name in names:
+            raise ValueError(f"关联 {relationship.name} 与字段或其他关联重名")
+        names.add(relationship.name)
+    return relationships
+
+
+def parse_columns(spec: Any) -> Tuple[str, ...]:
+    """
+    解析索引或唯一约束包含的字段
+
+    Args:
+        spec: 逗号分隔的字段名或字段名列表
+
+    Returns:
+        字段名元组
+    """
+    columns = spec.split(",") if isinstance(spec, str) else spec
+    if not isinstance(columns, (list, tuple)):
+        raise ValueError(f"无效的索引定义: {spec!r}")
+    columns = tuple(str(column).strip() for column in columns if str(column).strip())
+    if not columns:
+        raise ValueError(f"无效的索引定义: {spec!r}")
+    return columns
+
+
+def resolve_model_fields(
+    fields: Optional[Iterable[Any]] = None,
+    indexes: Optional[Iterable[Any]] = None,
+    unique: Optional[Iterable[Any]] = None,
+    model_display_name: str = "",
+    belongs_to: Optional[Iterable[Any]] = None
+) -> Tuple[List[ModelField], List[Tuple[str, ...]], List[Tuple[str, ...]]]:
+    """
+    解析并校验模型的字段、索引和唯一约束
+
+    单字段的索引和唯一约束合并到字段定义中，多字段的作为复合索引和复合唯一约束返回。
+    每个 belongs_to 关联对应一个带索引的外键字段 <关联名称>_id，已经定义的同名int字段只补充外键。
+
+    Args:
+        fields: 字段定义列表，也可以是 字段名 -> 类型定义 的映射；为空时使用基本字段
+        indexes: 索引定义列表
+        unique: 唯一约束定义列表
+        model_display_name: 模型显示名称，用于基本字段的描述
+        belongs_to: 多对一关联定义列表
+
+    Returns:
+        (字段列表, 复合索引列表, 复合唯一约束列表)
+    """
+    if isinstance(fields, dict):
+        fields = [f"{name}:{spec}" for name, spec in fields.items()]
+    parsed = [parse_field(spec) for spec in fields] if fields else default_fields(model_display_name)
+
+    positions = {}
+    for position, field in enumerate(parsed):
+        if field.name in positions:
+            raise ValueError(f"字段重复定义: {field.name}")
+        positions[field.name] = position
+
+    for relationship in (parse_relationship(spec, "belongs_to") for spec in belongs_to or []):
+        name = f"{relationship.name}_id"
+        foreign_key = f"{model_table_name(relationship.target)}.id"
+        if name in positions:
+            field = parsed[positions[name]]
+            if field.type != "int":
+                raise ValueError(f"外键字段 {name} 的类型必须是int")
+            parsed[positions[name]] = field._replace(foreign_key=foreign_key, index=True)
+        else:
+            positions[name] = len(parsed)
+            parsed.append(ModelField(
+                name, "int", optional=True, index=True, description=f"{relationship.name} ID", foreign_key=foreign_key
+            ))
+
+    def collect(specs, attribute, kind):
+        composite = []
+        for spec in specs or []:
+            columns = parse_columns(spec)
+            missing = [c for c in columns if c not in positions and c not in BUILTIN_COLUMNS]
+            if missing:
+                raise ValueError(f"{kind}引用了不存在的字段: {', '.join(missing)}")
+            if len(columns) == 1 and columns[0] in positions:
+                position = positions[columns[0]]
+                parsed[position] = parsed[position]._replace(**{attribute: True})
+            elif columns not in composite:
+                composite.append(columns)
+        return composite
+
+    composite_indexes = collect(indexes, "index", "索引")
+    composite_unique = collect(unique, "unique", "唯一约束")
+    return parsed, composite_indexes, composite_unique
+
+
+def enum_class_name(model_class: str, field: ModelField) -> str:
+    """枚举字段生成的枚举类名，例如 OrderStatus"""
+    return model_class + to_pascal_case(field.name)
+
+
+def field_annotation(model_class: str, field: ModelField, optional: bool = False) -> str:
+    """字段的类型注解"""
+    annotation = enum_class_name(model_class, field) if field.type == "enum" else FIELD_TYPES[field.type]
+    return f"Optional[{annotation}]" if optional or field.optional else annotation
+
+
+def field_arguments(field: ModelField) -> str:
+    """字段 Field(...) 的参数"""
+    arguments = []
+    if field.optional:
+        arguments.append("default=None")
+    if field.unique:
+        arguments.append("unique=True")
+    elif field.index:
+        arguments.append("index=True")
+    if field.foreign_key:
+        arguments.append(f'foreign_key="{field.foreign_key}"')
+    if field.type == "str" and field.args:
+        arguments.append(f"max_length={field.args[0]}")
+    elif field.type == "text":
+        arguments.append("sa_type=Text")
+    elif field.type == "datetime":
+        arguments.append("sa_type=DateTime(timezone=True)")
+    elif field.type == "decimal" and field.args:
+        arguments.append(f"max_digits={field.args[0]}")
+        if len(field.args) > 1:
+            arguments.append(f"decimal_places={field.args[1]}")
+    arguments.append(f"description={json.dumps(field.description or field.name, ensure_ascii=False)}")
+    return ", ".join(arguments)
+
+
+def relationship_annotation(relationship: ModelRelationship) -> str:
+    """关联的类型注解，目标模型使用字符串形式的前向引用"""
+    target_class = to_pascal_case(relationship.target)
+    return f'Optional["{target_class}"]' if relationship.kind == "belongs_to" else f'List["{target_class}"]'
+
+
+def relationship_arguments(model_name: str, relationship: ModelRelationship) -> str:
+    """
+    关联 Relationship(...) 的参数
+
+    has_many 关联与目标模型中同名于当前模型的 belongs_to 关联互为反向关联；
+    指向当前模型自身的 belongs_to 关联需要指定 remote_side。
+    """
+    if relationship.kind == "has_many":
+        return f'back_populates="{model_name}"'
+    if relationship.target == model_name:
+        return f'sa_relationship_kwargs={{"remote_side": "{to_pascal_case(model_name)}.id"}}'
+    return ""
+
+
+def enum_members(field: ModelField) -> List[Tuple[str, str]]:
+    """枚举字段的 (成员名, 值) 列表"""
+    return [(value.upper(), value) for value in field.args]
+
+
+def _check_type_args(name: str, field_type: str, args: Tuple[str, ...]) -> None:
+    """校验类型参数"""
+    if field_type == "enum":
+        if not args:
+            raise ValueError(f"字段 {name} 的枚举类型需要可选值，例如 enum(pending,paid)")
+        invalid = [value for value in args if not _IDENTIFIER.match(value)]
+        if invalid:
+            raise ValueError(f"字段 {name} 的枚举值无效: {', '.join(invalid)}")
+        if len({value.upper() for value in args}) != len(args):
+            raise ValueError(f"字段 {name} 的枚举值重复")
+    elif args:
+        max_args = {"str": 1, "decimal": 2}.get(field_type, 0)
+        if len(args) > max_args or not all(arg.isdigit() for arg in args):
+            raise ValueError(f"字段 {name} 的类型参数无效: {field_type}({', '.join(args)})")
+
+
+def _split_outside_parens(text: str, separator: str) -> List[str]:
+    """按分隔符拆分字符串，忽略括号内的分隔符"""
+    parts, depth, current = [], 0, ""
+    for char in text:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == separator and depth == 0:
+            parts.append(current.strip())
+            current = ""
+        else:
+            current += char
+    parts.append(current.strip())
+    return parts
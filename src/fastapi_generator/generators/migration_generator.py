@@ -8,6 +8,10 @@ import shutil
 import subprocess
 from jinja2 import Environment, FileSystemLoader
 
+from fastapi_generator.core.manifest import GenerationManifest
+from fastapi_generator.core.output import DiskBackend, OutputBackend
+from fastapi_generator.core.template_engine import render_template
+from fastapi_generator.generators.options import detect_async_project
 from fastapi_generator.utils.path_utils import ensure_dir_exists, find_project_root
 from fastapi_generator.utils.string_utils import to_snake_case
 
@@ -126,6 +130,90 @@ else:
     run_migrations_online()
 """
 
+# 异步项目（AsyncEngine）使用的Alembic env.py模板
+ALEMBIC_ASYNC_ENV_TEMPLATE = """# migrations/env.py
+import asyncio
+import os
+import sys
+from logging.config import fileConfig
+
+from sqlalchemy import pool
+from sqlalchemy.ext.asyncio import async_engine_from_config
+
+from alembic import context
+
+# 添加项目根目录到sys.path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# 导入所有模型以便Alembic可以自动检测
+from app.models import *
+from app.db.base import Base
+
+# this is the Alembic Config object, which provides
+# access to the values within the .ini file in use.
+config = context.config
+
+# 从环境变量获取数据库URL
+config.set_main_option("sqlalchemy.url", os.environ.get("DATABASE_URL", "sqlite+aiosqlite:///./app.db"))
+
+# Interpret the config file for Python logging.
+# This line sets up loggers basically.
+fileConfig(config.config_file_name)
+
+# add your model's MetaData object here
+# for 'autogenerate' support
+target_metadata = Base.metadata
+
+# other values from the config, defined by the needs of env.py,
+# can be acquired:
+# my_important_option = config.get_main_option("my_important_option")
+# ... etc.
+
+def run_migrations_offline():
+    # 在离线模式下运行迁移
+    url = config.get_main_option("sqlalchemy.url")
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+def do_run_migrations(connection):
+    # 在给定连接上运行迁移
+    context.configure(
+        connection=connection, target_metadata=target_metadata
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+async def run_async_migrations():
+    # 使用异步引擎运行迁移
+    connectable = async_engine_from_config(
+        config.get_section(config.config_ini_section),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+def run_migrations_online():
+    # 在在线模式下运行迁移
+    asyncio.run(run_async_migrations())
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
+"""
+
 # Alembic README模板
 ALEMBIC_README_TEMPLATE = """# 数据库迁移说明
 
@@ -186,48 +274,37 @@ from sqlalchemy.ext.declarative import declarative_base
 Base = declarative_base()
 """
 
-DB_SESSION_TEMPLATE = """\"\"\"
-数据库会话管理
-\"\"\"
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlmodel import Session, SQLModel
-
-from app.core.config import settings
-from app.db.base import Base
-
-# 创建数据库引擎
-engine = create_engine(
-    settings.DATABASE_URL,
-    echo=settings.DB_ECHO,  # 在生产环境中设置为False
-    connect_args=settings.DB_CONNECT_ARGS
-)
-
-# 创建会话工厂
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-def init_db() -> None:
-    \"\"\"初始化数据库，创建所有表\"\"\"
-    # 在开发环境中可以使用这个函数创建表
-    # 在生产环境中应该使用Alembic进行数据库迁移
-    Base.metadata.create_all(bind=engine)
-    SQLModel.metadata.create_all(bind=engine)
-
-def get_session():
-    \"\"\"获取数据库会话\"\"\"
-    session = SessionLocal()
-    try:
-        yield session
-    finally:
-        session.close()
-"""
-
-def generate_migration(output_dir: Optional[Path] = None) -> Path:
+# session.py依赖的数据库配置项，旧项目的配置文件缺少时插入到DATABASE_URL之后
+DB_SETTINGS = [
+    ("DATABASE_REPLICA_URLS", "    DATABASE_REPLICA_URLS: list = []  # 只读副本地址，查询分发到副本"),
+    ("DB_REPLICA_STRATEGY", "    DB_REPLICA_STRATEGY: str = \"round_robin\"  # 副本选择策略：round_robin，least_connections"),
+    ("DB_ECHO", "    DB_ECHO: bool = False  # 是否显示SQL语句"),
+    ("DB_CONNECT_ARGS", "    DB_CONNECT_ARGS: dict = {\"check_same_thread\": False}  # 仅用于SQLite"),
+    ("DB_POOL_CLASS", "    DB_POOL_CLASS: str = \"queue\"  # static：单连接，queue：连接池，null：不复用连接"),
+    ("DB_POOL_SIZE", "    DB_POOL_SIZE: int = 5  # 连接池保持的连接数"),
+    ("DB_MAX_OVERFLOW", "    DB_MAX_OVERFLOW: int = 10  # 连接池满时允许额外创建的连接数"),
+    ("DB_POOL_TIMEOUT", "    DB_POOL_TIMEOUT: float = 30.0  # 等待可用连接的超时时间（秒）"),
+    ("DB_POOL_RECYCLE", "    DB_POOL_RECYCLE: int = -1  # 连接的最长复用时间（秒），-1表示不回收"),
+    ("DB_POOL_PRE_PING", "    DB_POOL_PRE_PING: bool = False  # 取出连接前检测连接是否可用"),
+]
+
+# 数据库会话模板与项目模板共用，保证两者生成的session.py一致
+DB_SESSION_TEMPLATE_NAME = "project/standard/{{project_name}}/app/db/session.py.j2"
+
+def generate_migration(
+    output_dir: Optional[Path] = None,
+    manifest: Optional[GenerationManifest] = None,
+    backend: Optional[OutputBackend] = None,
+    async_mode: Optional[bool] = None
+) -> Path:
     """
     生成数据库迁移配置
     
     Args:
         output_dir: 输出目录，默认为当前项目根目录
+        manifest: 生成文件清单，默认加载项目根目录下的清单；内容未变化的文件不会被重写
+        backend: 输出后端，默认写入磁盘；使用MemoryBackend时只在内存中生成，且不调用alembic
+        async_mode: 是否为异步项目生成配置，默认根据已有的数据库会话模块判断
         
     Returns:
         迁移配置目录路径
@@ -242,76 +319,108 @@ def generate_migration(output_dir: Optional[Path] = None) -> Path:
             # 如果找不到项目根目录，使用当前目录
             output_dir = Path.cwd()
     
+    # 确定输出后端（默认写入磁盘并加载生成文件清单）
+    own_manifest = backend is None and manifest is None
+    if backend is None:
+        if manifest is None:
+            manifest = GenerationManifest.load(output_dir)
+        backend = DiskBackend(manifest)
+    
+    # 未指定时根据已有的数据库会话模块判断是否为异步项目
+    if async_mode is None:
+        async_mode = detect_async_project(output_dir / "app", backend)
+    
     # 创建迁移目录结构
     migrations_dir = output_dir / "migrations"
     versions_dir = migrations_dir / "versions"
     
     # 确保目录存在
-    ensure_dir_exists(migrations_dir)
-    ensure_dir_exists(versions_dir)
+    backend.ensure_dir(migrations_dir)
+    backend.ensure_dir(versions_dir)
     
     # 创建alembic.ini文件
     alembic_ini_path = output_dir / "alembic.ini"
-    with open(alembic_ini_path, "w", encoding="utf-8") as f:
-        f.write(ALEMBIC_INI_TEMPLATE)
+    backend.write_text(alembic_ini_path, ALEMBIC_INI_TEMPLATE)
     
     # 创建env.py文件
     env_py_path = migrations_dir / "env.py"
-    with open(env_py_path, "w", encoding="utf-8") as f:
-        f.write(ALEMBIC_ENV_TEMPLATE)
+    backend.write_text(env_py_path, ALEMBIC_ASYNC_ENV_TEMPLATE if async_mode else ALEMBIC_ENV_TEMPLATE)
     
     # 创建README.md文件
     readme_path = migrations_dir / "README.md"
-    with open(readme_path, "w", encoding="utf-8") as f:
-        f.write(ALEMBIC_README_TEMPLATE)
+    backend.write_text(readme_path, ALEMBIC_README_TEMPLATE)
     
     # 创建空的versions目录下的__init__.py文件
     init_py_path = versions_dir / "__init__.py"
-    with open(init_py_path, "w", encoding="utf-8") as f:
-        f.write("# 迁移版本目录\n")
+    backend.write_text(init_py_path, "# 迁移版本目录\n")
     
     # 创建migrations目录下的__init__.py文件
     init_py_path = migrations_dir / "__init__.py"
-    with open(init_py_path, "w", encoding="utf-8") as f:
-        f.write("# 迁移配置目录\n")
+    backend.write_text(init_py_path, "# 迁移配置目录\n")
     
     # 创建或更新数据库基础文件
     db_dir = output_dir / "app" / "db"
-    ensure_dir_exists(db_dir)
+    backend.ensure_dir(db_dir)
     
     # 创建base.py文件
     base_py_path = db_dir / "base.py"
-    with open(base_py_path, "w", encoding="utf-8") as f:
-        f.write(DB_BASE_TEMPLATE)
+    backend.write_text(base_py_path, DB_BASE_TEMPLATE)
+    
+    # 补全session.py依赖的配置项
+    config_path = output_dir / "app" / "core" / "config.py"
+    config_content = backend.read_text(config_path)
+    if config_content is not None:
+        new_config = add_db_settings(config_content)
+        if new_config != config_content:
+            backend.write_text(config_path, new_config)
     
     # 更新session.py文件
     session_py_path = db_dir / "session.py"
-    with open(session_py_path, "w", encoding="utf-8") as f:
-        f.write(DB_SESSION_TEMPLATE)
+    backend.write_text(session_py_path, render_template(DB_SESSION_TEMPLATE_NAME, {"async_mode": async_mode}))
     
     # 更新requirements.txt，添加alembic依赖
     requirements_path = output_dir / "requirements.txt"
-    if requirements_path.exists():
-        with open(requirements_path, "r", encoding="utf-8") as f:
-            requirements = f.read()
-        
-        # 检查是否已经包含alembic
-        if "alembic" not in requirements:
-            with open(requirements_path, "a", encoding="utf-8") as f:
-                f.write("\n# 数据库迁移\nalembic>=1.12.0\n")
+    requirements = backend.read_text(requirements_path)
+    # 检查是否已经包含alembic
+    if requirements is not None and "alembic" not in requirements:
+        backend.write_text(requirements_path, requirements + "\n# 数据库迁移\nalembic>=1.12.0\n")
+    
+    # 尝试初始化alembic（如果已安装），只在写入磁盘时执行
+    if backend.writes_to_disk:
+        try:
+            subprocess.run(["alembic", "init", "migrations"], 
+                          cwd=output_dir, 
+                          check=False,
+                          capture_output=True)
+        except FileNotFoundError:
+            # 如果alembic未安装，跳过此步骤
+            pass
     
-    # 尝试初始化alembic（如果已安装）
-    try:
-        subprocess.run(["alembic", "init", "migrations"], 
-                      cwd=output_dir, 
-                      check=False,
-                      capture_output=True)
-    except FileNotFoundError:
-        # 如果alembic未安装，跳过此步骤
-        pass
+    if own_manifest:
+        manifest.save()
     
     return migrations_dir
 
+def add_db_settings(config_content: str) -> str:
+    """
+    向配置模块添加缺少的数据库配置项
+    
+    Args:
+        config_content: 配置模块源码
+        
+    Returns:
+        修改后的源码，没有DATABASE_URL或不缺少配置项时原样返回
+    """
+    missing = [line for name, line in DB_SETTINGS if name not in config_content]
+    if not missing:
+        return config_content
+    
+    lines = config_content.split("\n")
+    for index, line in enumerate(lines):
+        if "DATABASE_URL" in line:
+            return "\n".join(lines[:index + 1] + missing + lines[index + 1:])
+    return config_content
+
 def update_config_for_migrations(output_dir: Optional[Path] = None) -> Path:
     """
     更新配置文件以支持数据库迁移
@@ -333,28 +442,16 @@ def update_config_for_migrations(output_dir: Optional[Path] = None) -> Path:
             output_dir = Path.cwd()
     
     # 更新配置文件
-    config_dir = output_dir / "app" / "core"
-    config_path = config_dir / "config.py"
+    config_path = output_dir / "app" / "core" / "config.py"
     
     if config_path.exists():
         with open(config_path, "r", encoding="utf-8") as f:
             config_content = f.read()
         
-        # 检查是否已经包含数据库连接参数
-        if "DB_CONNECT_ARGS" not in config_content:
-            # 寻找合适的位置插入新配置
-            if "DATABASE_URL" in config_content:
-                # 在DATABASE_URL后添加新配置
-                lines = config_content.split("\n")
-                new_lines = []
-                for line in lines:
-                    new_lines.append(line)
-                    if "DATABASE_URL" in line and "DB_CONNECT_ARGS" not in config_content:
-                        new_lines.append("    DB_ECHO: bool = False  # 是否显示SQL语句")
-                        new_lines.append("    DB_CONNECT_ARGS: dict = {\"check_same_thread\": False}  # 仅用于SQLite")
-                
-                with open(config_path, "w", encoding="utf-8") as f:
-                    f.write("\n".join(new_lines))
+        new_content = add_db_settings(config_content)
+        if new_content != config_content:
+            with open(config_path, "w", encoding="utf-8") as f:
+                f.write(new_content)
     
     return config_path
 
@@ -2,73 +2,124 @@
 模型生成器模块
 """
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Union
 import os
 from jinja2 import Environment, FileSystemLoader
 import re
 
-from fastapi_generator.utils.path_utils import ensure_dir_exists, find_project_root
+from fastapi_generator.core.manifest import GenerationManifest
+from fastapi_generator.core.output import DiskBackend, OutputBackend
+from fastapi_generator.core.template_engine import render_code_template
+from fastapi_generator.generators.fields import (
+    enum_class_name, enum_members, field_annotation, field_arguments, model_table_name,
+    relationship_annotation, relationship_arguments, resolve_model_fields, resolve_relationships
+)
+from fastapi_generator.generators.support import MODEL_SUPPORT_MODULES, write_support_modules
+from fastapi_generator.utils.code_utils import add_imports
+from fastapi_generator.utils.path_utils import ensure_dir_exists, find_project_root, resolve_app_dir
 from fastapi_generator.utils.string_utils import to_snake_case, to_pascal_case
 
-# 模型模板
-MODEL_TEMPLATE = """from typing import Optional, List
-from sqlmodel import Field, SQLModel, Relationship
-from datetime import datetime
+# 模型和模式模板（相对于模板根目录）
+MODEL_TEMPLATE_NAME = "generators/model.py.j2"
+SCHEMA_TEMPLATE_NAME = "generators/schema.py.j2"
 
+def render_model(
+    name: str,
+    fields: Optional[Union[List[Any], Dict[str, Any]]] = None,
+    indexes: Optional[List[Any]] = None,
+    unique: Optional[List[Any]] = None,
+    belongs_to: Optional[List[str]] = None,
+    has_many: Optional[List[str]] = None
+) -> Tuple[str, str]:
+    """
+    渲染模型文件和模式文件内容
+    
+    Args:
+        name: 模型名称
+        fields: 字段定义，格式见 fields 模块，默认使用基本字段（name、description）
+        indexes: 索引定义，每项为逗号分隔的字段名，多个字段时生成复合索引
+        unique: 唯一约束定义，格式同 indexes
+        belongs_to: 多对一关联，格式为 名称[:模型]，同时生成外键字段 <名称>_id
+        has_many: 一对多关联，格式为 名称[:模型]，目标模型需要定义指向当前模型的 belongs_to 关联
+        
+    Returns:
+        (模型文件内容, 模式文件内容)
+    """
+    # 处理名称
+    model_name = to_snake_case(name)
+    model_class = to_pascal_case(name)
+    model_display_name = name  # 原始名称作为显示名称
+    
+    # 获取模型名称的复数形式
+    model_name_plural = model_table_name(model_name)  # 简化处理，实际应使用更复杂的复数规则
+    
+    model_fields, composite_indexes, composite_unique = resolve_model_fields(
+        fields, indexes, unique, model_display_name, belongs_to
+    )
+    relationships = resolve_relationships(belongs_to, has_many, model_fields)
+    context = dict(
+        model_name=model_name,
+        model_class=model_class,
+        model_display_name=model_display_name,
+        table_name=model_name_plural,
+        fields=[
+            dict(
+                name=field.name,
+                annotation=field_annotation(model_class, field),
+                update_annotation=field_annotation(model_class, field, optional=True),
+                arguments=field_arguments(field),
+                enum_class=enum_class_name(model_class, field) if field.type == "enum" else None,
+                members=enum_members(field),
+            )
+            for field in model_fields
+        ],
+        field_types={field.type for field in model_fields},
+        indexes=composite_indexes,
+        unique=composite_unique,
+        relationships=[
+            dict(
+                name=relationship.name,
+                kind=relationship.kind,
+                target_name=relationship.target,
+                target_class=to_pascal_case(relationship.target),
+                annotation=relationship_annotation(relationship),
+                arguments=relationship_arguments(model_name, relationship),
+            )
+            for relationship in relationships
+        ],
+    )
+    
+    # 渲染模型模板和模式模板
+    model_content = render_code_template(MODEL_TEMPLATE_NAME, context)
+    schema_content = render_code_template(SCHEMA_TEMPLATE_NAME, context)
+    
+    return model_content, schema_content
 
-class {model_class}Base(SQLModel):
-    \"""基础{model_display_name}模型\"""
-    name: str = Field(index=True, description="{model_display_name}名称")
-    description: Optional[str] = Field(default=None, description="描述")
-
-
-class {model_class}(SQLModel, table=True):
-    \"""数据库{model_display_name}模型\"""
-    __tablename__ = "{model_name_plural}"
-    
-    id: Optional[int] = Field(default=None, primary_key=True)
-    name: str = Field(index=True, description="{model_display_name}名称")
-    description: Optional[str] = Field(default=None, description="描述")
-    created_at: datetime = Field(default_factory=datetime.now, description="创建时间")
-    updated_at: datetime = Field(default_factory=datetime.now, description="更新时间")
-"""
-
-# 模式模板
-SCHEMA_TEMPLATE = """from typing import Optional, List
-from pydantic import BaseModel
-from datetime import datetime
-from app.models.{model_name} import {model_class}Base
-
-
-class {model_class}Create({model_class}Base):
-    \"""创建{model_display_name}请求模型\"""
-    pass
-
-
-class {model_class}Update(BaseModel):
-    \"""更新{model_display_name}请求模型\"""
-    name: Optional[str] = None
-    description: Optional[str] = None
-
-
-class {model_class}Read({model_class}Base):
-    \"""返回{model_display_name}响应模型\"""
-    id: int
-    created_at: datetime
-    updated_at: datetime
-    
-    class Config:
-        orm_mode = True
-"""
-
-def generate_model(name: str, output_dir: Optional[Path] = None, fields: Optional[Dict[str, Any]] = None) -> Path:
+def generate_model(
+    name: str,
+    output_dir: Optional[Path] = None,
+    fields: Optional[Union[List[Any], Dict[str, Any]]] = None,
+    manifest: Optional[GenerationManifest] = None,
+    backend: Optional[OutputBackend] = None,
+    indexes: Optional[List[Any]] = None,
+    unique: Optional[List[Any]] = None,
+    belongs_to: Optional[List[str]] = None,
+    has_many: Optional[List[str]] = None
+) -> Path:
     """
     生成数据模型文件和对应的模式文件
     
     Args:
         name: 模型名称
         output_dir: 输出目录，默认为当前项目的app目录
-        fields: 模型字段定义，默认为None（使用基本字段）
+        fields: 模型字段定义，例如 ["customer_id:int:index", "status:enum(pending,paid)"]，
+            默认为None（使用基本字段）
+        manifest: 生成文件清单，默认加载项目根目录下的清单；内容未变化的文件不会被重写
+        backend: 输出后端，默认写入磁盘；使用MemoryBackend时只在内存中生成
+        indexes: 索引定义，例如 ["customer_id,created_at"]，多个字段时生成复合索引
+        unique: 唯一约束定义，格式同 indexes
+        belongs_to: 多对一关联，例如 ["customer"] 生成外键 customer_id 和 customer 关联
+        has_many: 一对多关联，例如 ["items"]，目标模型 Item 需要定义 belongs_to 当前模型
         
     Returns:
         生成的模型文件路径
@@ -76,98 +127,141 @@ def generate_model(name: str, output_dir: Optional[Path] = None, fields: Optiona
     # 处理名称
     model_name = to_snake_case(name)
     model_class = to_pascal_case(name)
-    model_display_name = name  # 原始名称作为显示名称
     
     # 确定模型输出目录
-    if output_dir is None:
-        # 尝试找到项目根目录
-        project_root = find_project_root()
-        if project_root:
-            # 假设标准项目结构
-            app_dir = project_root / "app"
-            models_dir = app_dir / "models"
-            schemas_dir = app_dir / "schemas"
-        else:
-            # 如果找不到项目根目录，使用当前目录下的app目录
-            app_dir = Path.cwd() / "app"
-            models_dir = app_dir / "models"
-            schemas_dir = app_dir / "schemas"
-    else:
-        # 如果提供了输出目录，检查是否有app目录
-        if (output_dir / "app").exists() and (output_dir / "app").is_dir():
-            # 如果存在app目录，使用app下的models和schemas目录
-            app_dir = output_dir / "app"
-            models_dir = app_dir / "models"
-            schemas_dir = app_dir / "schemas"
-        else:
-            # 否则，假设output_dir已经是app目录或直接使用output_dir
-            app_dir = output_dir
-            models_dir = app_dir / "models"
-            schemas_dir = app_dir / "schemas"
+    app_dir = resolve_app_dir(output_dir, backend.exists if backend else None)
+    models_dir = app_dir / "models"
+    schemas_dir = app_dir / "schemas"
+    
+    # 确定输出后端（默认写入磁盘并加载生成文件清单）
+    own_manifest = backend is None and manifest is None
+    if backend is None:
+        if manifest is None:
+            manifest = GenerationManifest.load(app_dir.parent)
+        backend = DiskBackend(manifest)
     
     # 确保输出目录存在
-    ensure_dir_exists(models_dir)
-    ensure_dir_exists(schemas_dir)
+    backend.ensure_dir(models_dir)
+    backend.ensure_dir(schemas_dir)
     
     # 生成模型文件
     model_file = models_dir / f"{model_name}.py"
     schema_file = schemas_dir / f"{model_name}.py"
     
-    # 获取模型名称的复数形式
-    model_name_plural = model_name + "s"  # 简化处理，实际应使用更复杂的复数规则
+    # 渲染模型和模式模板
+    model_content, schema_content = render_model(name, fields, indexes, unique, belongs_to, has_many)
     
-    # 渲染模型模板
-    model_content = MODEL_TEMPLATE.format(
-        model_name=model_name,
-        model_class=model_class,
-        model_display_name=model_display_name,
-        model_name_plural=model_name_plural
-    )
+    # 写入模型文件（内容未变化时跳过）
+    backend.write_text(model_file, model_content)
     
-    # 渲染模式模板
-    schema_content = SCHEMA_TEMPLATE.format(
-        model_name=model_name,
-        model_class=model_class,
-        model_display_name=model_display_name
-    )
+    # 写入模式文件（内容未变化时跳过）
+    backend.write_text(schema_file, schema_content)
     
-    # 写入模型文件
-    with open(model_file, "w", encoding="utf-8") as f:
-        f.write(model_content)
+    # 更新模型和模式的__init__.py文件
+    _update_init_file(models_dir, model_name, model_class, backend)
+    update_schema_init_file(schemas_dir, [(model_name, model_class)], backend)
     
-    # 写入模式文件
-    with open(schema_file, "w", encoding="utf-8") as f:
-        f.write(schema_content)
+    # 写入模型依赖的公共模块（时间戳默认值）
+    write_support_modules(app_dir, MODEL_SUPPORT_MODULES, backend)
     
-    # 更新模型和模式的__init__.py文件
-    _update_init_file(models_dir, model_name, model_class)
-    _update_init_file(schemas_dir, model_name, model_class)
+    if own_manifest:
+        manifest.save()
     
     return model_file
 
-def _update_init_file(dir_path: Path, model_name: str, model_class: str) -> None:
+def _update_init_file(
+    dir_path: Path,
+    model_name: str,
+    model_class: str,
+    backend: Optional[OutputBackend] = None
+) -> None:
     """
     更新__init__.py文件，添加模型导入
     """
+    update_init_file(dir_path, [(model_name, model_class)], backend)
+
+def update_init_file(
+    dir_path: Path,
+    models: List[Tuple[str, str]],
+    backend: Optional[OutputBackend] = None
+) -> Path:
+    """
+    一次性将多个模型导入添加到__init__.py文件，内容有变化时只写一次文件
+    
+    Args:
+        dir_path: 模型目录
+        models: (模型名称, 模型类名) 列表
+        backend: 输出后端，默认直接写入磁盘
+        
+    Returns:
+        __init__.py文件路径
+    """
+    return _update_package_imports(
+        dir_path,
+        [f"from .{model_name} import {model_class}" for model_name, model_class in models],
+        "数据模型模块",
+        backend
+    )
+
+def update_schema_init_file(
+    dir_path: Path,
+    models: List[Tuple[str, str]],
+    backend: Optional[OutputBackend] = None
+) -> Path:
+    """
+    一次性将多个模型的请求和响应模式导入添加到__init__.py文件
+    
+    Args:
+        dir_path: 模式目录
+        models: (模型名称, 模型类名) 列表
+        backend: 输出后端，默认直接写入磁盘
+        
+    Returns:
+        __init__.py文件路径
+    """
+    return _update_package_imports(
+        dir_path,
+        [
+            f"from .{model_name} import {model_class}Create, {model_class}Read, {model_class}Update"
+            for model_name, model_class in models
+        ],
+        "数据验证模式模块",
+        backend
+    )
+
+def _update_package_imports(
+    dir_path: Path,
+    import_lines: List[str],
+    docstring: str,
+    backend: Optional[OutputBackend] = None
+) -> Path:
+    """
+    解析一次__init__.py文件，按排序位置插入全部导入语句，内容有变化时只写一次文件
+    
+    Args:
+        dir_path: 包目录
+        import_lines: 导入语句列表
+        docstring: __init__.py不存在时使用的模块文档字符串
+        backend: 输出后端，默认直接写入磁盘
+        
+    Returns:
+        __init__.py文件路径
+    """
+    if backend is None:
+        backend = DiskBackend()
+    
     # 确保__init__.py文件存在
     init_file = dir_path / "__init__.py"
-    if not init_file.exists():
-        with open(init_file, "w", encoding="utf-8") as f:
-            f.write(f"""\"\"\"数据模型模块\"\"\"\n""")
-    
-    # 读取现有内容
-    with open(init_file, "r", encoding="utf-8") as f:
-        content = f.read()
-    
-    # 添加导入语句（如果不存在）
-    import_line = f"from .{model_name} import {model_class}\n"
-    if import_line not in content:
-        # 如果文件为空或只有文档字符串，添加新行
-        if not content.strip() or content.strip().endswith('"""'):
-            content += "\n" + import_line
-        else:
-            content += import_line
-        
+    original_content = backend.read_text(init_file)
+    content = original_content
+    if content is None:
+        content = f"\"\"\"{docstring}\"\"\"\n"
+    
+    # 添加导入语句（已导入的跳过）
+    content = add_imports(content, import_lines)
+    
+    if content != original_content:
         # 写回文件
-        with open(init_file, "w", encoding="utf-8") as f:
-            f.write(content) 
\ No newline at end of file
+        backend.write_text(init_file, content)
+    
+    return init_file
@@ -0,0 +1,140 @@
+"""
+生成选项
+
+各生成器通过关键字参数接收生成选项（例如 async_mode），
+这里提供选项校验以及从已有项目中推断选项的函数。
+"""
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fastapi_generator.core.output import DiskBackend, OutputBackend
+from fastapi_generator.generators.fields import BUILTIN_COLUMNS, BUILTIN_MODEL_COLUMNS, ModelColumn, ModelRelationship
+from fastapi_generator.utils.string_utils import to_snake_case
+
+# 取值有限的生成选项及其可选值
+OPTION_CHOICES = {
+    # offset：按偏移量分页；keyset：按排序键的游标分页
+    "pagination": ("offset", "keyset"),
+    # none：不生成ETag；updated_at：根据ID和更新时间；hash：根据响应内容
+    "etag": ("none", "updated_at", "hash"),
+}
+
+
+# 模型模板生成的关联属性，例如 customer: Optional["Customer"] = Relationship()
+_RELATIONSHIP_LINE = re.compile(r'^    (\w+): (Optional|List)\["(\w+)"\] = Relationship\(', re.MULTILINE)
+
+
+# 模型模板生成的表模型类和其中的列，例如 total: Optional[int] = Field(default=None, index=True)
+_TABLE_CLASS = re.compile(r'^class \w+\(SQLModel, table=True\):$(.*?)(?=^class |\Z)', re.MULTILINE | re.DOTALL)
+_COLUMN_LINE = re.compile(r'^    (\w+): (Optional\[)?(\w+)\]? = Field\((.*)$', re.MULTILINE)
+# 复合索引和复合唯一约束的第一列
+_COMPOSITE_LEADING_COLUMN = re.compile(r'(?:Index\("\w+", |UniqueConstraint\()"(\w+)"')
+
+
+def resolve_options(defaults: Dict[str, Any], options: Dict[str, Any], component: str) -> Dict[str, Any]:
+    """
+    校验生成选项并补全默认值
+
+    Args:
+        defaults: 生成器支持的选项及默认值
+        options: 调用方传入的选项，值为None表示未指定
+        component: 组件类型，用于错误信息
+
+    Returns:
+        补全默认值后的选项
+    """
+    # 未指定（None）的选项不校验，调用方可以把同一组选项传给多个生成器
+    unknown = sorted(key for key, value in options.items() if key not in defaults and value is not None)
+    if unknown:
+        raise ValueError(
+            f"{component}生成器不支持的选项: {', '.join(unknown)}。"
+            f"支持的选项: {', '.join(defaults)}"
+        )
+
+    resolved = dict(defaults)
+    resolved.update({key: value for key, value in options.items() if key in defaults and value is not None})
+    for key, choices in OPTION_CHOICES.items():
+        if key in resolved and resolved[key] not in choices:
+            raise ValueError(f"无效的{key}选项: {resolved[key]}。可选值: {', '.join(choices)}")
+    return resolved
+
+
+def detect_async_project(app_dir: Path, backend: Optional[OutputBackend] = None) -> bool:
+    """
+    根据数据库会话模块判断项目是否使用异步数据库访问
+
+    Args:
+        app_dir: 项目的app目录
+        backend: 输出后端，默认读取磁盘
+
+    Returns:
+        app/db/session.py 创建的是异步引擎时返回True
+    """
+    if backend is None:
+        backend = DiskBackend()
+    content = backend.read_text(app_dir / "db" / "session.py")
+    return content is not None and "create_async_engine" in content
+
+
+def detect_model_relationships(
+    app_dir: Path,
+    model_name: str,
+    backend: Optional[OutputBackend] = None
+) -> List[ModelRelationship]:
+    """
+    读取已经生成的模型文件中的关联
+
+    Args:
+        app_dir: 项目的app目录
+        model_name: 模型名称（snake_case）
+        backend: 输出后端，默认读取磁盘
+
+    Returns:
+        模型关联列表，模型文件不存在时返回空列表
+    """
+    if backend is None:
+        backend = DiskBackend()
+    content = backend.read_text(app_dir / "models" / f"{model_name}.py")
+    if content is None:
+        return []
+    return [
+        ModelRelationship(name, "belongs_to" if container == "Optional" else "has_many", to_snake_case(target))
+        for name, container, target in _RELATIONSHIP_LINE.findall(content)
+    ]
+
+
+def detect_model_columns(
+    app_dir: Path,
+    model_name: str,
+    backend: Optional[OutputBackend] = None
+) -> List[ModelColumn]:
+    """
+    读取已经生成的模型文件中的列及其是否有索引
+
+    Args:
+        app_dir: 项目的app目录
+        model_name: 模型名称（snake_case）
+        backend: 输出后端，默认读取磁盘
+
+    Returns:
+        模型的列，模型文件不存在时只返回模型自动生成的列
+    """
+    if backend is None:
+        backend = DiskBackend()
+    content = backend.read_text(app_dir / "models" / f"{model_name}.py")
+    match = _TABLE_CLASS.search(content) if content is not None else None
+    if match is None:
+        return list(BUILTIN_MODEL_COLUMNS)
+    table = match.group(1)
+    leading = set(_COMPOSITE_LEADING_COLUMN.findall(table))
+    return [
+        ModelColumn(
+            name=name,
+            annotation=annotation,
+            indexed=name in leading or any(f"{key}=True" in arguments for key in ("primary_key", "index", "unique")),
+            # 主键和时间戳的注解是 Optional，但数据库中不为空
+            nullable=bool(optional) and name not in BUILTIN_COLUMNS,
+        )
+        for name, optional, annotation, arguments in _COLUMN_LINE.findall(table)
+    ]
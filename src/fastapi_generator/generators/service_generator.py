@@ -2,93 +2,75 @@
 服务生成器模块
 """
 from pathlib import Path
-from typing import List, Optional
-from fastapi_generator.utils.path_utils import ensure_dir_exists, find_project_root
+from typing import Any, List, Optional, Tuple
+from fastapi_generator.core.manifest import GenerationManifest
+from fastapi_generator.core.output import DiskBackend, OutputBackend
+from fastapi_generator.core.template_engine import render_code_template
+from fastapi_generator.generators.options import detect_async_project, resolve_options
+from fastapi_generator.generators.support import required_support_modules, write_support_modules
+from fastapi_generator.utils.code_utils import add_imports
+from fastapi_generator.utils.path_utils import ensure_dir_exists, find_project_root, resolve_app_dir
 from fastapi_generator.utils.string_utils import to_snake_case, to_pascal_case
 
-# 服务模板
-SERVICE_TEMPLATE = """from fastapi import HTTPException, status, Depends
-from sqlmodel import Session, select
-from typing import List, Optional
+# 服务模板（相对于模板根目录）
+SERVICE_TEMPLATE_NAME = "generators/service.py.j2"
 
-from app.db.session import get_session
-from app.models.{model_name} import {model_class}
-from app.schemas.{model_name} import {model_class}Create, {model_class}Read, {model_class}Update
+# 支持的生成选项及默认值
+SERVICE_OPTIONS = {
+    # 生成异步代码（AsyncSession），None表示根据项目的数据库会话模块自动判断
+    "async_mode": None,
+    # 列表接口的分页方式：offset（skip/limit，保持与已有客户端兼容）或 keyset（游标分页，查询代价与翻页深度无关）
+    "pagination": "offset",
+    # 键集分页的排序键，应当是有索引的字段，只在 keyset 分页时使用
+    "cursor_field": "id",
+    # 生成批量创建、更新和删除接口
+    "bulk": False,
+    # 批量接口单次请求的最大数据条数
+    "bulk_max_size": 1000,
+    # 创建、更新和删除使用单条 INSERT/UPDATE ... RETURNING 和 DELETE 语句，需要数据库支持RETURNING（SQLite 3.35+、PostgreSQL）
+    "returning": True,
+}
 
-
-class {model_class}Service:
-    \"\"\"
-    {model_display_name}服务类
-    \"\"\"
-    
-    def __init__(self, session: Session = Depends(get_session)):
-        self.session = session
-    
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[{model_class}]:
-        \"\"\"
-        获取所有{model_display_name}列表
-        \"\"\"
-        return self.session.exec(select({model_class}).offset(skip).limit(limit)).all()
-    
-    def get_by_id(self, {model_name}_id: int) -> Optional[{model_class}]:
-        \"\"\"
-        根据ID获取{model_display_name}
-        \"\"\"
-        return self.session.get({model_class}, {model_name}_id)
-    
-    def create(self, {model_name}_data: {model_class}Create) -> {model_class}:
-        \"\"\"
-        创建新的{model_display_name}
-        \"\"\"
-        {model_name} = {model_class}(**{model_name}_data.dict())
-        self.session.add({model_name})
-        self.session.commit()
-        self.session.refresh({model_name})
-        return {model_name}
-    
-    def update(self, {model_name}_id: int, {model_name}_data: {model_class}Update) -> {model_class}:
-        \"\"\"
-        更新{model_display_name}
-        \"\"\"
-        {model_name} = self.get_by_id({model_name}_id)
-        if not {model_name}:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"{model_display_name} ID {{{model_name}_id}} 不存在"
-            )
-        
-        # 更新模型字段
-        {model_name}_data_dict = {model_name}_data.dict(exclude_unset=True)
-        for key, value in {model_name}_data_dict.items():
-            setattr({model_name}, key, value)
-        
-        self.session.add({model_name})
-        self.session.commit()
-        self.session.refresh({model_name})
-        return {model_name}
-    
-    def delete(self, {model_name}_id: int) -> None:
-        \"\"\"
-        删除{model_display_name}
-        \"\"\"
-        {model_name} = self.get_by_id({model_name}_id)
-        if not {model_name}:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"{model_display_name} ID {{{model_name}_id}} 不存在"
-            )
+def render_service(name: str, **options: Any) -> str:
+    """
+    渲染服务文件内容
+    
+    Args:
+        name: 服务名称
+        options: 生成选项，见 SERVICE_OPTIONS
         
-        self.session.delete({model_name})
-        self.session.commit()
-"""
+    Returns:
+        服务文件内容
+    """
+    # 处理名称
+    model_name = to_snake_case(name)
+    model_class = to_pascal_case(name)
+    model_display_name = name  # 原始名称作为显示名称
+    
+    options = resolve_options(SERVICE_OPTIONS, options, "服务")
+    return render_code_template(SERVICE_TEMPLATE_NAME, dict(
+        model_name=model_name,
+        model_class=model_class,
+        model_display_name=model_display_name,
+        **options
+    ))
 
-def generate_service(name: str, output_dir: Optional[Path] = None) -> Path:
+def generate_service(
+    name: str,
+    output_dir: Optional[Path] = None,
+    manifest: Optional[GenerationManifest] = None,
+    backend: Optional[OutputBackend] = None,
+    **options: Any
+) -> Path:
     """
     生成服务文件
     
     Args:
         name: 服务名称
         output_dir: 输出目录，默认为当前项目的services目录
+        manifest: 生成文件清单，默认加载项目根目录下的清单；内容未变化的文件不会被重写
+        backend: 输出后端，默认写入磁盘；使用MemoryBackend时只在内存中生成
+        options: 生成选项，见 SERVICE_OPTIONS
         
     Returns:
         生成的服务文件路径
@@ -96,76 +78,91 @@ def generate_service(name: str, output_dir: Optional[Path] = None) -> Path:
     # 处理名称
     model_name = to_snake_case(name)
     model_class = to_pascal_case(name)
-    model_display_name = name  # 原始名称作为显示名称
     
     # 确定输出目录
-    if output_dir is None:
-        # 尝试找到项目根目录
-        project_root = find_project_root()
-        if project_root:
-            # 假设标准项目结构
-            app_dir = project_root / "app"
-            services_dir = app_dir / "services"
-        else:
-            # 如果找不到项目根目录，使用当前目录下的app目录
-            app_dir = Path.cwd() / "app"
-            services_dir = app_dir / "services"
-    else:
-        # 如果提供了输出目录，检查是否有app目录
-        if (output_dir / "app").exists() and (output_dir / "app").is_dir():
-            # 如果存在app目录，使用app下的services目录
-            app_dir = output_dir / "app"
-            services_dir = app_dir / "services"
-        else:
-            # 否则，假设output_dir已经是app目录或直接使用output_dir
-            app_dir = output_dir
-            services_dir = app_dir / "services"
+    app_dir = resolve_app_dir(output_dir, backend.exists if backend else None)
+    services_dir = app_dir / "services"
+    
+    # 确定输出后端（默认写入磁盘并加载生成文件清单）
+    own_manifest = backend is None and manifest is None
+    if backend is None:
+        if manifest is None:
+            manifest = GenerationManifest.load(app_dir.parent)
+        backend = DiskBackend(manifest)
     
     # 确保输出目录存在
-    ensure_dir_exists(services_dir)
+    backend.ensure_dir(services_dir)
     
     # 生成服务文件
     service_file = services_dir / f"{model_name}_service.py"
     
+    # 未指定时根据项目的数据库会话模块判断是否生成异步代码
+    if options.get("async_mode") is None:
+        options["async_mode"] = detect_async_project(app_dir, backend)
+    
     # 渲染模板
-    service_content = SERVICE_TEMPLATE.format(
-        model_name=model_name,
-        model_class=model_class,
-        model_display_name=model_display_name
-    )
+    options = resolve_options(SERVICE_OPTIONS, options, "服务")
+    service_content = render_service(name, **options)
     
-    # 写入文件
-    with open(service_file, "w", encoding="utf-8") as f:
-        f.write(service_content)
+    # 写入文件（内容未变化时跳过）
+    backend.write_text(service_file, service_content)
+    
+    # 写入生成代码依赖的公共模块
+    write_support_modules(app_dir, required_support_modules(options), backend)
     
     # 更新__init__.py文件
-    _update_init_file(services_dir, model_name, model_class)
+    _update_init_file(services_dir, model_name, model_class, backend)
+    
+    if own_manifest:
+        manifest.save()
     
     return service_file
 
-def _update_init_file(dir_path: Path, model_name: str, model_class: str) -> None:
+def _update_init_file(
+    dir_path: Path,
+    model_name: str,
+    model_class: str,
+    backend: Optional[OutputBackend] = None
+) -> None:
     """
     更新__init__.py文件，添加服务类导入
     """
+    update_init_file(dir_path, [(model_name, model_class)], backend)
+
+def update_init_file(
+    dir_path: Path,
+    services: List[Tuple[str, str]],
+    backend: Optional[OutputBackend] = None
+) -> Path:
+    """
+    一次性将多个服务类导入添加到__init__.py文件，内容有变化时只写一次文件
+    
+    Args:
+        dir_path: 服务目录
+        services: (模型名称, 模型类名) 列表
+        backend: 输出后端，默认直接写入磁盘
+        
+    Returns:
+        __init__.py文件路径
+    """
+    if backend is None:
+        backend = DiskBackend()
+    
     # 确保__init__.py文件存在
     init_file = dir_path / "__init__.py"
-    if not init_file.exists():
-        with open(init_file, "w", encoding="utf-8") as f:
-            f.write("\"\"\"服务模块\"\"\"\n")
-    
-    # 读取现有内容
-    with open(init_file, "r", encoding="utf-8") as f:
-        content = f.read()
-    
-    # 添加导入语句（如果不存在）
-    import_line = f"from .{model_name}_service import {model_class}Service\n"
-    if import_line not in content:
-        # 如果文件为空或只有文档字符串，添加新行
-        if not content.strip() or content.strip().endswith('"""'):
-            content += "\n" + import_line
-        else:
-            content += import_line
-        
+    content = backend.read_text(init_file)
+    original_content = content
+    if content is None:
+        content = "\"\"\"服务模块\"\"\"\n"
+    
+    # 解析一次文件，按排序位置插入全部导入语句（已导入的跳过）
+    content = add_imports(content, [
+        f"from .{model_name}_service import {model_class}Service"
+        for model_name, model_class in services
+    ])
+    
+    if content != original_content:
         # 写回文件
-        with open(init_file, "w", encoding="utf-8") as f:
-            f.write(content) 
\ No newline at end of file
+        backend.write_text(init_file, content)
+    
+    return init_file
@@ -0,0 +1,95 @@
+"""
+生成代码依赖的公共模块
+
+部分生成选项生成的代码依赖项目中的公共模块（例如键集分页工具）。
+这些模块按需写入项目，内容由生成器模板决定，与资源无关。
+"""
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi_generator.core.output import DiskBackend, OutputBackend
+from fastapi_generator.core.template_engine import render_code_template
+
+# 公共模块名称 -> (相对于app目录的路径, 模板名称)
+SUPPORT_MODULES: Dict[str, Tuple[str, str]] = {
+    "pagination": ("core/pagination.py", "generators/support/pagination.py.j2"),
+    "bulk": ("core/bulk.py", "generators/support/bulk.py.j2"),
+    "cache": ("core/cache.py", "generators/support/cache.py.j2"),
+    "etag": ("core/etag.py", "generators/support/etag.py.j2"),
+    "responses": ("core/responses.py", "generators/support/responses.py.j2"),
+    "export": ("core/export.py", "generators/support/export.py.j2"),
+    "fieldsets": ("core/fieldsets.py", "generators/support/fieldsets.py.j2"),
+    "filters": ("core/filters.py", "generators/support/filters.py.j2"),
+    "timestamps": ("core/timestamps.py", "generators/support/timestamps.py.j2"),
+}
+
+# 生成的模型依赖的公共模块
+MODEL_SUPPORT_MODULES = {"timestamps"}
+
+# 公共模块提供的路由 -> (导入语句, 在API路由聚合文件中的注册语句)
+SUPPORT_ROUTERS: Dict[str, Tuple[str, str]] = {
+    "cache": (
+        "from app.core.cache import router as cache_router",
+        "api_router.include_router(cache_router, prefix=\"/cache\", tags=[\"cache\"])",
+    ),
+}
+
+
+def required_support_modules(options: Dict[str, Any]) -> Set[str]:
+    """
+    根据已补全默认值的生成选项确定生成代码依赖的公共模块
+
+    Args:
+        options: 生成选项
+
+    Returns:
+        公共模块名称集合
+    """
+    modules = set()
+    if options.get("pagination") == "keyset":
+        modules.add("pagination")
+    if options.get("bulk"):
+        modules.add("bulk")
+    if options.get("cache"):
+        modules.add("cache")
+    if options.get("etag", "none") != "none":
+        modules.add("etag")
+    # 缓存、按内容计算ETag和只返回部分字段的接口需要在返回前序列化响应
+    if options.get("cache") or options.get("etag") == "hash" or options.get("sparse_fields"):
+        modules.add("responses")
+    if options.get("export"):
+        modules.add("export")
+    if options.get("sparse_fields"):
+        modules.add("fieldsets")
+    if options.get("filters"):
+        modules.add("filters")
+    return modules
+
+
+def write_support_modules(
+    app_dir: Path,
+    modules: Iterable[str],
+    backend: Optional[OutputBackend] = None
+) -> List[Path]:
+    """
+    将公共模块写入项目
+
+    Args:
+        app_dir: 项目的app目录
+        modules: 公共模块名称
+        backend: 输出后端，默认直接写入磁盘
+
+    Returns:
+        写入的文件路径列表（包括内容未变化而跳过的文件）
+    """
+    if backend is None:
+        backend = DiskBackend()
+
+    written = []
+    for name in sorted(modules):
+        relative_path, template_name = SUPPORT_MODULES[name]
+        path = app_dir / relative_path
+        backend.ensure_dir(path.parent)
+        backend.write_text(path, render_code_template(template_name, {}))
+        written.append(path)
+    return written
@@ -0,0 +1,286 @@
+"""
+Python源码结构化修改工具函数
+
+通过解析语法树定位已有的导入语句和路由注册语句，按排序位置插入新语句并去重。
+模块只解析一次，多条插入合并后一次生成新内容。
+"""
+import ast
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def add_imports(content: str, import_lines: Iterable[str]) -> str:
+    """
+    向模块添加 from ... import ... 导入语句
+
+    已导入的名称会被跳过。新语句插入到同一包下的已有导入之间并保持按模块名排序；
+    没有同类导入时插入到最后一条导入语句之后，再没有则插入到模块文档字符串之后。
+
+    Args:
+        content: 模块源码
+        import_lines: 导入语句，每条为单行的 from ... import ... 语句
+
+    Returns:
+        修改后的源码，没有需要添加的导入时原样返回
+    """
+    tree = _parse(content)
+    insertions = _plan_imports(tree, import_lines)
+    return _apply_insertions(content, insertions) if insertions else content
+
+
+def add_router_includes(content: str, include_lines: Iterable[str], router_name: str = "api_router") -> str:
+    """
+    向路由聚合模块添加 include_router 注册语句
+
+    已注册的路由（按第一个参数判断）会被跳过。新语句插入到已有注册语句之间并按路由变量名排序；
+    没有已有注册语句时插入到路由器定义之后，找不到路由器定义时追加到模块末尾。
+
+    Args:
+        content: 模块源码
+        include_lines: 注册语句，每条为单行的 <router_name>.include_router(...) 调用
+        router_name: 路由器变量名
+
+    Returns:
+        修改后的源码，没有需要添加的注册语句时原样返回
+    """
+    tree = _parse(content)
+    insertions = _plan_includes(tree, include_lines, router_name)
+    return _apply_insertions(content, insertions) if insertions else content
+
+
+def update_router_module(
+    content: str,
+    import_lines: Iterable[str],
+    include_lines: Iterable[str],
+    router_name: str = "api_router"
+) -> str:
+    """
+    同时添加路由导入和注册语句，模块只解析一次
+
+    Args:
+        content: 模块源码
+        import_lines: 导入语句，规则同 add_imports
+        include_lines: 注册语句，规则同 add_router_includes
+        router_name: 路由器变量名
+
+    Returns:
+        修改后的源码，没有需要添加的语句时原样返回
+    """
+    tree = _parse(content)
+    insertions = _plan_imports(tree, import_lines) + _plan_includes(tree, include_lines, router_name)
+    return _apply_insertions(content, insertions) if insertions else content
+
+
+def _plan_imports(tree: ast.Module, import_lines: Iterable[str]) -> List[Tuple[Tuple[int, bool], str]]:
+    """计算需要插入的导入语句及其位置"""
+    imported = {}
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom):
+            imported.setdefault(_import_source(node), set()).update(_bound_names(node))
+
+    # 解析并去重新导入，只保留尚未导入的名称
+    new_imports: Dict[Tuple[int, str], ast.ImportFrom] = {}
+    for line in import_lines:
+        node = _parse_single(line, ast.ImportFrom)
+        source = _import_source(node)
+        names = imported.setdefault(source, set())
+        node.names = [alias for alias in node.names if (alias.asname or alias.name) not in names]
+        if not node.names:
+            continue
+        names.update(_bound_names(node))
+        if source in new_imports:
+            new_imports[source].names.extend(node.names)
+        else:
+            new_imports[source] = node
+
+    insertions = []
+    for source, node in sorted(new_imports.items(), key=lambda item: item[0][1]):
+        family = [
+            existing for existing in tree.body
+            if isinstance(existing, ast.ImportFrom) and _import_package(existing) == _import_package(node)
+        ]
+        statement = _import_statement(node)
+        if family:
+            insertions.append((_sorted_position(family, _import_key, _import_key(node)), statement))
+        else:
+            insertions.append((_import_anchor(tree), statement))
+    return insertions
+
+
+def _plan_includes(
+    tree: ast.Module,
+    include_lines: Iterable[str],
+    router_name: str
+) -> List[Tuple[Tuple[int, bool], str]]:
+    """计算需要插入的路由注册语句及其位置"""
+    family = [node for node in tree.body if _include_key(node, router_name) is not None]
+    registered = {_include_key(node, router_name) for node in family}
+
+    new_includes: Dict[str, str] = {}
+    for line in include_lines:
+        node = _parse_single(line, ast.Expr)
+        key = _include_key(node, router_name)
+        if key is None:
+            raise ValueError(f"无效的路由注册语句: {line}")
+        if key not in registered:
+            registered.add(key)
+            new_includes[key] = line.strip()
+
+    insertions = []
+    for key in sorted(new_includes):
+        if family:
+            position = _sorted_position(family, lambda node: _include_key(node, router_name), key)
+        else:
+            position = _router_anchor(tree, router_name)
+        insertions.append((position, new_includes[key]))
+    return insertions
+
+
+def _parse(content: str) -> ast.Module:
+    """解析模块源码"""
+    try:
+        return ast.parse(content)
+    except SyntaxError as e:
+        raise ValueError(f"无法解析Python代码: {e}")
+
+
+def _parse_single(line: str, node_type: type) -> ast.AST:
+    """解析单条语句并检查类型"""
+    body = _parse(line).body
+    if len(body) != 1 or not isinstance(body[0], node_type):
+        raise ValueError(f"无效的语句: {line}")
+    return body[0]
+
+
+def _import_source(node: ast.ImportFrom) -> Tuple[int, str]:
+    """导入来源：(相对导入层级, 模块名)"""
+    return node.level, node.module or ""
+
+
+def _import_package(node: ast.ImportFrom) -> Tuple[int, str]:
+    """导入来源所在的包，同一包下的导入视为同一组"""
+    level, module = _import_source(node)
+    return level, module.rpartition(".")[0]
+
+
+def _import_key(node: ast.ImportFrom) -> str:
+    """导入语句的排序键"""
+    return node.module or ""
+
+
+def _bound_names(node: ast.ImportFrom) -> List[str]:
+    """导入语句绑定的名称"""
+    return [alias.asname or alias.name for alias in node.names]
+
+
+def _include_key(node: ast.AST, router_name: str) -> Optional[str]:
+    """include_router 调用的排序和去重键（第一个参数的点分名称），不是注册语句时返回None"""
+    if not (isinstance(node, ast.Expr) and isinstance(node.value, ast.Call)):
+        return None
+    func = node.value.func
+    if not (
+        isinstance(func, ast.Attribute)
+        and func.attr == "include_router"
+        and isinstance(func.value, ast.Name)
+        and func.value.id == router_name
+        and node.value.args
+    ):
+        return None
+    return _dotted_name(node.value.args[0])
+
+
+def _import_statement(node: ast.ImportFrom) -> str:
+    """根据语法树节点生成单行的 from ... import ... 语句"""
+    names = ", ".join(alias.name if alias.asname is None else f"{alias.name} as {alias.asname}" for alias in node.names)
+    return f"from {'.' * node.level}{node.module or ''} import {names}"
+
+
+def _dotted_name(node: ast.expr) -> str:
+    """名称或属性访问表达式的点分形式，例如 endpoints.order.router；其他表达式返回语法树的结构表示"""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return f"{_dotted_name(node.value)}.{node.attr}"
+    return ast.dump(node)
+
+
+def _sorted_position(family: List[ast.stmt], key_func, key: str) -> Tuple[int, bool]:
+    """
+    在同类语句中按排序键找到插入位置
+
+    Returns:
+        (插入位置的行号（从0开始，插入到该行之前）, 是否需要空行分隔)
+    """
+    for node in family:
+        if key_func(node) > key:
+            return node.lineno - 1, False
+    return family[-1].end_lineno, False
+
+
+def _import_anchor(tree: ast.Module) -> Tuple[int, bool]:
+    """没有同类导入时的插入位置：最后一条导入语句或模块文档字符串之后"""
+    imports = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    if imports:
+        return imports[-1].end_lineno, True
+    if tree.body and _is_docstring(tree.body[0]):
+        return tree.body[0].end_lineno, True
+    return _end_anchor(tree)
+
+
+def _router_anchor(tree: ast.Module, router_name: str) -> Tuple[int, bool]:
+    """没有已有注册语句时的插入位置：路由器定义之后"""
+    for node in tree.body:
+        if isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            if any(isinstance(target, ast.Name) and target.id == router_name for target in targets):
+                return node.end_lineno, True
+    return _end_anchor(tree)
+
+
+def _end_anchor(tree: ast.Module) -> Tuple[int, bool]:
+    """模块末尾，非空模块需要空行分隔"""
+    return -1, bool(tree.body)
+
+
+def _is_docstring(node: ast.stmt) -> bool:
+    """判断是否为文档字符串"""
+    return (
+        isinstance(node, ast.Expr)
+        and isinstance(node.value, ast.Constant)
+        and isinstance(node.value.value, str)
+    )
+
+
+def _apply_insertions(content: str, insertions: List[Tuple[Tuple[int, bool], str]]) -> str:
+    """
+    一次性应用全部插入
+
+    Args:
+        content: 原始源码
+        insertions: ((插入行号, 是否需要空行分隔), 语句) 列表，同一位置的语句保持给定顺序
+
+    Returns:
+        修改后的源码
+    """
+    lines = content.splitlines(keepends=True)
+    if lines and not lines[-1].endswith("\n"):
+        lines[-1] += "\n"
+    has_content = any(line.strip() for line in lines)
+
+    grouped: Dict[int, List[str]] = {}
+    separated = set()
+    for (position, separate), statement in insertions:
+        if position < 0:
+            position = len(lines)
+        grouped.setdefault(position, []).append(statement + "\n")
+        if separate and has_content:
+            separated.add(position)
+
+    result = []
+    for index in range(len(lines) + 1):
+        if index in grouped:
+            if index in separated:
+                result.append("\n")
+            result.extend(grouped[index])
+        if index < len(lines):
+            result.append(lines[index])
+    return "".join(result)
@@ -3,7 +3,7 @@
 """
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 def get_package_root() -> Path:
     """
@@ -68,4 +68,38 @@ def find_project_root(start_dir: Optional[Path] = None) -> Optional[Path]:
         if parent_dir == current_dir:
             return None
         
-        current_dir = parent_dir 
\ No newline at end of file
+        current_dir = parent_dir
+
+
+def resolve_app_dir(
+    output_dir: Optional[Path] = None,
+    exists: Optional[Callable[[Path], bool]] = None
+) -> Path:
+    """
+    确定生成组件时使用的app目录
+    
+    Args:
+        output_dir: 输出目录，默认为当前项目根目录
+        exists: 判断目录是否存在的函数，默认检查磁盘（内存输出后端传入自己的判断）
+        
+    Returns:
+        app目录路径
+    """
+    if output_dir is None:
+        # 尝试找到项目根目录
+        project_root = find_project_root()
+        if project_root:
+            # 假设标准项目结构
+            return project_root / "app"
+        # 如果找不到项目根目录，使用当前目录下的app目录
+        return Path.cwd() / "app"
+    
+    # 如果提供了输出目录，检查是否有app目录
+    if exists is not None:
+        if exists(output_dir / "app"):
+            return output_dir / "app"
+    elif (output_dir / "app").exists() and (output_dir / "app").is_dir():
+        return output_dir / "app"
+    
+    # 否则，假设output_dir已经是app目录
+    return output_dir
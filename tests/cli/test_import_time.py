@@ -0,0 +1,68 @@
+"""
+命令行启动开销回归测试
+"""
+import re
+import subprocess
+import sys
+
+import pytest
+
+# 导入命令行模块的累计耗时上限（微秒），只用于发现明显的回归
+IMPORT_TIME_LIMIT_US = 500_000
+
+# 启动时不应加载的重量级模块
+HEAVY_MODULES = [
+    "jinja2",
+    "rich",
+    "yaml",
+    "fastapi_generator.core.project_creator",
+    "fastapi_generator.core.template_engine",
+    "fastapi_generator.core.watcher",
+    "fastapi_generator.generators.api_generator",
+    "fastapi_generator.generators.model_generator",
+    "fastapi_generator.generators.service_generator",
+    "fastapi_generator.generators.migration_generator",
+    "fastapi_generator.generators.batch_generator",
+]
+
+
+def _run_python(code):
+    """在新的解释器中执行代码"""
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+    )
+
+
+class TestImportTime:
+    """测试命令行模块的导入开销"""
+
+    def test_cli_import_time_upper_bound(self):
+        """测试导入命令行模块的累计耗时不超过上限"""
+        result = _run_python("import fastapi_generator.cli.main")
+        assert result.returncode == 0, result.stderr
+
+        match = re.search(r"\|\s*(\d+)\s*\|\s*fastapi_generator\.cli\.main\s*$", result.stderr, re.M)
+        assert match, result.stderr
+        assert int(match.group(1)) < IMPORT_TIME_LIMIT_US
+
+    @pytest.mark.parametrize("argv", [[], ["--version"]])
+    def test_heavy_modules_not_loaded(self, argv):
+        """测试导入命令行模块和显示版本号时不加载生成器、jinja2和rich"""
+        code = (
+            "import sys\n"
+            "from fastapi_generator.cli.main import app\n"
+            f"argv = {argv!r}\n"
+            "if argv:\n"
+            "    try:\n"
+            "        app(argv)\n"
+            "    except SystemExit:\n"
+            "        pass\n"
+            "print('\\n'.join(sorted(sys.modules)))\n"
+        )
+        result = _run_python(code)
+        assert result.returncode == 0, result.stderr
+
+        loaded = set(result.stdout.split())
+        assert not [name for name in HEAVY_MODULES if name in loaded]
@@ -0,0 +1,98 @@
+"""
+生成文件清单测试
+"""
+import os
+import shutil
+import tempfile
+from pathlib import Path
+import pytest
+
+from fastapi_generator.core.manifest import GenerationManifest, MANIFEST_FILENAME
+from fastapi_generator.generators.api_generator import generate_api
+from fastapi_generator.generators.migration_generator import generate_migration
+from fastapi_generator.generators.model_generator import generate_model
+from fastapi_generator.generators.service_generator import generate_service
+
+
+class TestGenerationManifest:
+    """测试增量生成"""
+
+    @pytest.fixture
+    def temp_project(self):
+        """创建临时项目目录用于测试"""
+        temp_dir = Path(tempfile.mkdtemp())
+        project_path = temp_dir / "test_project"
+        os.makedirs(project_path / "app", exist_ok=True)
+        yield project_path
+        # 测试后清理
+        shutil.rmtree(temp_dir)
+
+    def _snapshot(self, project_path):
+        """记录项目中所有文件的修改时间"""
+        return {
+            p: p.stat().st_mtime_ns
+            for p in project_path.rglob("*")
+            if p.is_file() and p.name != MANIFEST_FILENAME
+        }
+
+    def test_write_file_skips_unchanged_content(self, temp_project):
+        """测试内容未变化时不重写文件"""
+        target = temp_project / "generated.py"
+
+        manifest = GenerationManifest.load(temp_project)
+        assert manifest.write_file(target, "x = 1\n")
+        manifest.save()
+        mtime = target.stat().st_mtime_ns
+
+        manifest = GenerationManifest.load(temp_project)
+        assert not manifest.write_file(target, "x = 1\n")
+        assert manifest.skipped == [target]
+        assert target.stat().st_mtime_ns == mtime
+
+        assert manifest.write_file(target, "x = 2\n")
+        assert manifest.written == [target]
+        assert target.read_text(encoding="utf-8") == "x = 2\n"
+
+    def test_write_file_detects_external_edits(self, temp_project):
+        """测试生成后被手动修改的文件会被重新生成"""
+        target = temp_project / "generated.py"
+        manifest = GenerationManifest.load(temp_project)
+        manifest.write_file(target, "x = 1\n")
+        manifest.save()
+
+        with open(target, "w", encoding="utf-8") as f:
+            f.write("x = 'edited'\n")
+
+        manifest = GenerationManifest.load(temp_project)
+        assert manifest.write_file(target, "x = 1\n")
+        assert target.read_text(encoding="utf-8") == "x = 1\n"
+
+    def test_corrupt_manifest_is_ignored(self, temp_project):
+        """测试损坏的清单文件被视为空清单"""
+        with open(temp_project / MANIFEST_FILENAME, "w", encoding="utf-8") as f:
+            f.write("{not json")
+        manifest = GenerationManifest.load(temp_project)
+        assert manifest.entries == {}
+
+    def test_regenerating_resources_keeps_mtimes(self, temp_project):
+        """测试重复生成资源时所有文件保持原有修改时间"""
+        def generate_all():
+            generate_model("order", output_dir=temp_project)
+            generate_service("order", output_dir=temp_project)
+            generate_api("order", output_dir=temp_project)
+            generate_migration(temp_project)
+
+        generate_all()
+        before = self._snapshot(temp_project)
+
+        generate_all()
+        assert self._snapshot(temp_project) == before
+
+    def test_manifest_reports_skipped_files(self, temp_project):
+        """测试通过传入的清单获取跳过的文件"""
+        generate_model("order", output_dir=temp_project)
+
+        manifest = GenerationManifest.load(temp_project)
+        model_file = generate_model("order", output_dir=temp_project, manifest=manifest)
+        assert model_file in manifest.skipped
+        assert manifest.written == []
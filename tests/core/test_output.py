@@ -0,0 +1,164 @@
+"""
+输出后端测试
+"""
+import os
+import shutil
+import tempfile
+from pathlib import Path
+import pytest
+
+from fastapi_generator.core.output import DiskBackend, MemoryBackend
+from fastapi_generator.core.project_creator import create_project
+from fastapi_generator.generators.api_generator import generate_api
+from fastapi_generator.generators.batch_generator import generate_resources, normalize_spec
+from fastapi_generator.generators.migration_generator import generate_migration
+from fastapi_generator.generators.model_generator import generate_model
+from fastapi_generator.generators.service_generator import generate_service
+
+
+class TestMemoryBackend:
+    """测试内存输出后端"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """创建临时目录用于测试"""
+        temp_dir = tempfile.mkdtemp()
+        yield Path(temp_dir)
+        # 测试后清理
+        shutil.rmtree(temp_dir)
+
+    def test_create_project_in_memory(self, temp_dir):
+        """测试内存中创建项目时不写入磁盘，且内容与写入磁盘的结果一致"""
+        backend = MemoryBackend()
+        project_dir = create_project("memory_project", output_dir=temp_dir, template="standard", backend=backend)
+
+        assert os.listdir(temp_dir) == []
+        files = backend.to_dict(project_dir)
+        assert "main.py" in files
+
+        disk_dir = create_project("memory_project", output_dir=temp_dir, template="standard")
+        disk_files = {
+            p.relative_to(disk_dir).as_posix(): p.read_bytes()
+            for p in disk_dir.rglob("*")
+            if p.is_file()
+        }
+        assert {
+            path: content.encode("utf-8") if isinstance(content, str) else content
+            for path, content in files.items()
+        } == disk_files
+
+    def test_create_project_in_memory_with_jobs(self, temp_dir):
+        """测试并行渲染到内存的结果与串行一致"""
+        serial = MemoryBackend()
+        parallel = MemoryBackend()
+        project_dir = create_project("memory_project", output_dir=temp_dir, backend=serial)
+        create_project("memory_project", output_dir=temp_dir, jobs=4, backend=parallel)
+
+        assert parallel.to_dict(project_dir) == serial.to_dict(project_dir)
+
+    def test_generators_in_memory(self, temp_dir):
+        """测试在内存中的项目上运行各生成器"""
+        backend = MemoryBackend()
+        project_dir = create_project("memory_project", output_dir=temp_dir, backend=backend)
+
+        generate_model("order", output_dir=project_dir, backend=backend)
+        generate_service("order", output_dir=project_dir, backend=backend)
+        generate_api("order", output_dir=project_dir, backend=backend)
+        generate_migration(project_dir, backend=backend)
+
+        assert os.listdir(temp_dir) == []
+        files = backend.to_dict(project_dir)
+        assert "class Order(" in files["app/models/order.py"]
+        assert "from .order import Order" in files["app/models/__init__.py"]
+        assert "from .order_service import OrderService" in files["app/services/__init__.py"]
+        assert "order_router" in files["app/api/api_v1/api.py"]
+        assert "alembic" in files["requirements.txt"]
+        assert "migrations/env.py" in files
+
+    def test_generators_without_project(self, temp_dir):
+        """测试对空的内存后端生成资源时返回生成文件映射"""
+        backend = MemoryBackend()
+        resources = normalize_spec({"resources": ["order", "product"]})
+        generate_resources(resources, output_dir=temp_dir, backend=backend)
+
+        assert os.listdir(temp_dir) == []
+        assert sorted(backend.to_dict(temp_dir)) == [
+            "api/api_v1/api.py",
+            "api/api_v1/endpoints/order.py",
+            "api/api_v1/endpoints/product.py",
+            "core/timestamps.py",
+            "models/__init__.py",
+            "models/order.py",
+            "models/product.py",
+            "schemas/__init__.py",
+            "schemas/order.py",
+            "schemas/product.py",
+            "services/__init__.py",
+            "services/order_service.py",
+            "services/product_service.py",
+        ]
+
+    def test_abort_tree_discards_files(self, temp_dir):
+        """测试放弃目录树时删除其中的文件"""
+        backend = MemoryBackend()
+        backend.write_text(temp_dir / "keep.py", "x = 1\n")
+        backend.ensure_dir(temp_dir / "tree")
+        backend.write_text(temp_dir / "tree" / "a.py", "a = 1\n")
+
+        backend.abort_tree(temp_dir / "tree")
+
+        assert backend.to_dict(temp_dir) == {"keep.py": "x = 1\n"}
+        assert not backend.exists(temp_dir / "tree")
+
+
+class TestDiskBackend:
+    """测试磁盘输出后端"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """创建临时目录用于测试"""
+        temp_dir = tempfile.mkdtemp()
+        yield Path(temp_dir)
+        # 测试后清理
+        shutil.rmtree(temp_dir)
+
+    def test_read_write(self, temp_dir):
+        """测试读写文本文件"""
+        backend = DiskBackend()
+        target = temp_dir / "generated.py"
+
+        assert backend.read_text(target) is None
+        assert backend.write_text(target, "x = 1\n")
+        assert backend.read_text(target) == "x = 1\n"
+
+    def test_commit_tree_refuses_existing_directory(self, temp_dir):
+        """测试发布目录树时目标目录已存在则报错"""
+        backend = DiskBackend()
+        final_dir = temp_dir / "project"
+        work_dir = backend.ensure_dir(backend.begin_tree(final_dir))
+        final_dir.mkdir()
+
+        with pytest.raises(FileExistsError):
+            backend.commit_tree(work_dir, final_dir)
+
+        backend.abort_tree(work_dir)
+        assert os.listdir(temp_dir) == ["project"]
+
+    def test_commit_tree_without_renameat2(self, temp_dir, monkeypatch):
+        """测试系统不支持 renameat2 时先占用目标名称再发布"""
+        from fastapi_generator.core import output
+
+        monkeypatch.setattr(output, "_renameat2", lambda source, target: False)
+        backend = DiskBackend()
+        final_dir = temp_dir / "project"
+        work_dir = backend.ensure_dir(backend.begin_tree(final_dir))
+        backend.write_text(work_dir / "main.py", "x = 1\n")
+
+        backend.commit_tree(work_dir, final_dir)
+        assert os.listdir(temp_dir) == ["project"]
+        assert (final_dir / "main.py").read_text(encoding="utf-8") == "x = 1\n"
+
+        work_dir = backend.ensure_dir(backend.begin_tree(final_dir))
+        with pytest.raises(FileExistsError):
+            backend.commit_tree(work_dir, final_dir)
+        assert os.listdir(final_dir) == ["main.py"]
@@ -78,4 +78,103 @@ class TestProjectCreator:
         
         # 执行与验证
         with pytest.raises(FileExistsError):
-            create_project(project_name, output_dir=temp_dir) 
\ No newline at end of file
+            create_project(project_name, output_dir=temp_dir)
+
+    def test_parallel_output_matches_serial(self, temp_dir):
+        """测试并行创建的项目与串行创建的项目逐字节一致"""
+        serial_path = create_project("same_project", output_dir=temp_dir / "serial", template="standard")
+        parallel_path = create_project("same_project", output_dir=temp_dir / "parallel", template="standard", jobs=4)
+
+        serial_files = sorted(p.relative_to(serial_path) for p in serial_path.rglob("*") if p.is_file())
+        parallel_files = sorted(p.relative_to(parallel_path) for p in parallel_path.rglob("*") if p.is_file())
+        assert serial_files == parallel_files
+        for relative in serial_files:
+            assert (serial_path / relative).read_bytes() == (parallel_path / relative).read_bytes()
+
+    def test_parallel_failure_cleans_up(self, temp_dir, monkeypatch):
+        """测试并行模式下渲染失败时清理项目目录"""
+        from fastapi_generator.core import project_creator
+
+        original_render = project_creator.render_template
+
+        def failing_render(name, context):
+            if name.endswith("config.py.j2"):
+                raise RuntimeError("render failed")
+            return original_render(name, context)
+
+        monkeypatch.setattr(project_creator, "render_template", failing_render)
+
+        with pytest.raises(RuntimeError):
+            create_project("broken_project", output_dir=temp_dir, template="standard", jobs=4)
+        assert not (temp_dir / "broken_project").exists()
+        # 渲染失败时不会创建任何目录
+        assert list(temp_dir.iterdir()) == []
+
+    def test_project_is_published_atomically(self, temp_dir, monkeypatch):
+        """测试写入过程中项目目录不可见，完成后一次性出现"""
+        from fastapi_generator.core import project_creator
+
+        project_path = temp_dir / "atomic_project"
+        original_write = project_creator._write_task
+
+        def checking_write(task, content, backend):
+            assert not project_path.exists()
+            original_write(task, content, backend)
+
+        monkeypatch.setattr(project_creator, "_write_task", checking_write)
+
+        assert create_project("atomic_project", output_dir=temp_dir, template="standard") == project_path
+        assert (project_path / "app" / "core" / "config.py").exists()
+        # 发布后不留下暂存目录
+        assert [p.name for p in temp_dir.iterdir()] == ["atomic_project"]
+
+    def test_write_failure_removes_staging_dir(self, temp_dir, monkeypatch):
+        """测试写入失败时清理暂存目录且项目目录从未出现"""
+        from fastapi_generator.core import project_creator
+
+        original_write = project_creator._write_task
+
+        def failing_write(task, content, backend):
+            if task.target.name == "main.py":
+                raise OSError("disk full")
+            original_write(task, content, backend)
+
+        monkeypatch.setattr(project_creator, "_write_task", failing_write)
+
+        with pytest.raises(OSError):
+            create_project("broken_write", output_dir=temp_dir, template="standard")
+        assert list(temp_dir.iterdir()) == []
+
+    def test_create_project_with_invalid_jobs(self, temp_dir):
+        """测试使用无效线程数创建项目"""
+        with pytest.raises(ValueError):
+            create_project("invalid_jobs", output_dir=temp_dir, jobs=0)
+
+    def test_create_async_project(self, temp_dir):
+        """测试创建使用异步数据库访问的项目"""
+        project_path = create_project("test_async", output_dir=temp_dir, template="standard", async_mode=True)
+
+        session = (project_path / "app" / "db" / "session.py").read_text(encoding="utf-8")
+        assert "create_async_engine" in session
+        assert "async def get_session" in session
+        assert "sqlite+aiosqlite" in (project_path / "app" / "core" / "config.py").read_text(encoding="utf-8")
+        assert "aiosqlite" in (project_path / "requirements.txt").read_text(encoding="utf-8")
+        assert "async_engine_from_config" in (project_path / "migrations" / "env.py").read_text(encoding="utf-8")
+        for path in ("app/db/session.py", "migrations/env.py"):
+            compile((project_path / path).read_text(encoding="utf-8"), path, "exec")
+
+    def test_create_project_json_response(self, temp_dir):
+        """测试默认JSON响应方式：默认依赖FastAPI直接序列化，orjson时使用ORJSONResponse"""
+        project_path = create_project("test_json", output_dir=temp_dir, template="standard")
+        assert "ORJSONResponse" not in (project_path / "main.py").read_text(encoding="utf-8")
+        assert "fastapi>=0.130.0" in (project_path / "requirements.txt").read_text(encoding="utf-8")
+        assert "sqlalchemy>=2.0.0" in (project_path / "requirements.txt").read_text(encoding="utf-8")
+
+        project_path = create_project("test_orjson", output_dir=temp_dir, template="standard", json_response="orjson")
+        main_content = (project_path / "main.py").read_text(encoding="utf-8")
+        assert "default_response_class=ORJSONResponse" in main_content
+        assert "orjson>=" in (project_path / "requirements.txt").read_text(encoding="utf-8")
+        compile(main_content, "main.py", "exec")
+
+        with pytest.raises(ValueError):
+            create_project("test_ujson", output_dir=temp_dir, json_response="ujson")
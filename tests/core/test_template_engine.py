@@ -0,0 +1,69 @@
+"""
+模板编译缓存测试
+"""
+import shutil
+import tempfile
+from pathlib import Path
+import pytest
+
+from fastapi_generator.core import template_engine
+from fastapi_generator.core.project_creator import create_project
+
+
+class TestTemplateEngine:
+    """测试共享模板环境与编译缓存"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """创建临时目录用于测试"""
+        temp_dir = Path(tempfile.mkdtemp())
+        yield temp_dir
+        # 测试后清理
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def cache_dir(self, temp_dir, monkeypatch):
+        """使用独立的字节码缓存目录"""
+        cache_dir = temp_dir / "cache"
+        monkeypatch.setenv(template_engine.CACHE_DIR_ENV, str(cache_dir))
+        template_engine.reset_environment()
+        template_engine.reset_cache_stats()
+        yield cache_dir
+        template_engine.reset_environment()
+
+    def test_second_project_reuses_compiled_templates(self, temp_dir, cache_dir):
+        """测试同一进程内第二次创建项目不再编译模板"""
+        create_project("first", output_dir=temp_dir, template="standard")
+        first = template_engine.get_cache_stats()
+        assert first["misses"] > 0
+        assert first["hits"] == 0
+
+        template_engine.reset_cache_stats()
+        create_project("second", output_dir=temp_dir, template="standard")
+        second = template_engine.get_cache_stats()
+        assert second["misses"] == 0
+        assert second["hits"] == first["misses"]
+
+    def test_bytecode_cache_survives_new_environment(self, temp_dir, cache_dir):
+        """测试磁盘字节码缓存可被新的环境（模拟新进程）复用"""
+        create_project("first", output_dir=temp_dir, template="basic")
+        assert any(cache_dir.iterdir())
+
+        # 丢弃进程内缓存，模拟新进程
+        template_engine.reset_environment()
+        template_engine.reset_cache_stats()
+        create_project("second", output_dir=temp_dir, template="basic")
+        stats = template_engine.get_cache_stats()
+        assert stats["misses"] == 0
+        assert stats["bytecode_misses"] == 0
+        assert stats["bytecode_hits"] == stats["hits"] > 0
+
+    def test_disable_bytecode_cache(self, temp_dir, monkeypatch):
+        """测试将缓存目录设置为空字符串时禁用磁盘缓存"""
+        monkeypatch.setenv(template_engine.CACHE_DIR_ENV, "")
+        template_engine.reset_environment()
+        try:
+            assert template_engine.get_cache_dir() is None
+            assert template_engine.get_environment().bytecode_cache is None
+        finally:
+            template_engine.reset_environment()
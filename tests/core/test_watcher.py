@@ -0,0 +1,99 @@
+"""
+规格文件监视器测试
+"""
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+import pytest
+
+from fastapi_generator.core.watcher import SpecWatcher
+
+
+class TestSpecWatcher:
+    """测试监视模式"""
+
+    @pytest.fixture
+    def temp_project(self):
+        """创建临时项目目录用于测试"""
+        temp_dir = Path(tempfile.mkdtemp())
+        project_path = temp_dir / "test_project"
+        os.makedirs(project_path / "app" / "api" / "api_v1", exist_ok=True)
+        with open(project_path / "app" / "api" / "api_v1" / "api.py", "w", encoding="utf-8") as f:
+            f.write("from fastapi import APIRouter\n\napi_router = APIRouter()\n")
+        yield project_path
+        # 测试后清理
+        shutil.rmtree(temp_dir)
+
+    def _write_spec(self, spec_path, spec, mtime_ns):
+        """写入规格文件并设置修改时间，避免依赖文件系统的时间精度"""
+        with open(spec_path, "w", encoding="utf-8") as f:
+            json.dump(spec, f)
+        os.utime(spec_path, ns=(mtime_ns, mtime_ns))
+
+    def _mtimes(self, project_path):
+        """记录app目录下所有文件的修改时间"""
+        return {p: p.stat().st_mtime_ns for p in (project_path / "app").rglob("*.py")}
+
+    def test_regenerates_only_changed_resources(self, temp_project):
+        """测试规格文件变化时只重新生成定义发生变化的资源"""
+        spec_path = temp_project / "spec.json"
+        self._write_spec(spec_path, {"resources": ["order", "product"]}, 1_000_000_000)
+
+        watcher = SpecWatcher(spec_path, temp_project)
+        result = watcher.check()
+        assert result.changed == ["order", "product"]
+        assert (temp_project / "app" / "models" / "product.py").exists()
+
+        # 规格文件未变化时不做任何事
+        assert watcher.check() is None
+
+        before = self._mtimes(temp_project)
+        self._write_spec(spec_path, {
+            "resources": ["order", {"name": "product", "components": ["model"]}, "customer"]
+        }, 2_000_000_000)
+        result = watcher.check()
+
+        assert result.changed == ["product", "customer"]
+        assert result.removed == []
+        assert (temp_project / "app" / "models" / "customer.py").exists()
+        # 未变化的资源及内容相同的文件不会被重写
+        after = self._mtimes(temp_project)
+        for path in ("models/order.py", "services/order_service.py", "models/product.py"):
+            path = temp_project / "app" / path
+            assert after[path] == before[path]
+        assert temp_project / "app" / "models" / "product.py" in result.skipped
+
+    def test_reports_removed_resources(self, temp_project):
+        """测试从规格文件中移除的资源只报告不删除文件"""
+        spec_path = temp_project / "spec.json"
+        self._write_spec(spec_path, {"resources": ["order", "product"]}, 1_000_000_000)
+        watcher = SpecWatcher(spec_path, temp_project)
+        watcher.check()
+
+        self._write_spec(spec_path, {"resources": ["order"]}, 2_000_000_000)
+        result = watcher.check()
+
+        assert result.changed == []
+        assert result.removed == ["product"]
+        assert result.written == []
+        assert (temp_project / "app" / "models" / "product.py").exists()
+
+    def test_run_reports_invalid_spec(self, temp_project):
+        """测试规格文件无效时报告错误并继续监视"""
+        spec_path = temp_project / "spec.json"
+        with open(spec_path, "w", encoding="utf-8") as f:
+            f.write("{not json")
+
+        watcher = SpecWatcher(spec_path, temp_project)
+        results = []
+        errors = []
+        watcher.run(interval=0, on_result=results.append, on_error=errors.append, max_checks=3)
+
+        assert len(errors) == 1
+        assert results == []
+
+        self._write_spec(spec_path, {"resources": ["order"]}, 3_000_000_000)
+        watcher.run(interval=0, on_result=results.append, on_error=errors.append, max_checks=1)
+        assert [result.changed for result in results] == [["order"]]
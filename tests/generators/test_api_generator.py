@@ -86,4 +86,530 @@ api_router = APIRouter()
         assert endpoint_file.exists()
         with open(endpoint_file, "r", encoding="utf-8") as f:
             content = f.read()
-            assert "def get_all" in content  # 验证文件已被覆盖 
\ No newline at end of file
+            assert "def get_all" in content  # 验证文件已被覆盖 
+    
+    def test_generate_async_api(self, temp_project):
+        """测试为异步项目生成API时自动使用异步会话"""
+        os.makedirs(temp_project / "app" / "db", exist_ok=True)
+        with open(temp_project / "app" / "db" / "session.py", "w", encoding="utf-8") as f:
+            f.write("from sqlalchemy.ext.asyncio import create_async_engine\n")
+
+        endpoint_file = generate_api("order", output_dir=temp_project)
+
+        content = endpoint_file.read_text(encoding="utf-8")
+        assert "async def get_all_orders" in content
+        assert "session: AsyncSession = Depends(get_session)" in content
+        assert "await session.execute(statement)" in content
+        assert "await session.commit()" in content
+        compile(content, str(endpoint_file), "exec")
+
+        # 显式指定时不再自动判断
+        endpoint_file = generate_api("order", output_dir=temp_project, async_mode=False)
+        assert "async def" not in endpoint_file.read_text(encoding="utf-8")
+
+    def test_generate_api_with_unknown_option(self, temp_project):
+        """测试传入不支持的生成选项"""
+        with pytest.raises(ValueError):
+            generate_api("order", output_dir=temp_project, colour="red")
+
+    def test_generate_api_pagination(self, temp_project):
+        """测试列表接口默认使用偏移量分页，并可以切换为游标分页"""
+        endpoint_file = generate_api("order", output_dir=temp_project)
+        content = endpoint_file.read_text(encoding="utf-8")
+        assert "response_model=List[OrderRead]" in content
+        assert ".offset(skip).limit(limit)" in content
+        assert not (temp_project / "app" / "core" / "pagination.py").exists()
+
+        endpoint_file = generate_api("order", output_dir=temp_project, pagination="keyset", cursor_field="created_at")
+
+        content = endpoint_file.read_text(encoding="utf-8")
+        assert "response_model=Page[OrderRead]" in content
+        assert 'keyset_query(select(Order), Order, cursor, limit, sort_field="created_at")' in content
+        assert ".offset(" not in content
+        # 分页工具模块随API一起写入项目
+        assert "def keyset_query" in (temp_project / "app" / "core" / "pagination.py").read_text(encoding="utf-8")
+
+        with pytest.raises(ValueError):
+            generate_api("order", output_dir=temp_project, pagination="page")
+
+    def test_pagination_cursor_round_trip(self, temp_project):
+        """测试游标编码后可以还原排序键的值"""
+        import runpy
+        from datetime import datetime, timezone
+        from fastapi import HTTPException
+
+        generate_api("order", output_dir=temp_project, pagination="keyset")
+        pagination = runpy.run_path(str(temp_project / "app" / "core" / "pagination.py"))
+
+        values = [datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc), 42]
+        cursor = pagination["encode_cursor"](values)
+        assert cursor.isascii() and "=" not in cursor
+        assert pagination["decode_cursor"](cursor) == values
+
+        with pytest.raises(HTTPException):
+            pagination["decode_cursor"]("not-a-cursor")
+
+    def test_generate_api_bulk(self, temp_project):
+        """测试生成批量接口"""
+        endpoint_file = generate_api("order", output_dir=temp_project, bulk=True, bulk_max_size=50)
+
+        content = endpoint_file.read_text(encoding="utf-8")
+        assert "BULK_MAX_SIZE = 50" in content
+        assert '@router.post("/bulk"' in content
+        assert '@router.patch("/bulk"' in content
+        assert '@router.delete("/bulk"' in content
+        # 批量接口注册在按ID匹配的路由之前
+        assert content.index('@router.delete("/bulk"') < content.index('@router.get("/{order_id}"')
+        assert "session.execute(update(Order), [row for _, _, row in changed])" in content
+        # 违反数据库约束时回滚并逐条重试，冲突的数据按位置报告
+        assert content.count("except IntegrityError:") == 3
+        assert "results, conflicts = execute_each(session, statement, retry)" in content
+        # 写入接口（包括写入前检查ID的查询）都使用主库
+        assert content.count('session.info["use_primary"] = True') == 6
+        assert (temp_project / "app" / "core" / "bulk.py").exists()
+        compile(content, str(endpoint_file), "exec")
+
+        # 默认不生成批量接口
+        content = generate_api("order", output_dir=temp_project).read_text(encoding="utf-8")
+        assert "/bulk" not in content
+
+    def test_bulk_execute_each(self, temp_project):
+        """测试逐条执行时只有违反数据库约束的数据被回滚并报告错误"""
+        import runpy
+        from typing import Optional
+
+        from sqlalchemy import insert
+        from sqlmodel import Field, Session, SQLModel, create_engine, select
+
+        generate_api("order", output_dir=temp_project, bulk=True)
+        module = runpy.run_path(str(temp_project / "app" / "core" / "bulk.py"))
+
+        class BulkCustomer(SQLModel, table=True):
+            id: Optional[int] = Field(default=None, primary_key=True)
+            email: str = Field(unique=True)
+
+        engine = create_engine("sqlite://")
+        BulkCustomer.__table__.create(engine)
+        with Session(engine) as session:
+            statement = insert(BulkCustomer).returning(BulkCustomer.id)
+            entries = [(0, None, {"email": "a@x"}), (2, None, {"email": "a@x"}), (3, None, {"email": "b@x"})]
+            results, errors = module["execute_each"](session, statement, entries)
+            session.commit()
+
+            assert [result.scalar_one() for result in results] == [1, 2]
+            assert [(error.index, error.id) for error in errors] == [(2, None)]
+            assert "UNIQUE" in errors[0].detail
+            assert session.exec(select(BulkCustomer.email).order_by(BulkCustomer.id)).all() == ["a@x", "b@x"]
+
+    def test_generate_api_single_statement_writes(self, temp_project):
+        """测试更新和删除默认使用单条语句，并可以切换为先查询再修改"""
+        content = generate_api("order", output_dir=temp_project).read_text(encoding="utf-8")
+        assert ".values(**values).returning(Order)" in content
+        assert "delete(Order).where(Order.id == order_id)" in content
+        assert "if not result.rowcount:" in content
+        assert "setattr(order, key, value)" not in content
+        # 单条创建和更新违反数据库约束时回滚并返回409
+        assert content.count("except IntegrityError as e:") == 2
+        assert content.count("status_code=status.HTTP_409_CONFLICT") == 2
+
+        content = generate_api("order", output_dir=temp_project, returning=False).read_text(encoding="utf-8")
+        assert "returning(" not in content
+        assert "setattr(order, key, value)" in content
+        assert "session.delete(order)" in content
+        assert content.count("status_code=status.HTTP_409_CONFLICT") == 2
+
+    def test_generate_api_cache(self, temp_project):
+        """测试生成带响应缓存的接口，写入后使缓存失效并注册缓存统计路由"""
+        endpoint_file = generate_api("order", output_dir=temp_project, cache=True, cache_ttl=30)
+
+        content = endpoint_file.read_text(encoding="utf-8")
+        assert "CACHE_TTL = 30" in content
+        assert 'cache_key = f"{CACHE_PREFIX}item:{order_id}"' in content
+        # 缓存序列化后的响应，命中时原样返回
+        assert "return json_response(cache.set(cache_key, dump_json(OrderRead, order), ttl=CACHE_TTL))" in content
+        assert "return json_response(cached)" in content
+        assert (temp_project / "app" / "core" / "responses.py").exists()
+        # 创建后使列表缓存失效，更新和删除后同时使对应数据的缓存失效
+        assert "_invalidate_order_cache()" in content
+        assert content.count("_invalidate_order_cache(order_id)") == 2
+        compile(content, str(endpoint_file), "exec")
+
+        api_content = (temp_project / "app" / "api" / "api_v1" / "api.py").read_text(encoding="utf-8")
+        assert "from app.core.cache import router as cache_router" in api_content
+        assert 'api_router.include_router(cache_router, prefix="/cache"' in api_content
+
+        # 异步接口通过异步方法访问缓存，不阻塞事件循环
+        content = generate_api("order", output_dir=temp_project, cache=True, async_mode=True).read_text(encoding="utf-8")
+        assert "cached = await cache.get_async(cache_key)" in content
+        assert "return json_response(await cache.set_async(cache_key, dump_json(OrderRead, order), ttl=CACHE_TTL))" in content
+        assert content.count("await _invalidate_order_cache(order_id)") == 2
+        compile(content, str(endpoint_file), "exec")
+
+        # 默认不缓存
+        content = generate_api("product", output_dir=temp_project).read_text(encoding="utf-8")
+        assert "cache" not in content
+
+    def test_cache_backends(self, temp_project):
+        """测试进程内缓存的TTL和LRU淘汰，以及使用模拟客户端的外部缓存"""
+        import runpy
+
+        generate_api("order", output_dir=temp_project, cache=True)
+        module = runpy.run_path(str(temp_project / "app" / "core" / "cache.py"))
+
+        cache = module["ResponseCache"](module["MemoryBackend"](max_size=2))
+        cache.set("orders:item:1", {"id": 1})
+        cache.set("orders:item:2", {"id": 2})
+        assert cache.get("orders:item:1") == {"id": 1}
+        # 超出容量时淘汰最久未使用的键
+        cache.set("orders:list:None:100", {"items": []})
+        assert cache.get("orders:item:2") is None
+        assert cache.backend.evictions == 1
+        cache.invalidate("orders:item:1", prefixes=["orders:list:"])
+        assert cache.get("orders:item:1") is None
+        assert cache.get("orders:list:None:100") is None
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["invalidations"]) == (1, 3, 2)
+        assert stats["hit_ratio"] == 0.25
+
+        # 过期的键视为未命中
+        cache.set("orders:item:3", {"id": 3}, ttl=0)
+        assert cache.get("orders:item:3") is None
+
+        external = module["ResponseCache"](module["ExternalBackend"](module["InMemoryClient"]()))
+        external.set("orders:item:1", b'{"id":1,"name":"a"}')
+        external.set("orders:list:None:100", b'{"items":[{"id":1}]}')
+        assert external.get("orders:item:1") == b'{"id":1,"name":"a"}'
+        external.invalidate(prefixes=["orders:"])
+        assert external.get("orders:list:None:100") is None
+        assert external.invalidations == 2
+
+    def test_cache_concurrency(self, temp_project):
+        """测试多线程读取时命中统计不丢失，异步方法在线程池中调用外部缓存"""
+        import asyncio
+        import runpy
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        generate_api("order", output_dir=temp_project, cache=True)
+        module = runpy.run_path(str(temp_project / "app" / "core" / "cache.py"))
+
+        cache = module["ResponseCache"]()
+        cache.set("orders:item:1", b"{}")
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda i: cache.get("orders:item:1" if i % 2 else "orders:item:2"), range(4000)))
+        assert (cache.stats()["hits"], cache.stats()["misses"]) == (2000, 2000)
+
+        class RecordingClient(module["InMemoryClient"]):
+            """记录调用外部缓存的线程"""
+
+            def __init__(self):
+                super().__init__()
+                self.threads = set()
+
+            def get(self, name):
+                self.threads.add(threading.get_ident())
+                return super().get(name)
+
+        async def run(cache):
+            await cache.set_async("orders:item:1", b"{}")
+            value = await cache.get_async("orders:item:1")
+            await cache.invalidate_async("orders:item:1")
+            return value, threading.get_ident()
+
+        client = RecordingClient()
+        external = module["ResponseCache"](module["ExternalBackend"](client))
+        value, loop_thread = asyncio.run(run(external))
+        assert value == b"{}" and loop_thread not in client.threads
+        assert (external.hits, external.sets, external.invalidations) == (1, 1, 1)
+        # 进程内缓存不涉及I/O，直接在事件循环中调用
+        assert asyncio.run(run(module["ResponseCache"]()))[0] == b"{}"
+
+    def test_generate_api_export(self, temp_project):
+        """测试生成流式导出接口，注册在按ID查询的路由之前并使用独立的会话分批查询"""
+        endpoint_file = generate_api("order", output_dir=temp_project, export=True, pagination="offset")
+
+        content = endpoint_file.read_text(encoding="utf-8")
+        assert '@router.get("/export")' in content
+        assert content.index('@router.get("/export")') < content.index('@router.get("/{order_id}"')
+        assert "execution_options(yield_per=EXPORT_BATCH_SIZE)" in content
+        assert "with SessionLocal() as session:" in content
+        assert "yield from export_stream(OrderRead, result.mappings().partitions(), export_format)" in content
+        assert (temp_project / "app" / "core" / "export.py").exists()
+        compile(content, str(endpoint_file), "exec")
+
+        content = generate_api("order", output_dir=temp_project, export=True, async_mode=True).read_text(encoding="utf-8")
+        assert "result = await session.stream(statement)" in content
+        assert "async for chunk in export_stream_async(" in content
+        compile(content, str(endpoint_file), "exec")
+
+        # 默认不生成导出接口
+        assert "export" not in generate_api("product", output_dir=temp_project).read_text(encoding="utf-8")
+
+    def test_export_helpers(self, temp_project):
+        """测试按批序列化为NDJSON和CSV"""
+        import runpy
+        from typing import Optional
+
+        from pydantic import BaseModel
+
+        generate_api("order", output_dir=temp_project, export=True)
+        module = runpy.run_path(str(temp_project / "app" / "core" / "export.py"))
+
+        class OrderRead(BaseModel):
+            id: int
+            note: Optional[str] = None
+
+        partitions = [[{"id": 1, "note": 'a,"b"'}, {"id": 2, "note": None}], [{"id": 3, "note": "c"}]]
+        chunks = list(module["export_stream"](OrderRead, partitions, "ndjson"))
+        assert chunks == [b'{"id":1,"note":"a,\\"b\\""}\n{"id":2,"note":null}\n', b'{"id":3,"note":"c"}\n']
+
+        chunks = list(module["export_stream"](OrderRead, partitions, "csv"))
+        assert b"".join(chunks).decode("utf-8").splitlines() == ["id,note", '1,"a,""b"""', "2,", "3,c"]
+        # 没有数据时CSV仍然包含表头
+        assert list(module["export_stream"](OrderRead, [], "csv")) == [b"id,note\r\n"]
+
+    def test_generate_api_sparse_fields(self, temp_project):
+        """测试生成支持 ?fields= 的GET接口，指定字段时只查询需要的列"""
+        endpoint_file = generate_api(
+            "order", output_dir=temp_project, sparse_fields=True, cache=True, pagination="keyset", cursor_field="created_at"
+        )
+
+        content = endpoint_file.read_text(encoding="utf-8")
+        assert content.count('fields: Optional[str] = Query(None') == 2
+        assert content.count("selected = parse_fields(fields, OrderRead)") == 2
+        # 键集分页需要查询排序键
+        assert 'columns = field_columns(Order, selected, "created_at")' in content
+        assert "select(*field_columns(Order, selected)).where(Order.id == order_id)" in content
+        # 列表缓存按字段集区分
+        assert 'cache_key = f"{CACHE_PREFIX}list:{cursor}:{limit}:{fields_key(selected)}"' in content
+        assert (temp_project / "app" / "core" / "fieldsets.py").exists()
+        compile(content, str(endpoint_file), "exec")
+
+        content = generate_api("order", output_dir=temp_project, sparse_fields=True, pagination="offset", async_mode=True).read_text(encoding="utf-8")
+        assert "return json_response(dump_json(List[partial_model(OrderRead, selected)], result.all()))" in content
+        compile(content, str(endpoint_file), "exec")
+
+        assert "fields" not in generate_api("product", output_dir=temp_project).read_text(encoding="utf-8")
+
+    def test_fieldset_helpers(self, temp_project):
+        """测试字段校验和只包含部分字段的响应模型"""
+        import runpy
+        from typing import Optional
+
+        from fastapi import HTTPException
+        from pydantic import BaseModel
+
+        generate_api("order", output_dir=temp_project, sparse_fields=True)
+        module = runpy.run_path(str(temp_project / "app" / "core" / "fieldsets.py"))
+
+        class OrderRead(BaseModel):
+            name: str
+            note: Optional[str] = None
+            id: int
+
+        parse_fields = module["parse_fields"]
+        assert parse_fields(None, OrderRead) is None
+        # 按模型中的顺序排列并总是包含id
+        assert parse_fields(" note,name ,note", OrderRead) == ("name", "note", "id")
+        for fields in ("name,secret", "", ","):
+            with pytest.raises(HTTPException) as error:
+                parse_fields(fields, OrderRead)
+            assert error.value.status_code == 400
+        assert module["fields_key"](("note", "id")) == "note,id"
+        assert module["fields_key"](None) == "*"
+
+        partial = module["partial_model"](OrderRead, ("note", "id"))
+        assert list(partial.model_fields) == ["note", "id"]
+        assert partial(id=1).model_dump() == {"note": None, "id": 1}
+        assert module["partial_model"](OrderRead, ("note", "id")) is partial
+
+    def test_generate_api_relationships(self, temp_project):
+        """测试根据模型文件中的关联预加载关联数据，列表和详情接口返回包含关联数据的响应模型"""
+        from fastapi_generator.generators.model_generator import generate_model
+
+        generate_model("order", output_dir=temp_project, belongs_to=["customer"], has_many=["items"])
+        endpoint_file = generate_api("order", output_dir=temp_project, etag="hash", pagination="keyset")
+
+        content = endpoint_file.read_text(encoding="utf-8")
+        assert "from sqlalchemy.orm import joinedload, selectinload" in content
+        assert "LOAD_OPTIONS = (joinedload(Order.customer), selectinload(Order.items))" in content
+        assert '@router.get("/", response_model=Page[OrderReadWithRelations])' in content
+        assert "keyset_query(select(Order).options(*LOAD_OPTIONS), Order, cursor, limit)" in content
+        assert "session.get(Order, order_id, options=LOAD_OPTIONS)" in content
+        assert "dump_json(OrderReadWithRelations, order)" in content
+        # 写入接口仍然返回不含关联数据的响应模型
+        assert '@router.post("/", response_model=OrderRead' in content
+        compile(content, str(endpoint_file), "exec")
+
+        content = generate_api("order", output_dir=temp_project, relationships=[]).read_text(encoding="utf-8")
+        assert "LOAD_OPTIONS" not in content and "ReadWithRelations" not in content
+
+        # 缓存和 updated_at ETag 只随本资源的写入变化，不能与关联一起使用
+        with pytest.raises(ValueError, match="--cache"):
+            generate_api("order", output_dir=temp_project, cache=True)
+        with pytest.raises(ValueError, match="--etag updated_at"):
+            generate_api("order", output_dir=temp_project, etag="updated_at")
+        assert "LOAD_OPTIONS" not in endpoint_file.read_text(encoding="utf-8")
+
+    def test_generate_api_filters(self, temp_project):
+        """测试列表接口只为有索引的字段生成筛选参数，排序字段在游标分页时不包含可空字段"""
+        from fastapi_generator.generators.model_generator import generate_model
+
+        generate_model(
+            "order",
+            output_dir=temp_project,
+            fields=["status:enum(pending,paid):index", "total:float", "note:str:optional:unique", "customer_id:int"],
+            indexes=["customer_id,total", "created_at"]
+        )
+        endpoint_file = generate_api(
+            "order", output_dir=temp_project, filters=True, cache=True, pagination="keyset", cursor_field="created_at"
+        )
+
+        content = endpoint_file.read_text(encoding="utf-8")
+        # 复合索引只有第一个字段可以高效筛选
+        assert 'FILTER_FIELDS = ("id", "status", "note", "customer_id", "created_at")' in content
+        assert 'SORT_FIELDS = ("id", "status", "customer_id", "created_at")' in content
+        assert "    status_in: Optional[List[OrderStatus]] = Query(None)," in content
+        assert "    created_at_min: Optional[datetime] = None," in content
+        assert "customer_id_max" in content and "status_min" not in content and "total" not in content
+        assert 'sort_field = parse_sort(sort, SORT_FIELDS, "created_at")' in content
+        assert "keyset_query(select(Order).where(*conditions), Order, cursor, limit, sort_field=sort_field)" in content
+        # 列表缓存按全部查询参数区分
+        assert 'cache_key = f"{CACHE_PREFIX}list:{filters_key(request.query_params.multi_items())}"' in content
+        assert (temp_project / "app" / "core" / "filters.py").exists()
+        compile(content, str(endpoint_file), "exec")
+
+        content = generate_api(
+            "order", output_dir=temp_project, filters=True, unindexed_filters=True, pagination="offset", async_mode=True
+        ).read_text(encoding="utf-8")
+        assert '"total"' in content and '"note"' in content
+        assert "select(Order).where(*conditions).order_by(*sort_columns(Order, sort_field)).offset(skip).limit(limit)" in content
+        compile(content, str(endpoint_file), "exec")
+
+        assert "sort" not in generate_api("order", output_dir=temp_project).read_text(encoding="utf-8")
+
+    def test_filter_helpers(self, temp_project):
+        """测试筛选条件、筛选字段校验、排序参数和降序游标分页"""
+        import runpy
+        from typing import Optional
+
+        from fastapi import HTTPException
+        from sqlmodel import Field, SQLModel, select
+
+        generate_api("order", output_dir=temp_project, filters=True, pagination="keyset")
+        module = runpy.run_path(str(temp_project / "app" / "core" / "filters.py"))
+        pagination = runpy.run_path(str(temp_project / "app" / "core" / "pagination.py"))
+
+        class FilterOrder(SQLModel, table=True):
+            id: Optional[int] = Field(default=None, primary_key=True)
+            status: str = Field(index=True)
+            total: float
+
+        conditions = module["filter_conditions"](FilterOrder, {"status_in": ["new"], "total_min": 1, "total_max": None, "id": 3})
+        assert [str(condition) for condition in conditions] == [
+            "filterorder.status IN (__[POSTCOMPILE_status_1])",
+            "filterorder.total >= :total_1",
+            "filterorder.id = :id_1",
+        ]
+        module["check_filters"](["status", "id_in", "limit", "sort"], FilterOrder, ("id", "status"))
+        with pytest.raises(HTTPException) as error:
+            module["check_filters"](["total_min", "status"], FilterOrder, ("id", "status"))
+        assert error.value.status_code == 400 and "total" in error.value.detail
+
+        parse_sort = module["parse_sort"]
+        assert parse_sort(None, ("id", "status"), "id") == "id"
+        assert parse_sort("-status", ("id", "status"), "id") == "-status"
+        for sort in ("total", "--id", "-"):
+            with pytest.raises(HTTPException):
+                parse_sort(sort, ("id", "status"), "id")
+        assert [str(column) for column in module["sort_columns"](FilterOrder, "-status")] == [
+            "filterorder.status DESC", "filterorder.id DESC"
+        ]
+        assert module["filters_key"]([("status", "b"), ("limit", "5"), ("status", "a")]) == "limit=5&status=a&status=b"
+
+        # 游标包含排序字段，排序方式改变后旧游标无效
+        rows = [FilterOrder(id=7, status="b", total=1), FilterOrder(id=5, status="a", total=1)]
+        page = pagination["keyset_page"](rows, 1, sort_field="-status")
+        assert pagination["decode_cursor"](page.next_cursor) == ["-status", "b", 7]
+        statement = pagination["keyset_query"](select(FilterOrder), FilterOrder, page.next_cursor, 1, sort_field="-status")
+        assert "WHERE filterorder.status < :status_1 OR filterorder.status = :status_2 AND filterorder.id < :id_1" in str(statement)
+        assert "ORDER BY filterorder.status DESC, filterorder.id DESC" in str(statement)
+        for sort_field in ("status", "id", "-id"):
+            with pytest.raises(HTTPException):
+                pagination["keyset_query"](select(FilterOrder), FilterOrder, page.next_cursor, 1, sort_field=sort_field)
+
+    def test_generate_api_etag(self, temp_project):
+        """测试生成ETag和条件请求，updated_at方式先只查询更新时间"""
+        endpoint_file = generate_api("order", output_dir=temp_project, etag="updated_at", pagination="keyset")
+
+        content = endpoint_file.read_text(encoding="utf-8")
+        assert "if_none_match: Optional[str] = Header(None)" in content
+        assert "session.execute(select(Order.updated_at).where(Order.id == order_id))" in content
+        assert "keyset_query(select(Order.id, Order.updated_at), Order, cursor, limit)" in content
+        # ETag检查在加载完整数据之前
+        assert content.index("return not_modified(etag)") < content.index("session.get(Order, order_id)")
+        assert (temp_project / "app" / "core" / "etag.py").exists()
+        compile(content, str(endpoint_file), "exec")
+
+        content = generate_api("order", output_dir=temp_project, etag="hash", pagination="offset").read_text(encoding="utf-8")
+        assert "return conditional_response(if_none_match, dump_json(OrderRead, order))" in content
+        assert "return conditional_response(if_none_match, dump_json(List[OrderRead], orders))" in content
+        assert "response: Response" not in content
+        compile(content, str(endpoint_file), "exec")
+
+        with pytest.raises(ValueError):
+            generate_api("order", output_dir=temp_project, etag="weak")
+
+    def test_etag_helpers(self, temp_project):
+        """测试ETag计算和 If-None-Match 匹配"""
+        import runpy
+
+        generate_api("order", output_dir=temp_project, etag="hash")
+        module = runpy.run_path(str(temp_project / "app" / "core" / "etag.py"))
+
+        etag = module["make_etag"]({"id": 1, "name": "a"})
+        assert etag.startswith('"') and etag.endswith('"')
+        assert module["make_etag"]({"name": "a", "id": 1}) == etag
+        assert module["make_etag"]({"id": 1, "name": "b"}) != etag
+
+        matches = module["etag_matches"]
+        assert matches(etag, etag)
+        assert matches(f'"other", W/{etag}', etag)
+        assert matches("*", etag)
+        assert not matches(None, etag)
+        assert not matches('"other"', etag)
+
+        content = b'{"id":1,"name":"a"}'
+        response = module["conditional_response"](None, content)
+        assert response.body == content
+        assert response.headers["ETag"] == module["content_etag"](content)
+        assert module["conditional_response"](response.headers["ETag"], content).status_code == 304
+
+    def test_json_helpers(self, temp_project):
+        """测试按响应模型一次校验并序列化为JSON，以及返回已经序列化的JSON"""
+        import runpy
+        from types import SimpleNamespace
+        from typing import List
+
+        from fastapi import Response
+        from pydantic import BaseModel
+
+        generate_api("order", output_dir=temp_project, cache=True)
+        module = runpy.run_path(str(temp_project / "app" / "core" / "responses.py"))
+
+        class OrderRead(BaseModel):
+            id: int
+            name: str
+
+        # 与ORM对象一样按属性读取
+        rows = [SimpleNamespace(id=1, name="a", secret="x"), SimpleNamespace(id=2, name="b", secret="y")]
+        assert module["dump_json"](List[OrderRead], rows) == b'[{"id":1,"name":"a"},{"id":2,"name":"b"}]'
+        assert module["dump_json"](OrderRead, {"id": 1, "name": "a"}) == b'{"id":1,"name":"a"}'
+
+        injected = Response()
+        injected.headers["ETag"] = '"abc"'
+        response = module["json_response"](b"[]", injected)
+        assert response.body == b"[]"
+        assert response.media_type == "application/json"
+        assert response.headers["ETag"] == '"abc"'
@@ -0,0 +1,185 @@
+"""
+批量生成器测试
+"""
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+import pytest
+
+from fastapi_generator.generators.batch_generator import generate_batch, normalize_spec
+
+
+class TestBatchGenerator:
+    """测试批量生成器功能"""
+
+    @pytest.fixture
+    def temp_project(self):
+        """创建临时项目目录用于测试"""
+        temp_dir = Path(tempfile.mkdtemp())
+
+        # 创建标准项目结构
+        project_path = temp_dir / "test_project"
+        os.makedirs(project_path / "app" / "api" / "api_v1" / "endpoints", exist_ok=True)
+
+        # 创建API路由文件
+        with open(project_path / "app" / "api" / "api_v1" / "api.py", "w", encoding="utf-8") as f:
+            f.write("""from fastapi import APIRouter
+
+api_router = APIRouter()
+""")
+
+        yield project_path
+        # 测试后清理
+        shutil.rmtree(temp_dir)
+
+    def _write_spec(self, project_path, spec, name="spec.json"):
+        """写入JSON规格文件"""
+        spec_path = project_path / name
+        with open(spec_path, "w", encoding="utf-8") as f:
+            json.dump(spec, f)
+        return spec_path
+
+    def test_generate_batch_from_json(self, temp_project):
+        """测试从JSON规格文件批量生成资源"""
+        spec_path = self._write_spec(temp_project, {
+            "resources": [
+                {"name": "order"},
+                {"name": "product", "components": ["model", "api"]},
+                "customer",
+            ]
+        })
+
+        generate_batch(spec_path, output_dir=temp_project)
+
+        app_dir = temp_project / "app"
+        for name in ["order", "product", "customer"]:
+            assert (app_dir / "models" / f"{name}.py").exists()
+            assert (app_dir / "schemas" / f"{name}.py").exists()
+            assert (app_dir / "api" / "api_v1" / "endpoints" / f"{name}.py").exists()
+        assert (app_dir / "services" / "order_service.py").exists()
+        assert not (app_dir / "services" / "product_service.py").exists()
+
+        with open(app_dir / "api" / "api_v1" / "api.py", "r", encoding="utf-8") as f:
+            content = f.read()
+        for name, plural in [("order", "orders"), ("product", "products"), ("customer", "customers")]:
+            assert f"from .endpoints.{name} import router as {name}_router" in content
+            assert f'prefix="/{plural}"' in content
+
+        with open(app_dir / "models" / "__init__.py", "r", encoding="utf-8") as f:
+            content = f.read()
+        assert "from .order import Order" in content
+        assert "from .customer import Customer" in content
+
+        with open(app_dir / "services" / "__init__.py", "r", encoding="utf-8") as f:
+            content = f.read()
+        assert "from .order_service import OrderService" in content
+        assert "ProductService" not in content
+
+    def test_generate_batch_is_idempotent(self, temp_project):
+        """测试重复执行批量生成不会重复注册路由"""
+        spec_path = self._write_spec(temp_project, {"resources": ["order", "product"]})
+
+        generate_batch(spec_path, output_dir=temp_project)
+        generate_batch(spec_path, output_dir=temp_project)
+
+        with open(temp_project / "app" / "api" / "api_v1" / "api.py", "r", encoding="utf-8") as f:
+            content = f.read()
+        assert content.count("import router as order_router") == 1
+        assert content.count("include_router(product_router") == 1
+
+    def test_generate_batch_from_yaml(self, temp_project):
+        """测试从YAML规格文件批量生成资源"""
+        pytest.importorskip("yaml")
+        spec_path = temp_project / "spec.yaml"
+        with open(spec_path, "w", encoding="utf-8") as f:
+            f.write("components: [model]\nresources:\n  - name: order\n  - invoice\n")
+
+        generate_batch(spec_path, output_dir=temp_project)
+
+        assert (temp_project / "app" / "models" / "order.py").exists()
+        assert (temp_project / "app" / "models" / "invoice.py").exists()
+        assert not (temp_project / "app" / "api" / "api_v1" / "endpoints" / "order.py").exists()
+
+    def test_invalid_spec(self):
+        """测试无效的规格内容"""
+        with pytest.raises(ValueError):
+            normalize_spec({})
+        with pytest.raises(ValueError):
+            normalize_spec({"resources": [{"name": "order", "components": ["view"]}]})
+        with pytest.raises(ValueError):
+            normalize_spec({"resources": ["order", "Order"]})
+
+    def test_spec_options(self, temp_project):
+        """测试规格文件中的生成选项"""
+        spec_path = temp_project / "spec.json"
+        with open(spec_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "options": {"async_mode": True},
+                "resources": ["order", {"name": "invoice", "options": {"async_mode": False}}]
+            }, f)
+
+        generate_batch(spec_path, temp_project)
+
+        order_api = temp_project / "app" / "api" / "api_v1" / "endpoints" / "order.py"
+        invoice_api = temp_project / "app" / "api" / "api_v1" / "endpoints" / "invoice.py"
+        assert "async def get_all_orders" in order_api.read_text(encoding="utf-8")
+        assert "async def" not in invoice_api.read_text(encoding="utf-8")
+
+        with pytest.raises(ValueError):
+            normalize_spec({"resources": [{"name": "order", "options": {"colour": "red"}}]})
+        with pytest.raises(ValueError):
+            normalize_spec({"options": {"pagination": "page"}, "resources": ["order"]})
+
+    def test_spec_fields(self, temp_project):
+        """测试规格文件中的字段、索引和唯一约束定义，以及按索引生成的筛选参数"""
+        spec_path = self._write_spec(temp_project, {
+            "resources": [{
+                "name": "product",
+                "components": ["model", "api"],
+                "fields": ["sku:str(64)", {"name": "price", "type": "decimal(10,2)"}],
+                "unique": ["sku"],
+                "indexes": ["price,created_at"],
+                "options": {"filters": True}
+            }]
+        })
+
+        generate_batch(spec_path, temp_project)
+
+        content = (temp_project / "app" / "models" / "product.py").read_text(encoding="utf-8")
+        assert 'sku: str = Field(unique=True, max_length=64, description="sku")' in content
+        assert "price: Decimal = Field(max_digits=10, decimal_places=2" in content
+        assert 'Index("ix_products_price_created_at", "price", "created_at")' in content
+        # API的筛选字段由刚生成的模型中的索引决定
+        content = (temp_project / "app" / "api" / "api_v1" / "endpoints" / "product.py").read_text(encoding="utf-8")
+        assert 'FILTER_FIELDS = ("id", "sku", "price")' in content
+
+        with pytest.raises(ValueError):
+            normalize_spec({"resources": [{"name": "order", "fields": ["total:money"]}]})
+        with pytest.raises(ValueError):
+            normalize_spec({"resources": [{"name": "order", "fields": ["total:int"], "indexes": ["missing"]}]})
+
+    def test_spec_relationships(self, temp_project):
+        """测试规格文件中的关联定义，API预加载规格中定义的关联"""
+        spec_path = self._write_spec(temp_project, {
+            "resources": [
+                {"name": "order", "components": ["model", "api"], "has_many": ["lines:order_line"]},
+                {"name": "order_line", "components": ["model"], "belongs_to": ["order"]}
+            ]
+        })
+
+        generate_batch(spec_path, temp_project)
+
+        content = (temp_project / "app" / "models" / "order_line.py").read_text(encoding="utf-8")
+        assert 'order_id: Optional[int] = Field(default=None, index=True, foreign_key="orders.id"' in content
+        content = (temp_project / "app" / "models" / "order.py").read_text(encoding="utf-8")
+        assert 'lines: List["OrderLine"] = Relationship(back_populates="order")' in content
+        content = (temp_project / "app" / "api" / "api_v1" / "endpoints" / "order.py").read_text(encoding="utf-8")
+        assert "LOAD_OPTIONS = (selectinload(Order.lines),)" in content
+
+        with pytest.raises(ValueError):
+            normalize_spec({"resources": [{"name": "order", "fields": ["customer:int"], "belongs_to": ["customer"]}]})
+        with pytest.raises(ValueError, match="--cache"):
+            normalize_spec({"options": {"cache": True}, "resources": [{"name": "order", "belongs_to": ["customer"]}]})
+        normalize_spec({"options": {"etag": "hash"}, "resources": [{"name": "order", "belongs_to": ["customer"]}]})
@@ -7,7 +7,7 @@ import tempfile
 from pathlib import Path
 import pytest
 
-from fastapi_generator.generators.model_generator import generate_model
+from fastapi_generator.generators.model_generator import generate_model, render_model
 
 
 class TestModelGenerator:
@@ -85,4 +85,154 @@ class TestModelGenerator:
         assert model_file.exists()
         with open(model_file, "r", encoding="utf-8") as f:
             content = f.read()
-            assert "class Existing" in content  # 验证文件已被覆盖 
\ No newline at end of file
+            assert "class Existing" in content  # 验证文件已被覆盖     
+    def test_init_files_sorted_imports(self, temp_project):
+        """测试__init__.py中的导入按模块名排序，模式包导入请求和响应模式"""
+        # 执行
+        for model_name in ["user", "order", "user", "article"]:
+            generate_model(model_name, output_dir=temp_project / "app")
+        
+        # 验证模型导入有序且不重复
+        with open(temp_project / "app" / "models" / "__init__.py", "r", encoding="utf-8") as f:
+            content = f.read()
+        assert content == (
+            "# Models package\n"
+            "from .article import Article\n"
+            "from .order import Order\n"
+            "from .user import User\n"
+        )
+        
+        # 验证模式包导入的是模式文件中实际定义的类
+        with open(temp_project / "app" / "schemas" / "__init__.py", "r", encoding="utf-8") as f:
+            content = f.read()
+        assert "from .user import UserCreate, UserRead, UserUpdate" in content
+        assert "from .user import User\n" not in content
+
+    def test_timestamps_use_server_defaults(self, temp_project):
+        """测试时间戳字段使用数据库默认值"""
+        model_file = generate_model("event", output_dir=temp_project)
+
+        content = model_file.read_text(encoding="utf-8")
+        assert "default_factory" not in content
+        assert '"server_default": server_now()' in content
+        assert '"onupdate": server_now()' in content
+        assert "from app.core.timestamps import server_now" in content
+        assert (temp_project / "app" / "core" / "timestamps.py").exists()
+
+    def test_server_now_precision(self, temp_project):
+        """测试SQLite中数据库生成的时间戳精确到毫秒，格式与SQLAlchemy写入的值相同"""
+        import runpy
+        from datetime import datetime
+
+        from sqlalchemy import Column, Integer, MetaData, Table, create_engine, insert, select, update
+        from sqlalchemy.schema import CreateTable
+        from sqlalchemy.dialects import postgresql
+
+        generate_model("event", output_dir=temp_project)
+        server_now = runpy.run_path(str(temp_project / "app" / "core" / "timestamps.py"))["server_now"]
+
+        table = Table(
+            "timestamp_events", MetaData(),
+            Column("id", Integer, primary_key=True),
+            Column("updated_at", server_now.type, server_default=server_now(), onupdate=server_now()),
+        )
+        assert "DEFAULT now()" in str(CreateTable(table).compile(dialect=postgresql.dialect()))
+
+        engine = create_engine("sqlite://")
+        table.create(engine)
+        with engine.begin() as connection:
+            connection.execute(insert(table).values(id=1))
+            first = connection.execute(select(table.c.updated_at)).scalar_one()
+            connection.execute(update(table).values(id=1))
+            second = connection.execute(select(table.c.updated_at)).scalar_one()
+            stored = connection.exec_driver_sql("SELECT updated_at FROM timestamp_events").scalar_one()
+            # 与Python中的值按相同格式比较
+            assert connection.execute(select(table.c.id).where(table.c.updated_at >= second)).all() == [(1,)]
+        assert isinstance(first, datetime) and first.microsecond % 1000 == 0
+        assert second > first
+        assert len(stored) == len("2024-01-01 00:00:00.000000")
+
+    def test_typed_fields_and_indexes(self, temp_project):
+        """测试按字段定义生成列类型、单字段和复合索引、唯一约束及对应的模式"""
+        model_file = generate_model(
+            "order",
+            output_dir=temp_project,
+            fields=["customer_id:int:index", "status:enum(pending,paid)", "title:str(200):unique", "note:text:optional"],
+            indexes=["customer_id,created_at"],
+            unique=["customer_id,title"]
+        )
+
+        content = model_file.read_text(encoding="utf-8")
+        assert "class OrderStatus(str, Enum):" in content
+        assert 'PENDING = "pending"' in content
+        assert 'customer_id: int = Field(index=True, description="customer_id")' in content
+        assert "status: OrderStatus = Field(" in content
+        assert "title: str = Field(unique=True, max_length=200" in content
+        assert "note: Optional[str] = Field(default=None, sa_type=Text" in content
+        assert 'Index("ix_orders_customer_id_created_at", "customer_id", "created_at")' in content
+        assert 'UniqueConstraint("customer_id", "title", name="uq_orders_customer_id_title")' in content
+        assert "name: str" not in content
+
+        schema = (temp_project / "app" / "schemas" / "order.py").read_text(encoding="utf-8")
+        assert "from app.models.order import OrderBase, OrderStatus" in schema
+        assert "status: Optional[OrderStatus] = None" in schema
+        assert "note: Optional[str] = None" in schema
+
+    def test_invalid_fields(self):
+        """测试无效的字段和索引定义"""
+        for fields, indexes in [
+            (["total:money"], None),
+            (["total:int:sorted"], None),
+            (["status:enum()"], None),
+            (["id:int"], None),
+            (["total:int", "total:float"], None),
+            (["total:int"], ["total,missing"]),
+        ]:
+            with pytest.raises(ValueError):
+                render_model("order", fields, indexes)
+
+    def test_relationships(self, temp_project):
+        """测试 belongs_to 生成外键和关联，has_many 生成反向关联，模式中包含关联数据的响应模型"""
+        model_file = generate_model(
+            "order",
+            output_dir=temp_project,
+            fields=["total:int", "customer_id:int"],
+            belongs_to=["customer", "owner:user"],
+            has_many=["items"],
+            indexes=["owner_id,created_at"]
+        )
+
+        content = model_file.read_text(encoding="utf-8")
+        assert "from app.models.customer import Customer" in content
+        assert "from app.models.user import User" in content
+        assert 'customer_id: int = Field(index=True, foreign_key="customers.id", description="customer_id")' in content
+        assert 'owner_id: Optional[int] = Field(default=None, index=True, foreign_key="users.id"' in content
+        assert 'Index("ix_orders_owner_id_created_at", "owner_id", "created_at")' in content
+        assert 'customer: Optional["Customer"] = Relationship()' in content
+        assert 'owner: Optional["User"] = Relationship()' in content
+        assert 'items: List["Item"] = Relationship(back_populates="order")' in content
+
+        schema = (temp_project / "app" / "schemas" / "order.py").read_text(encoding="utf-8")
+        assert "from app.models.item import ItemBase" in schema
+        assert "class ItemSummary(ItemBase):" in schema
+        assert "class OrderReadWithRelations(OrderRead):" in schema
+        assert "customer: Optional[CustomerSummary] = None" in schema
+        assert "items: List[ItemSummary] = []" in schema
+
+        # 指向自身的关联需要指定 remote_side
+        model_content, _ = render_model("category", belongs_to=["parent:category"])
+        assert 'parent: Optional["Category"] = Relationship(sa_relationship_kwargs={"remote_side": "Category.id"})' in model_content
+        assert "TYPE_CHECKING" not in model_content
+
+    def test_invalid_relationships(self):
+        """测试无效的关联定义"""
+        for fields, belongs_to, has_many in [
+            (["customer_id:str"], ["customer"], None),
+            (["customer:int"], ["customer"], None),
+            (None, ["customer", "customer"], None),
+            (None, ["created_at"], None),
+            (None, None, ["items:"]),
+            (None, None, ["line-items"]),
+        ]:
+            with pytest.raises(ValueError):
+                render_model("order", fields, belongs_to=belongs_to, has_many=has_many)
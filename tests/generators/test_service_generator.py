@@ -119,4 +119,31 @@ class UserUpdate(BaseModel):
         assert service_file.exists()
         with open(service_file, "r", encoding="utf-8") as f:
             content = f.read()
-            assert "class ExistingService" in content  # 验证文件已被覆盖 
\ No newline at end of file
+            assert "class ExistingService" in content  # 验证文件已被覆盖 
+    
+    def test_generate_async_service(self, temp_project):
+        """测试生成异步服务"""
+        service_file = generate_service("order", output_dir=temp_project / "app" / "services", async_mode=True)
+
+        content = service_file.read_text(encoding="utf-8")
+        assert "from sqlalchemy.ext.asyncio import AsyncSession" in content
+        assert "async def get_all(self" in content
+        assert "result = await self.session.execute(statement)" in content
+        assert "await self.session.commit()" in content
+        # 创建和更新违反数据库约束时回滚并返回409
+        assert content.count("await self.session.rollback()") == 2
+        assert content.count("status_code=status.HTTP_409_CONFLICT") == 2
+        compile(content, str(service_file), "exec")
+
+    def test_generate_bulk_service(self, temp_project):
+        """测试生成批量操作方法"""
+        service_file = generate_service("order", output_dir=temp_project / "app" / "services", bulk=True)
+
+        content = service_file.read_text(encoding="utf-8")
+        assert "def bulk_create(self, items" in content
+        assert "def bulk_update(self, items" in content
+        assert "def bulk_delete(self, ids" in content
+        assert "BULK_MAX_SIZE = 1000" in content
+        assert content.count("except IntegrityError:") == 3
+        assert content.count('self.session.info["use_primary"] = True') == 6
+        compile(content, str(service_file), "exec")
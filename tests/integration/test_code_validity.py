@@ -119,6 +119,356 @@ except Exception as e:
         )
         assert result.returncode == 0, f"导入错误: {result.stderr}"
     
+    def test_db_pool_presets(self, runner, temp_dir):
+        """测试数据库连接池按运行环境使用预设值"""
+        project_name = "pool_test_project"
+        create_cmd = [
+            sys.executable, "-m", "fastapi_generator.cli.main",
+            "create", project_name,
+            "--output", str(temp_dir)
+        ]
+        subprocess.run(create_cmd, capture_output=True, text=True, check=True)
+        project_dir = temp_dir / project_name
+
+        script = (
+            "from app.db.session import engine, get_pool_stats\n"
+            "from app.core.config import settings\n"
+            "print(type(engine.pool).__name__, settings.DB_POOL_SIZE, settings.DB_POOL_PRE_PING)\n"
+            "print(get_pool_stats()['pool'])\n"
+        )
+
+        def run(**env):
+            result = subprocess.run(
+                [sys.executable, "-c", script],
+                cwd=project_dir,
+                capture_output=True,
+                text=True,
+                env={**os.environ, **env}
+            )
+            assert result.returncode == 0, f"导入错误: {result.stderr}"
+            return result.stdout.split()
+
+        # 开发环境：SQLite使用StaticPool
+        assert run() == ["StaticPool", "5", "False", "StaticPool"]
+        # 生产环境：使用预设大小的QueuePool，显式配置的参数优先
+        assert run(ENVIRONMENT="production") == ["QueuePool", "20", "True", "QueuePool"]
+        assert run(ENVIRONMENT="production", DB_POOL_SIZE="8") == ["QueuePool", "8", "True", "QueuePool"]
+
+    def test_crud_statements(self, runner, temp_dir):
+        """测试生成的CRUD接口每次写入只执行一条SQL语句"""
+        project_name = "crud_test_project"
+        cli = [sys.executable, "-m", "fastapi_generator.cli.main"]
+        subprocess.run(cli + ["create", project_name, "--output", str(temp_dir)], capture_output=True, text=True, check=True)
+        project_dir = temp_dir / project_name
+        for component in ("model", "api"):
+            subprocess.run(
+                cli + ["generate", component, "order", "--output", str(project_dir)],
+                capture_output=True, text=True, check=True
+            )
+
+        script = """
+import main
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.db.session import engine, init_db
+
+init_db()
+statements = []
+event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2].split()[0]))
+
+with TestClient(main.app) as client:
+    for method, path, body in [
+        ("POST", "/api/v1/orders/", {"name": "a"}),
+        ("PUT", "/api/v1/orders/1", {"name": "b"}),
+        ("DELETE", "/api/v1/orders/1", None),
+        ("DELETE", "/api/v1/orders/1", None),
+    ]:
+        statements.clear()
+        response = client.request(method, path, json=body)
+        print(response.status_code, ",".join(statements))
+"""
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=project_dir,
+            capture_output=True,
+            text=True
+        )
+        assert result.returncode == 0, f"运行错误: {result.stderr}"
+        assert result.stdout.split() == ["201", "INSERT", "200", "UPDATE", "204", "DELETE", "404", "DELETE"]
+
+    def test_read_replica_routing(self, runner, temp_dir):
+        """测试配置只读副本后查询使用副本，写入及同一会话中写入后的查询使用主库"""
+        project_name = "replica_test_project"
+        cli = [sys.executable, "-m", "fastapi_generator.cli.main"]
+        subprocess.run(cli + ["create", project_name, "--output", str(temp_dir)], capture_output=True, text=True, check=True)
+        project_dir = temp_dir / project_name
+        for component in ("model", "api"):
+            subprocess.run(
+                cli + ["generate", component, "order", "--output", str(project_dir)],
+                capture_output=True, text=True, check=True
+            )
+
+        script = """
+import main
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlmodel import SQLModel
+from app.db.session import SessionLocal, init_db, replica_engines
+from app.models.order import Order
+
+init_db()
+SQLModel.metadata.create_all(replica_engines[0])
+with replica_engines[0].begin() as connection:
+    connection.execute(insert(Order).values(name="replica"))
+
+with TestClient(main.app) as client:
+    print(client.post("/api/v1/orders/", json={"name": "primary"}).json()["name"])
+    print(client.get("/api/v1/orders/1").json()["name"])
+
+with SessionLocal() as session:
+    session.execute(insert(Order).values(name="written"))
+    print(session.get(Order, 2).name)
+"""
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=project_dir,
+            capture_output=True,
+            text=True,
+            env={**os.environ, "DATABASE_REPLICA_URLS": '["sqlite:///./replica.db"]'}
+        )
+        assert result.returncode == 0, f"运行错误: {result.stderr}"
+        assert result.stdout.split() == ["primary", "replica", "written"]
+
+    @pytest.mark.parametrize("async_mode", [False, True])
+    def test_writes_use_primary_with_stale_replica(self, runner, temp_dir, async_mode):
+        """测试只读副本落后于主库时，写入接口写入前的查询也使用主库"""
+        project_name = "stale_replica_project"
+        cli = [sys.executable, "-m", "fastapi_generator.cli.main"]
+        subprocess.run(
+            cli + ["create", project_name, "--output", str(temp_dir)] + (["--async"] if async_mode else []),
+            capture_output=True, text=True, check=True
+        )
+        project_dir = temp_dir / project_name
+        subprocess.run(
+            cli + ["generate", "model", "order", "--output", str(project_dir)],
+            capture_output=True, text=True, check=True
+        )
+        # 单条更新和删除先按ID查询再修改，批量更新和删除先查询存在的ID
+        subprocess.run(
+            cli + ["generate", "api", "order", "--output", str(project_dir), "--bulk", "--no-returning"],
+            capture_output=True, text=True, check=True
+        )
+
+        script = """
+import asyncio
+import inspect
+import sqlite3
+import main
+from fastapi.testclient import TestClient
+from sqlmodel import SQLModel, create_engine
+from app.db.session import init_db
+from app.models.order import Order
+
+result = init_db()
+if inspect.isawaitable(result):
+    asyncio.run(result)
+# 只读副本只有表结构，还没有同步主库写入的数据
+SQLModel.metadata.create_all(create_engine("sqlite:///./replica.db"))
+
+with TestClient(main.app) as client:
+    ids = [client.post("/api/v1/orders/", json={"name": f"order{i}"}).json()["id"] for i in range(4)]
+    print(client.put(f"/api/v1/orders/{ids[0]}", json={"name": "updated"}).status_code)
+    print(client.delete(f"/api/v1/orders/{ids[1]}").status_code)
+    print(client.patch("/api/v1/orders/bulk", json=[{"id": ids[2], "name": "bulk"}]).json()["errors"])
+    print(client.request("DELETE", "/api/v1/orders/bulk", json=[ids[3]]).json()["errors"])
+    # 只读接口仍然使用副本
+    print(len(client.get("/api/v1/orders/").json()))
+
+print(sqlite3.connect("stale_replica_project.db").execute("SELECT name FROM orders ORDER BY id").fetchall())
+"""
+        replica_url = "sqlite+aiosqlite:///./replica.db" if async_mode else "sqlite:///./replica.db"
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=project_dir,
+            capture_output=True,
+            text=True,
+            env={**os.environ, "DATABASE_REPLICA_URLS": f'["{replica_url}"]'}
+        )
+        assert result.returncode == 0, f"运行错误: {result.stderr}"
+        assert result.stdout.split("\n")[:6] == ["200", "204", "[]", "[]", "0", "[('updated',), ('bulk',)]"]
+
+    @pytest.mark.parametrize("async_mode", [False, True])
+    def test_relationship_query_count(self, runner, temp_dir, async_mode):
+        """测试有关联的列表接口预加载关联数据，查询次数与数据条数无关"""
+        project_name = "relationship_test_project"
+        cli = [sys.executable, "-m", "fastapi_generator.cli.main"]
+        subprocess.run(
+            cli + ["create", project_name, "--output", str(temp_dir)] + (["--async"] if async_mode else []),
+            capture_output=True, text=True, check=True
+        )
+        project_dir = temp_dir / project_name
+        models = {
+            "customer": [],
+            "order": ["--field", "total:int", "--belongs-to", "customer", "--has-many", "items"],
+            "item": ["--belongs-to", "order"],
+        }
+        for name, arguments in models.items():
+            subprocess.run(
+                cli + ["generate", "model", name, "--output", str(project_dir)] + arguments,
+                capture_output=True, text=True, check=True
+            )
+        for name in models:
+            subprocess.run(
+                cli + ["generate", "api", name, "--output", str(project_dir), "--pagination", "keyset"],
+                capture_output=True, text=True, check=True
+            )
+
+        script = """
+import asyncio
+import inspect
+import main
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.db.session import engine, init_db
+
+result = init_db()
+if inspect.isawaitable(result):
+    asyncio.run(result)
+statements = []
+event.listen(getattr(engine, "sync_engine", engine), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+with TestClient(main.app) as client:
+    for count in (2, 20):
+        while len(client.get("/api/v1/orders/?limit=1000").json()["items"]) < count:
+            customer = client.post("/api/v1/customers/", json={"name": "customer"}).json()
+            order = client.post("/api/v1/orders/", json={"total": 1, "customer_id": customer["id"]}).json()
+            for _ in range(3):
+                client.post("/api/v1/items/", json={"name": "item", "order_id": order["id"]})
+        statements.clear()
+        orders = client.get("/api/v1/orders/?limit=1000").json()["items"]
+        assert all(order["customer"]["name"] == "customer" and len(order["items"]) == 3 for order in orders)
+        print(len(orders), len(statements))
+    statements.clear()
+    order = client.get(f"/api/v1/orders/{orders[0]['id']}").json()
+    print(len(order["items"]), len(statements))
+"""
+        result = subprocess.run([sys.executable, "-c", script], cwd=project_dir, capture_output=True, text=True)
+        assert result.returncode == 0, f"运行错误: {result.stderr}"
+        # 订单、客户JOIN查询一次，订单项 IN 查询一次
+        assert result.stdout.split("\n")[:3] == ["2 2", "20 2", "3 2"]
+
+    @pytest.mark.parametrize("async_mode", [False, True])
+    def test_list_filters(self, runner, temp_dir, async_mode):
+        """测试列表接口的筛选和排序参数，筛选查询使用索引，没有索引的字段返回400"""
+        project_name = "filter_test_project"
+        cli = [sys.executable, "-m", "fastapi_generator.cli.main"]
+        subprocess.run(
+            cli + ["create", project_name, "--output", str(temp_dir)] + (["--async"] if async_mode else []),
+            capture_output=True, text=True, check=True
+        )
+        project_dir = temp_dir / project_name
+        subprocess.run(
+            cli + [
+                "generate", "model", "order", "--output", str(project_dir),
+                "--field", "status:str:index", "--field", "total:int", "--index", "created_at"
+            ],
+            capture_output=True, text=True, check=True
+        )
+        subprocess.run(
+            cli + ["generate", "api", "order", "--output", str(project_dir), "--filters", "--pagination", "keyset"],
+            capture_output=True, text=True, check=True
+        )
+
+        script = """
+import asyncio
+import inspect
+import sqlite3
+import main
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.db.session import engine, init_db
+
+result = init_db()
+if inspect.isawaitable(result):
+    asyncio.run(result)
+statements = []
+event.listen(getattr(engine, "sync_engine", engine), "before_cursor_execute", lambda *args: statements.append(args[2:4]))
+
+with TestClient(main.app) as client:
+    orders = [
+        client.post("/api/v1/orders/", json={"status": ["new", "paid"][i % 2], "total": i}).json()
+        for i in range(10)
+    ]
+    statements.clear()
+    print(len(client.get("/api/v1/orders/?status=paid").json()["items"]))
+    statement, parameters = statements[-1]
+    print(len(client.get("/api/v1/orders/", params={"created_at_min": orders[6]["created_at"]}).json()["items"]))
+    # 按创建时间降序翻页
+    seen, cursor = [], None
+    while True:
+        params = {"sort": "-created_at", "limit": 3, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/v1/orders/", params=params).json()
+        seen += [order["total"] for order in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    print(seen == list(range(9, -1, -1)))
+    print(client.get("/api/v1/orders/?total=1").status_code, client.get("/api/v1/orders/?sort=total").status_code)
+
+# 筛选查询使用字段上的索引
+plan = sqlite3.connect("filter_test_project.db").execute("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+print("ix_orders_status" in str(plan))
+"""
+        result = subprocess.run([sys.executable, "-c", script], cwd=project_dir, capture_output=True, text=True)
+        assert result.returncode == 0, f"运行错误: {result.stderr}"
+        assert result.stdout.split("\n")[:5] == ["5", "4", "True", "400 400", "True"]
+
+    @pytest.mark.parametrize("async_mode", [False, True])
+    def test_unique_conflict(self, runner, temp_dir, async_mode):
+        """测试单条创建和更新违反唯一约束时返回409，之后的请求不受影响"""
+        project_name = "conflict_test_project"
+        cli = [sys.executable, "-m", "fastapi_generator.cli.main"]
+        subprocess.run(
+            cli + ["create", project_name, "--output", str(temp_dir)] + (["--async"] if async_mode else []),
+            capture_output=True, text=True, check=True
+        )
+        project_dir = temp_dir / project_name
+        # customer 使用单条 RETURNING 语句写入，supplier 先查询再修改
+        for name, arguments in (("customer", []), ("supplier", ["--no-returning"])):
+            subprocess.run(
+                cli + ["generate", "model", name, "--output", str(project_dir), "--field", "email:str:unique"],
+                capture_output=True, text=True, check=True
+            )
+            subprocess.run(
+                cli + ["generate", "api", name, "--output", str(project_dir)] + arguments,
+                capture_output=True, text=True, check=True
+            )
+
+        script = """
+import asyncio
+import inspect
+import main
+from fastapi.testclient import TestClient
+from app.db.session import init_db
+
+result = init_db()
+if inspect.isawaitable(result):
+    asyncio.run(result)
+
+with TestClient(main.app) as client:
+    for resource in ("customers", "suppliers"):
+        url = f"/api/v1/{resource}/"
+        first = client.post(url, json={"email": "a@example.com"})
+        duplicate = client.post(url, json={"email": "a@example.com"})
+        second = client.post(url, json={"email": "b@example.com"}).json()
+        update = client.put(f"{url}{second['id']}", json={"email": "a@example.com"})
+        emails = sorted(item["email"] for item in client.get(url).json())
+        print(first.status_code, duplicate.status_code, update.status_code, "UNIQUE" in duplicate.json()["detail"], emails)
+"""
+        result = subprocess.run([sys.executable, "-c", script], cwd=project_dir, capture_output=True, text=True)
+        assert result.returncode == 0, f"运行错误: {result.stderr}"
+        assert result.stdout.split("\n")[:2] == ["201 409 409 True ['a@example.com', 'b@example.com']"] * 2
+
     def test_model_schema_compatibility(self, runner, temp_dir):
         """测试模型和Schema的兼容性"""
         # 跳过此测试，因为它依赖于Pydantic版本和SQLModel版本的兼容性
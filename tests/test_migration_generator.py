@@ -75,4 +75,19 @@ settings = Settings()
         
         # 验证新配置项已添加
         assert "DB_ECHO" in updated_content
-        assert "DB_CONNECT_ARGS" in updated_content 
\ No newline at end of file
+        assert "DB_CONNECT_ARGS" in updated_content
+        assert "DB_POOL_SIZE" in updated_content
+        assert "DB_POOL_PRE_PING" in updated_content
+        assert "DATABASE_REPLICA_URLS" in updated_content
+
+    def test_generate_migration_keeps_async_session(self, temp_dir):
+        """测试异步项目生成迁移配置时保留异步数据库会话"""
+        db_dir = temp_dir / "app" / "db"
+        os.makedirs(db_dir, exist_ok=True)
+        with open(db_dir / "session.py", "w", encoding="utf-8") as f:
+            f.write("from sqlalchemy.ext.asyncio import create_async_engine\n")
+
+        migrations_dir = generate_migration(temp_dir)
+
+        assert "create_async_engine" in (db_dir / "session.py").read_text(encoding="utf-8")
+        assert "run_async_migrations" in (migrations_dir / "env.py").read_text(encoding="utf-8")
@@ -10,6 +10,7 @@ from fastapi_generator.utils.string_utils import (
     pluralize,
     singularize,
 )
+from fastapi_generator.utils.code_utils import add_imports, add_router_includes, update_router_module
 
 class TestStringUtils:
     """字符串工具函数测试"""
@@ -57,4 +58,87 @@ class TestStringUtils:
         assert singularize("categories") == "category"
         assert singularize("boxes") == "box"
         assert singularize("children") == "child"
-        assert singularize("people") == "person" 
\ No newline at end of file
+        assert singularize("people") == "person" 
+
+
+ROUTER_MODULE = '''"""
+API路由聚合
+"""
+from fastapi import APIRouter
+
+api_router = APIRouter()
+'''
+
+class TestCodeUtils:
+    """源码结构化修改工具函数测试"""
+    
+    def test_add_imports_after_docstring(self):
+        """测试在只有文档字符串的模块中添加排序后的导入"""
+        content = add_imports('"""数据模型模块"""\n', ["from .user import User", "from .order import Order"])
+        assert content == '"""数据模型模块"""\n\nfrom .order import Order\nfrom .user import User\n'
+    
+    def test_add_imports_sorted_and_deduplicated(self):
+        """测试新导入按模块名插入到已有导入之间，已导入的名称被跳过"""
+        content = "from .a import A\nfrom .c import C\n\n__all__ = []\n"
+        content = add_imports(content, ["from .b import B", "from .c import C", "from .d import D", "from .b import B"])
+        assert content == "from .a import A\nfrom .b import B\nfrom .c import C\nfrom .d import D\n\n__all__ = []\n"
+    
+    def test_add_imports_only_missing_names(self):
+        """测试只导入缺少的名称，已有导入格式不同也能识别"""
+        content = "from .user import (\n    UserCreate,\n)\n"
+        content = add_imports(content, ["from .user import UserCreate, UserRead"])
+        assert content == "from .user import (\n    UserCreate,\n)\nfrom .user import UserRead\n"
+        assert add_imports(content, ["from .user import UserCreate, UserRead"]) == content
+    
+    def test_add_router_includes(self):
+        """测试在路由器定义之后添加排序后的注册语句"""
+        content = add_router_includes(ROUTER_MODULE, [
+            'api_router.include_router(user_router, prefix="/users")',
+            'api_router.include_router(order_router, prefix="/orders")',
+        ])
+        assert content.endswith(
+            'api_router = APIRouter()\n\n'
+            'api_router.include_router(order_router, prefix="/orders")\n'
+            'api_router.include_router(user_router, prefix="/users")\n'
+        )
+    
+    def test_add_router_includes_detects_existing_calls(self):
+        """测试跨多行书写的已有注册语句不会被重复添加"""
+        content = ROUTER_MODULE + 'api_router.include_router(\n    user_router,\n    prefix="/users",\n)\n'
+        assert add_router_includes(content, ['api_router.include_router(user_router, prefix="/users")']) == content
+    
+    def test_update_router_module_many_resources(self):
+        """测试一次添加大量路由，结果有序且重复应用不变"""
+        names = [f"resource{i:03d}" for i in reversed(range(300))]
+        imports = [f"from .endpoints.{name} import router as {name}_router" for name in names]
+        includes = [f"api_router.include_router({name}_router)" for name in names]
+        
+        content = update_router_module(ROUTER_MODULE, imports, includes)
+        assert update_router_module(content, imports, includes) == content
+        
+        lines = content.splitlines()
+        import_lines = [line for line in lines if line.startswith("from .endpoints.")]
+        include_lines = [line for line in lines if line.startswith("api_router.include_router")]
+        assert import_lines == sorted(imports)
+        assert include_lines == sorted(includes)
+        compile(content, "api.py", "exec")
+
+    def test_without_ast_unparse(self, monkeypatch):
+        """测试不依赖 ast.unparse（Python 3.8 中没有）"""
+        import ast
+
+        monkeypatch.delattr(ast, "unparse", raising=False)
+        content = update_router_module(
+            ROUTER_MODULE,
+            ["from .endpoints import order as order_endpoints", "from ..models import Order"],
+            ["api_router.include_router(endpoints.order.router)"]
+        )
+        assert "from .endpoints import order as order_endpoints\n" in content
+        assert "from ..models import Order\n" in content
+        assert content.endswith("api_router.include_router(endpoints.order.router)\n")
+        assert update_router_module(content, [], ["api_router.include_router(endpoints . order.router)"]) == content
+
+    def test_invalid_module(self):
+        """测试无法解析的模块"""
+        with pytest.raises(ValueError):
+            add_imports("def broken(:\n", ["from .user import User"])